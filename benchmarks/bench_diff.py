@@ -0,0 +1,88 @@
+"""Бенчмарк дифференцирования: упрощение в корне против упрощения на каждом уровне"""
+
+import argparse
+import time
+from contextlib import contextmanager
+
+from benchmarks.bench_memory import generate
+from benchmarks.suite import deep_nesting, long_sum
+from functions.function import Function
+
+EXPRESSIONS = [
+    "-sin(x^3)",
+    "(x-1)/(x+1)",
+    "sqrt(x^2)",
+    "exp(cos(x))",
+    "sin(sin(sin(x)))",
+    "x^2*sin(x)/(x+1)",
+    "ln(x^2+1)*exp(-x)",
+    # Большие деревья (50+ узлов): вложенность, длинная сумма, случайное выражение.
+    deep_nesting(96),
+    long_sum(32),
+    generate(80, seed=1),
+]
+
+
+@contextmanager
+def legacy_diff():
+    """
+    Контекстный менеджер, воспроизводящий прежнее поведение,\
+        при котором производная упрощается на каждом уровне рекурсии.
+    """
+    original = Function._diff
+
+    def per_level(self, variable, memo):
+        return original(self, variable, memo).simplify()
+
+    Function._diff = per_level
+    try:
+        yield
+    finally:
+        Function._diff = original
+
+
+def measure(expression: str, repeat: int) -> float:
+    """
+    Измеряет среднее время дифференцирования выражения.
+    Каждый повтор дифференцирует заново разобранную функцию,\
+        чтобы не попадать в кэш производных функции (разбор не измеряется).
+
+    Args:
+        expression (str): Дифференцируемое выражение.
+        repeat (int): Количество повторов.
+
+    Returns:
+        float: Среднее время в секундах.
+    """
+    total = 0.0
+    for _ in range(repeat):
+        function = Function(expression)
+        start = time.perf_counter()
+        function.diff("x")
+        total += time.perf_counter() - start
+    return total / repeat
+
+
+def main() -> None:
+    """
+    Выводит таблицу времени дифференцирования для обоих режимов.
+    """
+    parser = argparse.ArgumentParser(prog="bench_diff")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Первый вызов импортирует модуль упрощения, он не измеряется.
+    Function("x").diff("x")
+    print(f"{'expression':<52}{'per-level, s':>14}{'root, s':>10}{'speedup':>9}")
+    for expression in EXPRESSIONS:
+        with legacy_diff():
+            legacy = measure(expression, args.repeat)
+        current = measure(expression, args.repeat)
+        label = expression
+        if len(expression) > 50:
+            label = f"{expression[:40]}... ({len(expression)})"
+        print(f"{label:<52}{legacy:>14.4f}{current:>10.4f}{legacy / current:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Бенчмарк инкрементального дифференцирования при редактировании выражения"""
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.bench_memory import generate
+from functions.function import Function
+from functions.incremental import IncrementalFunction
+
+
+def expression(length: int) -> str:
+    """
+    Собирает сумму случайных слагаемых длиной не больше `length` символов.
+
+    Args:
+        length (int): Наибольшая длина выражения.
+
+    Returns:
+        str: Выражение.
+    """
+    result = ""
+    seed = 0
+    while True:
+        term = f"({generate(3, seed)})"
+        if len(result) + len(term) + 1 > length:
+            return result
+        result = f"{result}+{term}" if result else term
+        seed += 1
+
+
+def edits(text: str, count: int, seed: int = 0) -> list:
+    """
+    Генерирует последовательность правок, каждая из которых заменяет одну переменную.
+
+    Args:
+        text (str): Исходное выражение.
+        count (int): Количество правок.
+        seed (int): Зерно генератора. По дефолту 0.
+
+    Returns:
+        list: Тексты после каждой правки.
+    """
+    rng = random.Random(seed)
+    positions = [index for index, char in enumerate(text) if char in "xyz"]
+    result = []
+    for _ in range(count):
+        position = rng.choice(positions)
+        replacement = rng.choice("xyz".replace(text[position], ""))
+        text = text[:position] + replacement + text[position + 1 :]
+        result.append(text)
+    return result
+
+
+def main() -> None:
+    """
+    Выводит медианную задержку правки для полного и инкрементального разбора.
+    """
+    parser = argparse.ArgumentParser(prog="bench_incremental")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1000, 2000, 5000])
+    parser.add_argument("--edits", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'length':>8}{'full, ms':>10}{'incr, ms':>10}{'speedup':>9}")
+    for length in args.lengths:
+        text = expression(length)
+        texts = edits(text, args.edits)
+        incremental = IncrementalFunction(text)
+        incremental.diff()
+        full, fast = [], []
+        for edited in texts:
+            start = time.perf_counter()
+            Function(edited).diff()
+            full.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            incremental.update(edited)
+            incremental.diff()
+            fast.append(time.perf_counter() - start)
+        full_ms = statistics.median(full) * 1e3
+        fast_ms = statistics.median(fast) * 1e3
+        print(f"{len(text):>8}{full_ms:>10.2f}{fast_ms:>10.3f}{full_ms / fast_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Бенчмарк памяти, занимаемой узлами дерева функции"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+from functions.expr_parser import Parser
+from functions.function import Function
+
+OPERANDS = ["x", "y", "z", "2", "3,5", "pi"]
+BINARY = ["+", "-", "*", "/", "^"]
+PREFIX = ["sin", "cos", "ln", "exp", "sqrt", "tg", "-"]
+
+
+class DictNode:
+    """
+    Узел с прежней раскладкой: атрибуты хранятся в `__dict__`.
+    """
+
+    def __init__(self, value, left=None, right=None) -> None:
+        self.left = left
+        self.right = right
+        self.value = value
+        self._derivatives = None
+
+
+def slots_node(value, left=None, right=None) -> Function:
+    """
+    Создает отдельный (не общий) узел `Function`.
+    """
+    node = Function()
+    node.value, node.left, node.right = value, left, right
+    return node
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """
+    Генерирует случайное выражение примерно из `size` операндов.
+
+    Args:
+        size (int): Количество операндов.
+        seed (int): Зерно генератора.
+
+    Returns:
+        str: Выражение.
+    """
+    rng = random.Random(seed)
+    parts = [rng.choice(OPERANDS)]
+    for _ in range(size - 1):
+        operand = rng.choice(OPERANDS)
+        if rng.random() < 0.3:
+            operand = f"{rng.choice(PREFIX)}({operand})"
+        parts.append(rng.choice(BINARY))
+        parts.append(operand)
+    return "".join(parts)
+
+
+def measure(expression: str, make_node: callable) -> tuple:
+    """
+    Измеряет память дерева выражения, построенного фабрикой узлов.
+
+    Returns:
+        tuple: Количество узлов и занятая память в байтах.
+    """
+    count = 0
+
+    def counting(*args):
+        nonlocal count
+        count += 1
+        return make_node(*args)
+
+    gc.collect()
+    tracemalloc.start()
+    tree = Parser(expression).parse(counting)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return count, size
+
+
+def main() -> None:
+    """
+    Выводит память на узел для раскладки со словарем, со слотами\
+        и для общих узлов `Function.node`.
+    """
+    parser = argparse.ArgumentParser(prog="bench_memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(
+        f"{'operands':>10}{'nodes':>10}{'dict, B/node':>14}{'slots, B/node':>15}"
+        f"{'shared, B/node':>16}"
+    )
+    for size in args.sizes:
+        expression = generate(size)
+        nodes, before = measure(expression, DictNode)
+        _, after = measure(expression, slots_node)
+        _, shared = measure(expression, Function.node)
+        print(
+            f"{size:>10}{nodes:>10}{before / nodes:>14.1f}{after / nodes:>15.1f}"
+            f"{shared / nodes:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
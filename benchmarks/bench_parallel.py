@@ -0,0 +1,50 @@
+"""Бенчмарк пакетного дифференцирования в пуле процессов"""
+
+import argparse
+import time
+
+from benchmarks.bench_memory import generate
+from main import clear_cache, diff_many
+
+
+def measure(expressions: list, workers: int, chunksize: int = None) -> float:
+    """
+    Измеряет время дифференцирования набора выражений с холодными кэшами.
+
+    Args:
+        expressions (list): Дифференцируемые выражения.
+        workers (int): Количество процессов.
+        chunksize (int, optional): Размер порции.
+
+    Returns:
+        float: Время в секундах.
+    """
+    clear_cache()
+    start = time.perf_counter()
+    diff_many(expressions, "x", workers=workers, chunksize=chunksize)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """
+    Выводит таблицу времени и ускорения для 1/2/4/8 процессов.
+    """
+    parser = argparse.ArgumentParser(prog="bench_parallel")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--chunksize", type=int, default=None)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    expressions = [generate(args.size, seed) for seed in range(args.count)]
+    baseline = None
+    print(f"{'workers':>8}{'time, s':>10}{'expr/s':>10}{'speedup':>9}")
+    for workers in args.workers:
+        elapsed = measure(expressions, workers, args.chunksize)
+        baseline = baseline or elapsed
+        rate = len(expressions) / elapsed
+        print(f"{workers:>8}{elapsed:>10.3f}{rate:>10.0f}{baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
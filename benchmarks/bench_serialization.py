@@ -0,0 +1,41 @@
+"""Бенчмарк двоичного представления функций по сравнению с разбором и pickle"""
+
+import argparse
+import pickle
+import timeit
+
+from benchmarks.bench_memory import generate
+from functions.function import Function
+
+
+def main() -> None:
+    """
+    Выводит размер и время записи/чтения функций для каждого способа.
+    """
+    parser = argparse.ArgumentParser(prog="bench_serialization")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    functions = [Function(generate(args.size, seed)).diff() for seed in range(args.count)]
+    methods = {
+        "text": (Function.to_string, lambda data: Function(data)),
+        "binary": (Function.to_bytes, Function.from_bytes),
+        "pickle": (pickle.dumps, pickle.loads),
+    }
+    print(f"{'method':>8}{'bytes':>10}{'dump, ms':>10}{'load, ms':>10}")
+    for name, (dump, load) in methods.items():
+        dumped = [dump(function) for function in functions]
+        size = sum(len(data) for data in dumped)
+        dump_time = min(
+            timeit.repeat(lambda: [dump(f) for f in functions], number=1, repeat=args.repeat)
+        )
+        load_time = min(
+            timeit.repeat(lambda: [load(d) for d in dumped], number=1, repeat=args.repeat)
+        )
+        print(f"{name:>8}{size:>10}{dump_time * 1e3:>10.1f}{load_time * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Набор бенчмарков этапов обработки функций: разбор, дифференцирование,\
+    упрощение, вычисление и производная в точке.
+
+Запуск: python -m benchmarks.suite run --output results.json
+Сравнение: python -m benchmarks.suite compare baseline.json results.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import string
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_memory import generate
+from functions import __version__
+from functions.expr_parser import Parser
+from functions.function import Function
+
+VARIABLES = [letter for letter in string.ascii_letters if letter != "e"]
+
+
+def random_expression(scale: int) -> str:
+    """
+    Случайное выражение из `scale` операндов (см. `bench_memory.generate`).
+    """
+    return generate(scale, seed=scale)
+
+
+def deep_nesting(scale: int) -> str:
+    """
+    Глубоко вложенные скобки и функции: sin(ln(2*(...(x+1)...))).
+    """
+    depth = max(scale // 4, 1)
+    expression = "x"
+    for level in range(depth):
+        expression = f"{('sin', 'ln', 'exp')[level % 3]}(2*({expression}+1))"
+    return expression
+
+
+def long_sum(scale: int) -> str:
+    """
+    Длинная сумма степеней: x^1+x^2+...
+    """
+    return "+".join(f"{power % 7 + 1}*x^{power % 5 + 1}" for power in range(scale))
+
+
+def power_tower(scale: int) -> str:
+    """
+    Башня степеней x^x^...^x (правоассоциативная).
+    """
+    return "^".join(["x"] * max(scale // 16, 2))
+
+
+def many_variables(scale: int) -> str:
+    """
+    Сумма произведений различных переменных.
+    """
+    names = VARIABLES[: min(scale, len(VARIABLES))]
+    return "+".join(f"{left}*{right}" for left, right in zip(names, ["x", *names[:-1]]))
+
+
+STAGES = ["tokenize", "rpn", "parse", "diff", "simplify", "calculate", "derive"]
+CASES = {
+    "random": random_expression,
+    "deep_nesting": deep_nesting,
+    "long_sum": long_sum,
+    "power_tower": power_tower,
+    "many_variables": many_variables,
+}
+
+
+def stages(expression: str) -> dict:
+    """
+    Строит вызываемые объекты для каждого этапа обработки выражения.
+    Производная без упрощения строится без кэша функции, упрощение\
+        и вычисление получают заранее подготовленные деревья,\
+        а производная в точке использует кэш производных функции.
+
+    Args:
+        expression (str): Выражение.
+
+    Returns:
+        dict: Имя этапа -> функция без аргументов.
+    """
+    function = Function(expression)
+    derivative = function.intern()._diff("x", {})  # pylint: disable=protected-access
+    point = {name: 0.3 + 0.01 * index for index, name in enumerate(function.variables())}
+    point.setdefault("x", 0.5)
+    return {
+        "tokenize": lambda: Parser(expression)._tokenize(),  # pylint: disable=protected-access
+        "rpn": lambda: Parser(expression).rpn,
+        "parse": lambda: Function(expression),
+        "diff": lambda: function.intern()._diff("x", {}),  # pylint: disable=protected-access
+        "simplify": derivative.simplify,
+        "calculate": lambda: function.calculate(**point),
+        "derive": lambda: function.derive("x", **point),
+    }
+
+
+def measure_time(stage: callable, repeat: int, min_time: float) -> dict:
+    """
+    Измеряет время вызова: количество вызовов в серии подбирается так,\
+        чтобы серия длилась не меньше `min_time`.
+
+    Args:
+        stage (callable): Измеряемый вызов.
+        repeat (int): Количество серий.
+        min_time (float): Наименьшая длительность серии в секундах.
+
+    Returns:
+        dict: Наименьшее и медианное время одного вызова в секундах\
+            или описание ошибки.
+    """
+    try:
+        number = 1
+        while True:
+            elapsed = _run(stage, number)
+            if elapsed >= min_time or number >= 1 << 20:
+                break
+            number *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed) + 1)
+        samples = [elapsed / number] + [_run(stage, number) / number for _ in range(repeat - 1)]
+    except (RecursionError, ValueError, ZeroDivisionError, OverflowError) as error:
+        return {"error": type(error).__name__}
+    return {"min": min(samples), "median": statistics.median(samples), "number": number}
+
+
+def measure_memory(expression: str) -> dict:
+    """
+    Измеряет пиковую память разбора и дифференцирования выражения.
+
+    Args:
+        expression (str): Выражение.
+
+    Returns:
+        dict: Пиковая память этапов в байтах.
+    """
+    result = {}
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function = Function(expression)
+        result["parse_peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        try:
+            function.diff("x")
+            result["diff_peak"] = tracemalloc.get_traced_memory()[1]
+        except RecursionError as error:
+            result["diff_peak"] = {"error": type(error).__name__}
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def run(cases: list, scales: list, selected: list, repeat: int, min_time: float) -> dict:
+    """
+    Запускает набор бенчмарков.
+
+    Args:
+        cases (list): Имена генераторов выражений.
+        scales (list): Размеры выражений.
+        selected (list): Имена этапов.
+        repeat (int): Количество серий на этап.
+        min_time (float): Наименьшая длительность серии в секундах.
+
+    Returns:
+        dict: Результаты с описанием окружения.
+    """
+    results = {}
+    for case in cases:
+        for scale in scales:
+            expression = CASES[case](scale)
+            name = f"{case}/{scale}"
+            try:
+                calls = stages(expression)
+            except RecursionError as error:
+                results[name] = {"error": type(error).__name__}
+                continue
+            entry = {"length": len(expression)}
+            for stage in selected:
+                entry[stage] = measure_time(calls[stage], repeat, min_time)
+            entry["memory"] = measure_memory(expression)
+            results[name] = entry
+            print(_row(name, entry, selected), flush=True)
+    return {
+        "meta": {
+            "version": __version__,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Сравнивает медианное время этапов с сохраненной базой.
+
+    Args:
+        baseline (dict): Результаты базового запуска.
+        current (dict): Результаты текущего запуска.
+        threshold (float): Допустимое относительное замедление (0.2 = 20%).
+
+    Returns:
+        list: Кортежи (случай, этап, время базы, текущее время, отношение, регрессия).
+    """
+    rows = []
+    for name, entry in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for stage, timing in entry.items():
+            old = base.get(stage)
+            if not isinstance(timing, dict) or not isinstance(old, dict):
+                continue
+            if "median" not in timing or "median" not in old:
+                continue
+            before, after = old["median"], timing["median"]
+            ratio = after / before if before else float("inf")
+            rows.append((name, stage, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv: list = None) -> int:
+    """
+    Точка входа: команды `run` и `compare`.
+
+    Returns:
+        int: Код возврата (1, если найдены регрессии).
+    """
+    parser = argparse.ArgumentParser(prog="benchmarks.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    run_parser.add_argument("--scales", type=int, nargs="+", default=[16, 128])
+    run_parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--min-time", type=float, default=0.01)
+    run_parser.add_argument("--output")
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        print(_header(args.stages))
+        results = run(args.cases, args.scales, args.stages, args.repeat, args.min_time)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'case':<22}{'stage':<10}{'base, us':>12}{'now, us':>12}{'ratio':>8}")
+    for name, stage, old, new, ratio, regression in rows:
+        mark = "  REGRESSION" if regression else ""
+        print(f"{name:<22}{stage:<10}{old * 1e6:>12.1f}{new * 1e6:>12.1f}{ratio:>8.2f}{mark}")
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+def _run(stage: callable, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        stage()
+    return time.perf_counter() - start
+
+
+def _header(selected: list) -> str:
+    return f"{'case':<22}{'chars':>7}" + "".join(f"{stage + ', us':>14}" for stage in selected)
+
+
+def _row(name: str, entry: dict, selected: list) -> str:
+    cells = []
+    for stage in selected:
+        timing = entry[stage]
+        if "error" in timing:
+            cells.append(f"{timing['error']:>14}")
+        else:
+            cells.append(f"{timing['median'] * 1e6:>14.1f}")
+    return f"{name:<22}{entry['length']:>7}" + "".join(cells)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
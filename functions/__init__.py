@@ -0,0 +1,3 @@
+"""Пакет для разбора и дифференцирования математических функций"""
+
+__version__ = "1.1.0"
@@ -0,0 +1,445 @@
+"""Модуль, обеспечивающий численное дифференцирование функций\
+    прямым автоматическим дифференцированием (дуальными числами)"""
+
+import math
+
+import numpy as np
+
+from .function import Function
+from .operators import CONSTANTS, OPERATORS, OperatorType
+from .program import CHECKED_FUNCTIONS, _divide, _ln, _power
+from .vectorized import DOMAIN_CHECKS, UFUNCS, bind
+
+
+def _dual_pow(x, dx, y, dy, z):
+    if dy == 0.0:
+        if y == 1.0:
+            return dx
+        return y * _power(x, y - 1.0) * dx
+    slope = _ln(x) * dy
+    if dx != 0.0:
+        slope += _divide(dx * y, x)
+    return z * slope
+
+
+DUAL_RULES = {
+    "+": lambda x, dx, y, dy, z: dx + dy,
+    "-": lambda x, dx, y, dy, z: dx - dy,
+    "*": lambda x, dx, y, dy, z: dx * y + x * dy,
+    "/": lambda x, dx, y, dy, z: (dx - z * dy) / y,
+    "^": _dual_pow,
+    "unary-": lambda x, dx, z: -dx,
+    "sqrt": lambda x, dx, z: _divide(dx, 2.0 * z),
+    "exp": lambda x, dx, z: dx * z,
+    "ln": lambda x, dx, z: dx / x,
+    "sin": lambda x, dx, z: dx * math.cos(x),
+    "cos": lambda x, dx, z: -dx * math.sin(x),
+    "tg": lambda x, dx, z: _divide(dx, math.cos(x) ** 2),
+}
+
+
+def derive(function, variable: str, values: dict) -> tuple:
+    """
+    Функция, вычисляющая значение функции и ее производной в точке\
+        за один проход по дереву без построения символьной производной.
+    Общие подвыражения вычисляются один раз.
+
+    Args:
+        function (Function): Дифференцируемая функция.
+        variable (str): Переменная дифференцирования.
+        values (dict): Значения всех переменных функции.
+
+    Raises:
+        ZeroDivisionError: Возникает при делении на ноль в функции или производной.
+        ValueError: Возникает, когда аргумент выходит за пределы области\
+            или когда указаны не все переменные.
+
+    Returns:
+        tuple: Значение функции и значение производной.
+    """
+    if function.value is None:
+        raise ValueError("Функция не определена")
+    duals = {}
+    stack = [(function, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in duals:
+            continue
+        value = node.value
+        if value not in OPERATORS:
+            duals[id(node)] = _leaf(value, variable, values)
+            continue
+        binary = OPERATORS[value].operator_type == OperatorType.BINARY
+        if not expanded:
+            stack.append((node, True))
+            if binary:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+            continue
+
+        x, dx = duals[id(node.left)]
+        calculate = CHECKED_FUNCTIONS.get(value, OPERATORS[value].function)
+        if binary:
+            y, dy = duals[id(node.right)]
+            z = calculate(x, y)
+            duals[id(node)] = (z, DUAL_RULES[value](x, dx, y, dy, z))
+        else:
+            z = calculate(x)
+            duals[id(node)] = (z, DUAL_RULES[value](x, dx, z))
+    return duals[id(function)]
+
+
+def _leaf(value, variable: str, values: dict) -> tuple:
+    if value in values:
+        return values[value], 1.0 if value == variable else 0.0
+    if value in CONSTANTS:
+        return CONSTANTS[value], 0.0
+    if isinstance(value, str):
+        raise ValueError(f"Не указано значение переменной: {value}")
+    return value, 0.0
+
+
+def _partials_pow(x, y, z, left_active, right_active):
+    if not right_active:
+        return (1.0 if y == 1.0 else y * _power(x, y - 1.0)), 0.0
+    return (_divide(y * z, x) if left_active else 0.0), z * _ln(x)
+
+
+PARTIALS = {
+    "+": lambda x, y, z, left, right: (1.0, 1.0),
+    "-": lambda x, y, z, left, right: (1.0, -1.0),
+    "*": lambda x, y, z, left, right: (y, x),
+    "/": lambda x, y, z, left, right: (1.0 / y, -z / y),
+    "^": _partials_pow,
+    "unary-": lambda x, z: -1.0,
+    "sqrt": lambda x, z: _divide(1.0, 2.0 * z),
+    "exp": lambda x, z: z,
+    "ln": lambda x, z: 1.0 / x,
+    "sin": lambda x, z: math.cos(x),
+    "cos": lambda x, z: -math.sin(x),
+    "tg": lambda x, z: _divide(1.0, math.cos(x) ** 2),
+}
+
+
+def gradient(function, values: dict) -> dict:
+    """
+    Функция, вычисляющая все частные производные функции в точке\
+        обратным автоматическим дифференцированием: одно вычисление функции\
+        и один обратный проход по дереву независимо от количества переменных.
+
+    Args:
+        function (Function): Дифференцируемая функция.
+        values (dict): Значения всех переменных функции.
+
+    Raises:
+        ZeroDivisionError: Возникает при делении на ноль в функции или производных.
+        ValueError: Возникает, когда аргумент выходит за пределы области\
+            или когда указаны не все переменные.
+
+    Returns:
+        dict: Частные производные по каждой переменной из `values`.
+    """
+    if function.value is None:
+        raise ValueError("Функция не определена")
+    order = topological_order(function)
+    results = {}
+    active = {}
+    for node in order:
+        value = node.value
+        if value not in OPERATORS:
+            results[id(node)] = _leaf(value, None, values)[0]
+            active[id(node)] = value in values
+            continue
+        arguments = [results[id(node.left)]]
+        active[id(node)] = active[id(node.left)]
+        if node.right is not None:
+            arguments.append(results[id(node.right)])
+            active[id(node)] = active[id(node)] or active[id(node.right)]
+        results[id(node)] = CHECKED_FUNCTIONS.get(value, OPERATORS[value].function)(*arguments)
+
+    adjoints = {id(function): 1.0}
+    partials = dict.fromkeys(values, 0.0)
+    for node in reversed(order):
+        adjoint = adjoints.pop(id(node), 0.0)
+        value = node.value
+        if value not in OPERATORS:
+            if value in partials:
+                partials[value] += adjoint
+            continue
+        if not active[id(node)]:
+            continue
+        x, z = results[id(node.left)], results[id(node)]
+        if node.right is None:
+            children = ((node.left, PARTIALS[value](x, z)),)
+        else:
+            left, right = active[id(node.left)], active[id(node.right)]
+            local = PARTIALS[value](x, results[id(node.right)], z, left, right)
+            children = ((node.left, local[0]), (node.right, local[1]))
+        for child, local in children:
+            if active[id(child)]:
+                adjoints[id(child)] = adjoints.get(id(child), 0.0) + adjoint * local
+    return partials
+
+
+def gradient_symbolic(function, variables: tuple) -> dict:
+    """
+    Функция, строящая символьные частные производные функции по всем\
+        переменным одним обратным проходом по дереву.
+    Сопряженные выражения узлов строятся один раз и общие для всех переменных.
+
+    Args:
+        function (Function): Дифференцируемая функция.
+        variables (tuple): Переменные дифференцирования.
+
+    Returns:
+        dict: Неупрощенные частные производные (Function) по каждой переменной.
+    """
+    zero = Function.node(0.0)
+    if function.value is None:
+        return {variable: Function() for variable in variables}
+    order = topological_order(function)
+    active = {}
+    for node in order:
+        if node.value not in OPERATORS:
+            active[id(node)] = node.value in variables
+        else:
+            active[id(node)] = active[id(node.left)] or (
+                node.right is not None and active[id(node.right)]
+            )
+
+    adjoints = {id(function): Function.node(1.0)}
+    partials = {}
+    for node in reversed(order):
+        adjoint = adjoints.pop(id(node), None)
+        if adjoint is None or not active[id(node)]:
+            continue
+        if node.value not in OPERATORS:
+            partials[node.value] = _add(partials.get(node.value), adjoint)
+            continue
+        for child, local in _symbolic_partials(node, active):
+            if active[id(child)]:
+                adjoints[id(child)] = _add(adjoints.get(id(child)), _scale(adjoint, local))
+    return {variable: partials.get(variable, zero) for variable in variables}
+
+
+def _add(total, term):
+    if total is None:
+        return term
+    return Function.node("+", total, term)
+
+
+def _scale(adjoint, local):
+    if local.value == 1.0:
+        return adjoint
+    if adjoint.value == 1.0:
+        return local
+    return Function.node("*", adjoint, local)
+
+
+def _symbolic_partials(node, active: dict) -> tuple:
+    node = Function.node(node.value, node.left, node.right)
+    x, y, one = node.left, node.right, Function.node(1.0)
+    match node.value:
+        case "+":
+            return (x, one), (y, one)
+        case "-":
+            return (x, one), (y, Function.node("unary-", one))
+        case "*":
+            return (x, y), (y, x)
+        case "/":
+            square = Function.node("^", y, Function.node(2.0))
+            return (x, Function.node("/", one, y)), (
+                y,
+                Function.node("unary-", Function.node("/", x, square)),
+            )
+        case "^":
+            if not active[id(y)]:
+                exponent = Function.node("-", y, one)
+                return ((x, Function.node("*", y, Function.node("^", x, exponent))),)
+            return (
+                (x, Function.node("/", Function.node("*", y, node), x)),
+                (y, Function.node("*", Function.node("ln", x), node)),
+            )
+        case "unary-":
+            return ((x, Function.node("unary-", one)),)
+        case "sqrt":
+            return ((x, Function.node("/", one, Function.node("*", Function.node(2.0), node))),)
+        case "exp":
+            return ((x, node),)
+        case "ln":
+            return ((x, Function.node("/", one, x)),)
+        case "sin":
+            return ((x, Function.node("cos", x)),)
+        case "cos":
+            return ((x, Function.node("unary-", Function.node("sin", x))),)
+        case _:
+            square = Function.node("^", Function.node("cos", x), Function.node(2.0))
+            return ((x, Function.node("/", one, square)),)
+
+
+def topological_order(root) -> list:
+    """
+    Упорядочивает узлы графа функции так, что операнды идут раньше операторов.
+    Каждый общий узел встречается один раз.
+
+    Args:
+        root (Function): Корень функции.
+
+    Returns:
+        list: Узлы в порядке вычисления (корень последний).
+    """
+    order = []
+    visited = set()
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        stack.append((node, True))
+        if node.right is not None:
+            stack.append((node.right, False))
+        if node.left is not None:
+            stack.append((node.left, False))
+    return order
+
+
+def _vector_pow(x, dx, y, dy, z):
+    power_rule = np.where(y == 1.0, dx, y * np.power(x, y - 1.0) * dx)
+    general = z * (np.where(dx != 0.0, dx * y / x, 0.0) + np.log(x) * dy)
+    power_errors = ((x == 0.0) & (y < 1.0)) | ((x < 0.0) & (y != np.floor(y)))
+    errors = ((dy == 0.0) & power_errors) | ((dy != 0.0) & (x <= 0.0))
+    return np.where(dy == 0.0, power_rule, general), errors
+
+
+VECTOR_RULES = {
+    "+": lambda x, dx, y, dy, z: (dx + dy, None),
+    "-": lambda x, dx, y, dy, z: (dx - dy, None),
+    "*": lambda x, dx, y, dy, z: (dx * y + x * dy, None),
+    "/": lambda x, dx, y, dy, z: ((dx - z * dy) / y, None),
+    "^": _vector_pow,
+    "unary-": lambda x, dx, z: (-dx, None),
+    "sqrt": lambda x, dx, z: (dx / (2.0 * z), x == 0.0),
+    "exp": lambda x, dx, z: (dx * z, None),
+    "ln": lambda x, dx, z: (dx / x, None),
+    "sin": lambda x, dx, z: (dx * np.cos(x), None),
+    "cos": lambda x, dx, z: (-dx * np.sin(x), None),
+    "tg": lambda x, dx, z: (dx / np.cos(x) ** 2, None),
+}
+
+
+class VectorizedDerivative:
+    """
+    Класс производной функции, вычисляемой дуальными числами над массивами NumPy.
+    Точки, в которых `derive` выбросил бы исключение, получают значение NaN.
+
+    Args:
+        function (Function): Дифференцируемая функция.
+        variable (str): Переменная дифференцирования.
+        variables (tuple): Порядок переменных при позиционной передаче аргументов.
+    """
+
+    def __init__(self, function, variable: str, variables: tuple) -> None:
+        if function.value is None:
+            raise ValueError("Функция не определена")
+        self._function = function
+        self._variable = variable
+        self._variables = tuple(variables)
+        missing = set(function.variables()).difference(self._variables)
+        if missing:
+            raise ValueError(f"Не указаны переменные: {', '.join(sorted(missing))}")
+
+    @property
+    def variables(self) -> tuple:
+        """
+        Свойство, содержащее порядок переменных.
+
+        Returns:
+            tuple: Имена переменных.
+        """
+        return self._variables
+
+    def __call__(self, *args, **kwargs) -> tuple:
+        """
+        Вычисляет функцию и ее производную над массивами значений переменных.
+
+        Args:
+            *args: Значения переменных в порядке `variables`.
+            **kwargs: Значения переменных по имени.
+
+        Returns:
+            tuple: Массивы значений функции и производной, NaN в недопустимых точках.
+        """
+        values, derivatives, _ = self.evaluate(*args, **kwargs)
+        return values, derivatives
+
+    def evaluate(self, *args, **kwargs) -> tuple:
+        """
+        Вычисляет функцию, производную и маску точек, где они не определены.
+
+        Args:
+            *args: Значения переменных в порядке `variables`.
+            **kwargs: Значения переменных по имени.
+
+        Raises:
+            ValueError: Возникает, когда значения переменных указаны неверно.
+
+        Returns:
+            tuple: Массивы значений, производных и булев массив ошибок.
+        """
+        values = dict(zip(self._variables, bind(self._variables, args, kwargs)))
+
+        errors = []
+        with np.errstate(all="ignore"):
+            value, derivative = self._walk(values, errors)
+        shape = np.broadcast_shapes(
+            np.shape(value),
+            np.shape(derivative),
+            *(np.shape(array) for array in (*values.values(), *errors)),
+        )
+        mask = np.zeros(shape, dtype=bool)
+        for error in errors:
+            mask |= error
+        value = np.array(np.broadcast_to(value, shape), dtype=float)
+        derivative = np.array(np.broadcast_to(derivative, shape), dtype=float)
+        value[mask] = derivative[mask] = np.nan
+        return value, derivative, mask
+
+    def _walk(self, values: dict, errors: list) -> tuple:
+        duals = {}
+        stack = [(self._function, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in duals:
+                continue
+            value = node.value
+            if value not in OPERATORS:
+                duals[id(node)] = _leaf(value, self._variable, values)
+                continue
+            binary = OPERATORS[value].operator_type == OperatorType.BINARY
+            if not expanded:
+                stack.append((node, True))
+                if binary:
+                    stack.append((node.right, False))
+                stack.append((node.left, False))
+                continue
+
+            x, dx = duals[id(node.left)]
+            check = DOMAIN_CHECKS.get(value)
+            arguments = (x, dx)
+            operands = (x,)
+            if binary:
+                y, dy = duals[id(node.right)]
+                arguments = (x, dx, y, dy)
+                operands = (x, y)
+            if check is not None:
+                errors.append(check(*operands))
+            z = UFUNCS[value](*operands)
+            derivative, error = VECTOR_RULES[value](*arguments, z)
+            if error is not None:
+                errors.append(error)
+            duals[id(node)] = (z, derivative)
+        return duals[id(self._function)]
@@ -0,0 +1,340 @@
+"""Модуль, предоставляющий кэши для разобранных функций и производных"""
+
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from . import __version__
+
+
+class LRUCache:
+    """
+    Потокобезопасный кэш ограниченного размера,\
+        вытесняющий давно не использованные записи.
+
+    Args:
+        maxsize (int): Наибольшее количество записей.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Свойство, содержащее наибольшее количество записей.
+
+        Returns:
+            int: Размер кэша.
+        """
+        return self._maxsize
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Метод, возвращающий значение по ключу и отмечающий его как использованное.
+
+        Args:
+            key: Ключ записи.
+            default: Значение при промахе. По дефолту None.
+
+        Returns:
+            Значение записи или default.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value) -> None:
+        """
+        Метод, сохраняющий значение и вытесняющий лишние записи.
+
+        Args:
+            key: Ключ записи.
+            value: Сохраняемое значение.
+        """
+        with self._lock:
+            if self._maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Метод, изменяющий размер кэша.
+
+        Args:
+            maxsize (int): Новое наибольшее количество записей.
+        """
+        if maxsize < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Метод, удаляющий все записи и обнуляющий счетчики.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        """
+        Метод, возвращающий статистику кэша.
+
+        Returns:
+            dict: Попадания, промахи, текущий и наибольший размер.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self._maxsize,
+            }
+
+    def _evict(self) -> None:
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+class DiskCache:
+    """
+    Постоянный кэш в файле SQLite, общий для процессов и перезапусков.
+    Ключ записи дополняется версией библиотеки, поэтому результаты\
+        прежних версий не используются. При превышении размера\
+        вытесняются давно не использованные записи.
+    Чтобы чтения не занимали блокировку записи, время использования\
+        обновляется, только если оно старше `touch_interval`.\
+        Количество записей пересчитывается, только когда оценка сверху\
+        превышает `maxsize`, и тогда вытесняется еще десятая часть кэша,\
+        поэтому запись не просматривает всю таблицу. При записи из нескольких\
+        процессов размер может ненадолго превышать `maxsize`.
+
+    Args:
+        path (str): Путь к файлу кэша.
+        maxsize (int): Наибольшее количество записей. По дефолту 100000.
+        version (str): Версия результатов. По дефолту версия библиотеки.
+        touch_interval (float): Наименьший возраст времени использования\
+            в секундах, при котором чтение его обновляет. По дефолту 60.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int = 100000,
+        version: str = __version__,
+        touch_interval: float = 60.0,
+    ) -> None:
+        if maxsize < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        self._path = path
+        self._maxsize = maxsize
+        self._version = version
+        self._touch_interval = touch_interval
+        self._size = None
+        self._lock = Lock()
+        self._connection = None
+        self._pid = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def path(self) -> str:
+        """
+        Свойство, содержащее путь к файлу кэша.
+
+        Returns:
+            str: Путь к файлу.
+        """
+        return self._path
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Свойство, содержащее наибольшее количество записей.
+
+        Returns:
+            int: Размер кэша.
+        """
+        return self._maxsize
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count(self._connect())
+
+    def get(self, key: tuple, default=None):
+        """
+        Метод, возвращающий значение по ключу и отмечающий его как использованное.
+
+        Args:
+            key (tuple): Нормализованное выражение и переменная.
+            default: Значение при промахе. По дефолту None.
+
+        Returns:
+            Значение записи или default.
+        """
+        expression, variable = key
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT result, used FROM entries "
+                "WHERE expression = ? AND variable = ? AND version = ?",
+                (expression, variable, self._version),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            now = time.time()
+            if now - row[1] > self._touch_interval:
+                with connection:
+                    connection.execute(
+                        "UPDATE entries SET used = ? "
+                        "WHERE expression = ? AND variable = ? AND version = ?",
+                        (now, expression, variable, self._version),
+                    )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: tuple, value: str) -> None:
+        """
+        Метод, сохраняющий значение и вытесняющий лишние записи.
+
+        Args:
+            key (tuple): Нормализованное выражение и переменная.
+            value (str): Сохраняемый результат.
+        """
+        self.put_many([(key, value)])
+
+    def put_many(self, items) -> None:
+        """
+        Метод, сохраняющий несколько значений одной транзакцией.
+
+        Args:
+            items (Iterable[tuple]): Пары (ключ, значение).
+        """
+        rows = [
+            (expression, variable, self._version, value, time.time())
+            for (expression, variable), value in items
+        ]
+        with self._lock:
+            if self._maxsize == 0 or not rows:
+                return
+            connection = self._connect()
+            with connection:
+                if self._size is None:
+                    self._size = self._count(connection)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", rows
+                )
+                # Замененные записи тоже учитываются: оценка только растет.
+                self._size += len(rows)
+                if self._size > self._maxsize:
+                    self._evict(connection)
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Метод, изменяющий размер кэша.
+
+        Args:
+            maxsize (int): Новое наибольшее количество записей.
+        """
+        if maxsize < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        with self._lock:
+            self._maxsize = maxsize
+            connection = self._connect()
+            with connection:
+                self._evict(connection)
+
+    def clear(self) -> None:
+        """
+        Метод, удаляющий все записи и обнуляющий счетчики.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM entries")
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def close(self) -> None:
+        """
+        Метод, закрывающий соединение с файлом кэша.
+        """
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def info(self) -> dict:
+        """
+        Метод, возвращающий статистику кэша.
+        Попадания и промахи считаются в текущем процессе,\
+            размер - общий для всех процессов.
+
+        Returns:
+            dict: Попадания, промахи, доля попаданий, текущий и наибольший размер.
+        """
+        size = len(self)
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": size,
+                "maxsize": self._maxsize,
+            }
+
+    def _connect(self) -> sqlite3.Connection:
+        # Соединение SQLite нельзя использовать в дочернем процессе,\
+        #     поэтому после fork оно открывается заново.
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self._path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "expression TEXT, variable TEXT, version TEXT, result TEXT, used REAL, "
+                    "PRIMARY KEY (expression, variable, version))"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used)")
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        size = self._count(connection)
+        excess = size - self._maxsize
+        if excess > 0:
+            excess += self._maxsize // 10
+            connection.execute(
+                "DELETE FROM entries WHERE rowid IN "
+                "(SELECT rowid FROM entries ORDER BY used LIMIT ?)",
+                (excess,),
+            )
+            size -= excess
+        self._size = size
+
+    @staticmethod
+    def _count(connection: sqlite3.Connection) -> int:
+        return connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
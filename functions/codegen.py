@@ -0,0 +1,175 @@
+"""Модуль, обеспечивающий перевод функций в исходный код Python\
+    и его компиляцию"""
+
+import math
+
+from .cache import LRUCache
+from .operators import CONSTANTS, OPERATORS, OperatorType
+from .program import count_references
+
+DOMAIN_ERROR = "Аргумент находится за пределами области функции"
+INFIX = {"+": "+", "-": "-", "*": "*", "/": "/", "^": "**"}
+CHECKED = ("/", "^", "sqrt", "ln")
+MAX_DEPTH = 32
+CODE_CACHE = LRUCache(256)
+
+
+def to_python_source(function, variables: tuple, name: str = "function") -> str:
+    """
+    Функция, записывающая функцию в виде исходного кода Python:\
+        прямолинейного кода без обхода дерева, где общие подвыражения\
+        и операнды проверяемых операций сохраняются во временных переменных.
+    Проверки области определения совпадают с `Function.calculate`.
+
+    Args:
+        function (Function): Функция.
+        variables (tuple): Порядок параметров сгенерированной функции.
+        name (str): Имя сгенерированной функции. По дефолту 'function'.
+
+    Raises:
+        ValueError: Возникает, когда функция не определена\
+            или указаны не все ее переменные.
+
+    Returns:
+        str: Исходный код определения функции.
+    """
+    if function.value is None:
+        raise ValueError("Функция не определена")
+    missing = set(function.variables()).difference(variables)
+    if missing:
+        raise ValueError(f"Не указаны переменные: {', '.join(sorted(missing))}")
+
+    references = count_references(function)
+    writer = _Writer()
+    expressions = {}
+    stack = [(function, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in expressions:
+            continue
+        value = node.value
+        if value not in OPERATORS:
+            if value in variables:
+                expressions[id(node)] = (value, 0)
+            else:
+                expressions[id(node)] = (_constant(CONSTANTS.get(value, value)), 0)
+            continue
+        binary = OPERATORS[value].operator_type == OperatorType.BINARY
+        if not expanded:
+            stack.append((node, True))
+            if binary:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+            continue
+
+        operands = [expressions[id(node.left)]]
+        if binary:
+            operands.append(expressions[id(node.right)])
+        expression = writer.emit(value, operands)
+        if references[id(node)] > 1 or expression[1] > MAX_DEPTH:
+            expression = (writer.store(expression[0]), 0)
+        expressions[id(node)] = expression
+
+    lines = [f"def {name}({', '.join(variables)}):"]
+    lines += [f"    {line}" for line in writer.lines]
+    lines.append(f"    return {expressions[id(function)][0]}")
+    return "\n".join(lines) + "\n"
+
+
+def compile_native(function, variables: tuple):
+    """
+    Функция, компилирующая функцию в функцию Python.
+    Объекты кода кэшируются по исходному коду, поэтому одинаковые функции\
+        компилируются один раз.
+
+    Args:
+        function (Function): Функция.
+        variables (tuple): Порядок параметров скомпилированной функции.
+
+    Raises:
+        ValueError: Возникает, когда функция не определена\
+            или указаны не все ее переменные.
+
+    Returns:
+        callable: Функция от значений переменных в порядке `variables`.
+    """
+    source = to_python_source(function, variables)
+    code = CODE_CACHE.get(source)
+    if code is None:
+        code = compile(source, "<function>", "exec")
+        CODE_CACHE.put(source, code)
+    namespace = _namespace()
+    exec(code, namespace)  # pylint: disable=exec-used
+    return namespace["function"]
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.lines = []
+        self._temps = 0
+
+    def emit(self, operator: str, operands: list) -> tuple:
+        depth = 1 + max(depth for _, depth in operands)
+        if operator in CHECKED:
+            operands = [(self.atom(expression), 0) for expression, _ in operands]
+            depth = 1
+        if operator in INFIX:
+            (left, _), (right, _) = operands
+            if operator == "/":
+                self.lines.append(f"if {right} == 0.0: raise ZeroDivisionError")
+            elif operator == "^":
+                self.lines.append(f"if {left} == 0.0 and {right} <= 0: raise ZeroDivisionError")
+                result = self.store(f"{left} ** {right}")
+                self.lines.append(
+                    f"if isinstance({result}, complex): raise ValueError({DOMAIN_ERROR!r})"
+                )
+                return result, 0
+            return f"({left} {INFIX[operator]} {right})", depth
+
+        ((argument, _),) = operands
+        if operator == "unary-":
+            return f"(-{argument})", depth
+        if operator == "sqrt":
+            self.lines.append(f"if {argument} < 0.0: raise ValueError({DOMAIN_ERROR!r})")
+        elif operator == "ln":
+            self.lines.append(f"if {argument} <= 0.0: raise ValueError({DOMAIN_ERROR!r})")
+        return f"{_name(operator)}({argument})", depth
+
+    def atom(self, expression: str) -> str:
+        if expression.isidentifier() or expression[0].isdigit():
+            return expression
+        return self.store(expression)
+
+    def store(self, expression: str) -> str:
+        name = f"_t{self._temps}"
+        self._temps += 1
+        self.lines.append(f"{name} = {expression}")
+        return name
+
+
+def _constant(value) -> str:
+    number = float(value)
+    if math.isfinite(number):
+        return repr(number)
+    # repr бесконечности и nan - не литералы Python.
+    return f"float({repr(number)!r})"
+
+
+def _name(operator: str) -> str:
+    return f"_{operator}"
+
+
+def _namespace() -> dict:
+    namespace = {
+        _name(name): operator.function
+        for name, operator in OPERATORS.items()
+        if operator.operator_type == OperatorType.PREFIX and name != "unary-"
+    }
+    namespace["__builtins__"] = {
+        "ValueError": ValueError,
+        "ZeroDivisionError": ZeroDivisionError,
+        "isinstance": isinstance,
+        "complex": complex,
+        "float": float,
+    }
+    return namespace
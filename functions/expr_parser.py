@@ -8,6 +8,24 @@ from .operators import CONSTANTS, OPERATORS, Associativity, OperatorType
 NUM_REGEX = re.compile(r"[\d,.]+")
 VAR_REGEX = re.compile(r"[A-Za-z]+")
 
+NAMES = sorted(
+    (name for name in (*OPERATORS, *CONSTANTS) if name.isalpha()), key=len, reverse=True
+)
+SYMBOLS = "".join(re.escape(operator) for operator in OPERATORS if len(operator) == 1)
+TOKEN_REGEX = re.compile(
+    rf"(?P<number>[\d,.]+)"
+    rf"|(?P<name>{'|'.join(NAMES)}|[A-Za-z])"
+    rf"|(?P<symbol>[{SYMBOLS}()])"
+    rf"|(?P<invalid>.)",
+    re.DOTALL,
+)
+PRIORITIES = {name: operator.priority for name, operator in OPERATORS.items()}
+RIGHT_ASSOCIATIVE = {
+    name
+    for name, operator in OPERATORS.items()
+    if operator.associativity == Associativity.RIGHT_ASSOCIATIVE
+}
+
 
 class ParserError(Exception):
     """
@@ -28,6 +46,11 @@ class ParserError(Exception):
         self.position = position
         self.length = length
 
+    def __reduce__(self):
+        # Подклассы принимают разные аргументы конструктора, поэтому при передаче\
+        #     между процессами состояние восстанавливается без вызова __init__.
+        return (self.__class__.__new__, (self.__class__, *self.args), self.__dict__)
+
     def __str__(self):
         error_pointer = f"{'^' * self.length:>{self.position + self.length}}"
         return f"\n{self.expression}\n{error_pointer}"
@@ -118,30 +141,44 @@ class Parser:
                 в обратной польской записи.
         """
         if self._rpn is None:
-            self._rpn = self._parse_to_rpn()
+            self._rpn = []
+            self._parse(self._rpn)
         return self._rpn
 
-    def _parse_to_rpn(self) -> list:
+    def parse(self, make_node: callable):
+        """
+        Метод, строящий дерево выражения напрямую из токенов,\
+            без промежуточной обратной польской записи.
+        Разбор итеративный, поэтому длина и вложенность выражения\
+            не ограничены глубиной рекурсии.
+
+        Args:
+            make_node (callable): Фабрика узлов `make_node(value, left, right)`.\
+                Числа передаются как float, операнды префиксных операторов - как left.
+
+        Returns:
+            Корень дерева или None для пустого выражения.
+        """
+        builder = _TreeBuilder(make_node)
+        self._parse(builder)
+        return builder.root
+
+    def _parse(self, result) -> None:
         stack = []
-        result = []
         tokens = self._tokenize()
         prev_token = None
         position = 0
         open_bracket_pos = []
 
         def add_binary_op(operator: str) -> None:
-            nonlocal stack, result, peek
+            nonlocal peek
+            priority = PRIORITIES[operator]
             while (
                 stack
-                and peek in OPERATORS
+                and peek in PRIORITIES
                 and (
-                    OPERATORS.get(peek).priority > OPERATORS.get(operator).priority
-                    or (
-                        OPERATORS.get(peek).associativity
-                        != Associativity.RIGHT_ASSOCIATIVE
-                        and OPERATORS.get(peek).priority
-                        == OPERATORS.get(operator).priority
-                    )
+                    PRIORITIES[peek] > priority
+                    or (PRIORITIES[peek] == priority and peek not in RIGHT_ASSOCIATIVE)
                 )
             ):
                 result.append(stack.pop())
@@ -158,7 +195,7 @@ class Parser:
             ) or prev_op_type == OperatorType.POSTFIX:
                 add_binary_op("*")
 
-        for token in tokens:
+        for token, position in tokens:
             peek = self._peek(stack)
 
             if token in OPERATORS:
@@ -166,17 +203,16 @@ class Parser:
                     prev_token is None or prev_token == "(" or prev_token in OPERATORS
                 ):
                     token = "unary-"
-                if (
-                    OPERATORS.get(token).operator_type == OperatorType.POSTFIX
-                ):  # pragma: no cover
+                operator_type = OPERATORS[token].operator_type
+                if operator_type == OperatorType.POSTFIX:  # pragma: no cover
                     self._entity_placement_error_checker(
                         prev_token, position, len(token), False
                     )
                     result.append(token)
-                elif OPERATORS.get(token).operator_type == OperatorType.PREFIX:
+                elif operator_type == OperatorType.PREFIX:
                     add_skipped_mul()
                     stack.append(token)
-                elif OPERATORS.get(token).operator_type == OperatorType.BINARY:
+                elif operator_type == OperatorType.BINARY:
                     self._entity_placement_error_checker(
                         prev_token, position, len(token), False
                     )
@@ -204,12 +240,10 @@ class Parser:
                 result.append(token)
 
             prev_token = token
-            position += len(token) if token != "unary-" else 1
 
-        if position:
-            position -= len(prev_token)
+        if tokens:
             self._entity_placement_error_checker(
-                prev_token, position, len(prev_token), True
+                prev_token, position, len(tokens[-1][0]), True
             )
 
         while stack:
@@ -219,51 +253,24 @@ class Parser:
             )
             result.append(entity)
 
-        return result
-
     def _tokenize(self) -> list:
-        result = []
-        temp = ""
-        position = 0
-
-        def add_num_to_tokens():
-            nonlocal result, temp
-            if NUM_REGEX.match(temp):
-                temp = temp.replace(",", ".")
-                result.append(temp)
-                temp = ""
-
-        def add_var_to_tokens():
-            nonlocal result, temp
-            if VAR_REGEX.match(temp):
-                result += list(temp)
-                temp = ""
-
-        for index, char in enumerate(self.expression):
-            if char in OPERATORS or char in ["(", ")"]:
-                add_num_to_tokens()
-                add_var_to_tokens()
-                result.append(char)
-            elif NUM_REGEX.match(char):
-                add_var_to_tokens()
-                temp += char
-            elif VAR_REGEX.match(char):
-                add_num_to_tokens()
-                temp += char
-                for symbol in OPERATORS | CONSTANTS:
-                    if char == "e" and self.expression[index : index + 3] == "exp":
-                        break
-                    if temp.endswith(symbol):
-                        result += list(temp[: -len(symbol)])
-                        result.append(symbol)
-                        temp = ""
-            else:
-                raise InvalidCharacterError(self.expression, position)
-            position += 1
+        """
+        Разбивает выражение на токены за один проход.
+        Имена операторов и констант выделяются жадно (длинные имена первыми),
+        остальные буквы - переменные из одного символа.
 
-        if temp:
-            add_num_to_tokens()
-            add_var_to_tokens()
+        Returns:
+            list: Пары (токен, позиция токена в выражении).
+        """
+        result = []
+        for match in TOKEN_REGEX.finditer(self.expression):
+            kind = match.lastgroup
+            if kind == "invalid":
+                raise InvalidCharacterError(self.expression, match.start())
+            token = match.group()
+            if kind == "number":
+                token = token.replace(",", ".")
+            result.append((token, match.start()))
         return result
 
     def _peek(self, stack):
@@ -303,3 +310,29 @@ class Parser:
                 float(token)
             except ValueError as exc:
                 raise InvalidNumberError(self.expression, position, len(token)) from exc
+
+
+class _TreeBuilder:
+    """
+    Приемник токенов в порядке обратной польской записи,\
+        который сразу сворачивает их в узлы дерева.
+    """
+
+    def __init__(self, make_node: callable) -> None:
+        self._make_node = make_node
+        self._operands = []
+
+    @property
+    def root(self):
+        return self._operands[-1] if self._operands else None
+
+    def append(self, token: str) -> None:
+        operator = OPERATORS.get(token)
+        if operator is None:
+            value = float(token) if NUM_REGEX.match(token) else token
+            self._operands.append(self._make_node(value))
+        elif operator.operator_type == OperatorType.BINARY:
+            right = self._operands.pop()
+            self._operands[-1] = self._make_node(token, self._operands[-1], right)
+        else:
+            self._operands[-1] = self._make_node(token, self._operands[-1])
@@ -1,10 +1,11 @@
 """Модуль, обеспечивающий функциональность\
     работу с математическими функциями"""
 
-from sympy import nsimplify, simplify, sympify
+from weakref import WeakValueDictionary
 
-from .expr_parser import NUM_REGEX, Parser
+from .expr_parser import Parser
 from .operators import CONSTANTS, OPERATORS, Associativity, OperatorType
+from .program import CHECKED_FUNCTIONS, count_references
 
 
 class Function:
@@ -16,37 +17,186 @@ class Function:
             который представляет функцию. Default : None.
     """
 
+    __slots__ = (
+        "_left",
+        "_right",
+        "_value",
+        "_derivatives",
+        "_domain",
+        "_native",
+        "_stamp",
+        "__weakref__",
+    )
+
+    # Отметка последнего изменения: общие узлы помечены -1,\
+    #     изменяемые - номером изменения (0 - не изменялись).
+    _generation = 0
+
     def __init__(self, expression: str = None) -> None:
-        self.left = None
-        self.right = None
-        self.value = None
+        self._left = None
+        self._right = None
+        self._value = None
+        self._derivatives = None
+        self._domain = None
+        self._native = None
+        self._stamp = 0
+
+        if expression and expression not in ("undefined", "nan"):
+            root = Parser(expression).parse(Function.node)
+            if root is not None:
+                self._value, self._left, self._right = root.value, root.left, root.right
+
+    @property
+    def value(self):
+        """
+        Свойство, содержащее оператор, переменную, константу или число узла.
+        Изменение сбрасывает кэши деревьев, содержащих узел;\
+            общие узлы (см. `Function.node`) изменять нельзя.
+        """
+        return self._value
+
+    @value.setter
+    def value(self, value) -> None:
+        self._mutate()
+        self._value = value
 
-        if expression in ("undefined", "nan"):
-            self._build_tree([])
-        elif expression:
-            rpn = Parser(expression).rpn
-            self._build_tree(rpn)
+    @property
+    def left(self):
+        """
+        Свойство, содержащее левый (единственный для префиксных) операнд.
+        """
+        return self._left
 
-    def _build_tree(self, rpn: list) -> None:
+    @left.setter
+    def left(self, left) -> None:
+        self._mutate()
+        self._left = left
+
+    @property
+    def right(self):
+        """
+        Свойство, содержащее правый операнд.
+        """
+        return self._right
+
+    @right.setter
+    def right(self, right) -> None:
+        self._mutate()
+        self._right = right
+
+    def _mutate(self) -> None:
+        if self._stamp < 0:
+            raise AttributeError("Общие узлы функции нельзя изменять")
+        Function._generation += 1
+        self._stamp = Function._generation
+
+    def _version(self) -> int:
+        # Последнее изменение среди изменяемых узлов дерева: общие узлы\
+        #     не изменяются, поэтому их поддеревья не обходятся.
         # pylint: disable=protected-access
-        if not rpn:
-            return
+        result = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is None or node._stamp < 0:
+                continue
+            result = max(result, node._stamp)
+            stack += (node._left, node._right)
+        return result
+
+    @classmethod
+    def node(cls, value, left=None, right=None):
+        """
+        Метод, создающий узел дерева функции без разбора выражения.
+        Узлы хранятся в общей таблице: структурно одинаковые подвыражения\
+            представлены одним объектом, поэтому созданные узлы нельзя изменять.
+
+        Args:
+            value: Оператор, переменная, константа или число.
+            left (Function, optional): Левый (единственный для префиксных) операнд.
+            right (Function, optional): Правый операнд.
+
+        Returns:
+            Function: Общий узел с заданным значением и операндами.
+        """
+        key = (value, value.__class__, id(left), id(right))
+        result = _NODES.get(key)
+        if result is None:
+            result = cls()
+            result._value = value
+            result._left = left
+            result._right = right
+            result._stamp = -1
+            _NODES[key] = result
+        return result
+
+    def to_bytes(self) -> bytes:
+        """
+        Метод, записывающий функцию в компактном двоичном виде\
+            (см. `functions.serialization`).
 
-        token = rpn.pop()
-        if NUM_REGEX.match(token):
-            self.value = float(token)
-        else:
-            self.value = token
+        Returns:
+            bytes: Двоичное представление.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .serialization import to_bytes
 
-        if token not in OPERATORS:
-            return
+        return to_bytes(self)
 
-        if OPERATORS[token].operator_type == OperatorType.BINARY:
-            self.right = Function()
-            self.right._build_tree(rpn)
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Метод, восстанавливающий функцию из двоичного вида без разбора выражения.
+
+        Args:
+            data (bytes | bytearray | memoryview | mmap): Двоичное представление.
+
+        Raises:
+            ValueError: Возникает, когда данные повреждены.
+
+        Returns:
+            Function: Восстановленная функция.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .serialization import from_bytes
 
-        self.left = Function()
-        self.left._build_tree(rpn)
+        return from_bytes(data)
+
+    def __reduce__(self):
+        # Глубокие деревья передаются между процессами в двоичном виде,\
+        #     без рекурсивного обхода pickle.
+        return Function.from_bytes, (self.to_bytes(),)
+
+    def intern(self):
+        """
+        Метод, возвращающий представление функции в виде графа\
+            с общими подвыражениями (см. `Function.node`).
+
+        Returns:
+            Function: Общий узел, структурно равный функции.
+        """
+        return self._intern({})
+
+    def _intern(self, memo: dict):
+        # pylint: disable=protected-access
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in memo:
+                continue
+            key = (node._value, node._value.__class__, id(node._left), id(node._right))
+            if _NODES.get(key) is node:
+                memo[id(node)] = node
+                continue
+            children = [child for child in (node._left, node._right) if child is not None]
+            if not expanded:
+                stack.append((node, True))
+                stack += [(child, False) for child in reversed(children)]
+                continue
+            left = None if node._left is None else memo[id(node._left)]
+            right = None if node._right is None else memo[id(node._right)]
+            memo[id(node)] = Function.node(node._value, left, right)
+        return memo[id(self)]
 
     def validate_function(self, **values) -> bool:
         """
@@ -61,6 +211,8 @@ class Function:
         Returns:
             bool: Функция введена правильно.
         """
+        if not values:
+            return self.is_defined()
         if self.value is None:
             return False
         try:
@@ -69,17 +221,129 @@ class Function:
             return False
         return True
 
-    def simplify(self):
+    def is_defined(self) -> bool:
+        """
+        Метод проверяет, нет ли в функции недопустимой операции над константами\
+            (например, деления на ноль), не вычисляя функцию целиком.
+        Результат анализа кэшируется в общих узлах, изменяемые узлы\
+            анализируются заново.
+
+        Returns:
+            bool: Функция определена.
+        """
+        if self._value is None:
+            return False
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node._domain is not None and node._stamp < 0:
+                continue
+            if expanded or node._value not in OPERATORS:
+                node._domain = node._domain_node()
+                continue
+            stack.append((node, True))
+            if node._right is not None:
+                stack.append((node._right, False))
+            stack.append((node._left, False))
+        return self._domain[0]
+
+    def is_defined_on(self, **ranges) -> bool:
+        """
+        Метод проверяет интервальной арифметикой, что функция определена\
+            во всех точках прямоугольника значений переменных (см. `functions.interval`).
+        False означает, что хотя бы в части точек функция может быть не определена.
+
+        Args:
+            **ranges: Интервалы (`Interval` или пары границ) или числа для переменных.
+
+        Raises:
+            ValueError: Возникает, когда указаны не все переменные функции.
+
+        Returns:
+            bool: Функция определена на всем прямоугольнике.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .interval import Domain
+
+        if self._value is None:
+            return False
+        return self.bounds(**ranges)[0] == Domain.DEFINED
+
+    def bounds(self, **ranges) -> tuple:
+        """
+        Метод, вычисляющий оболочку значений функции на прямоугольнике\
+            значений переменных за один проход по дереву (см. `functions.interval`).
+
+        Args:
+            **ranges: Интервалы (`Interval` или пары границ) или числа для переменных.
+
+        Raises:
+            ValueError: Возникает, когда функция не определена\
+                или указаны не все ее переменные.
+
+        Returns:
+            tuple: Определенность (`Domain`) и оболочка значений (`Interval` или None).
+        """
+        # pylint: disable=import-outside-toplevel
+        from .interval import evaluate
+
+        return evaluate(self, ranges)
+
+    def _domain_node(self) -> tuple:
+        # pylint: disable=protected-access
+        value = self._value
+        if value is None:
+            return False, None
+        if value not in OPERATORS:
+            if isinstance(value, str):
+                return True, CONSTANTS.get(value)
+            return True, value
+
+        defined, x = self._left._domain
+        arguments = (x,)
+        if OPERATORS[value].operator_type == OperatorType.BINARY:
+            right_defined, y = self._right._domain
+            if value == "/" and y == 0.0:
+                return False, None
+            defined = defined and right_defined
+            arguments = (x, y)
+        if not defined:
+            return False, None
+        if None in arguments:
+            return True, None
+        try:
+            return True, CHECKED_FUNCTIONS.get(value, OPERATORS[value].function)(*arguments)
+        except (ZeroDivisionError, ValueError):
+            return False, None
+        except OverflowError:
+            return True, None
+
+    def simplify(self, deep: bool = False):
         """
         Метод, который упрощает и возвращает новую функцию.
+        По дефолту используются собственные правила переписывания дерева.
+        В глубоком режиме выражение упрощается через sympy,
         т.к в символьных мат. библиотеках
         используются другие обозначения(например: tg = tan)
 
+        Args:
+            deep (bool): Упрощать ли через sympy. По дефолту False.
+
         Returns:
             Function: Упрощенная функция
         """
-        if not self.validate_function():
-            return self
+        if deep:
+            return self._simplify_sympy() if self.is_defined() else self
+
+        # pylint: disable=import-outside-toplevel
+        from .simplifier import Simplifier
+
+        return Simplifier().simplify_defined(self)
+
+    def _simplify_sympy(self):
+        # pylint: disable=import-outside-toplevel
+        from sympy import nsimplify, simplify, sympify
+
         expr = str(self).replace("tg", "tan").replace("e", "E")
         simplified = str(simplify(nsimplify(sympify(expr))))
         simplified = (
@@ -107,21 +371,33 @@ class Function:
         Returns:
             Function: Приведенная функция с выполненными вычислениями.
         """
+        return self._calculate(values, {})
+
+    def _calculate(self, values: dict, memo: dict):
+        cached = memo.get(id(self))
+        if cached is not None:
+            return cached
+        for node in _post_order(self, memo):
+            memo[id(node)] = node._calculate_node(values, memo)
+        return memo[id(self)]
+
+    def _calculate_node(self, values: dict, memo: dict):
+        # pylint: disable=protected-access
         result = Function()
         if self.value in values:
-            result.value = values[self.value]
+            result._value = values[self.value]
             return result
         if self.value in CONSTANTS:
-            result.value = CONSTANTS[self.value]
+            result._value = CONSTANTS[self.value]
             return result
 
-        result.value = self.value
+        result._value = self.value
         if result.value not in OPERATORS:
             return result
 
-        result.left = self.left.calculate(**values)
+        result._left = self.left._calculate(values, memo)
         if OPERATORS[result.value].operator_type == OperatorType.BINARY:
-            result.right = self.right.calculate(**values)
+            result._right = self.right._calculate(values, memo)
             if result.value == "/" and result.right.value == 0.0:
                 raise ZeroDivisionError
 
@@ -139,8 +415,8 @@ class Function:
                 )
                 if isinstance(value, complex):
                     raise ValueError("Аргумент находится за пределами области функции")
-                result.value = value
-                result.left = result.right = None
+                result._value = value
+                result._left = result._right = None
         elif isinstance(result.left.value, (int, float)):
             if result.value == "sqrt" and result.left.value < 0.0:
                 raise ValueError("Аргумент находится за пределами области функции")
@@ -148,298 +424,541 @@ class Function:
                 raise ValueError("Аргумент находится за пределами области функции")
 
             value = OPERATORS[result.value].calculate(result.left.value)
-            result.value = value
-            result.left = None
+            result._value = value
+            result._left = None
         return result
 
-    def derive(self, variable: str = "x", **values: dict) -> float:
+    def specialize(self, **values: dict):
         """
-        Метод принимает производную производную функции по данной переменной\
-            и в данной точке.
+        Метод, частично вычисляющий функцию при известных значениях части переменных.
+        В отличие от `calculate`, дерево не копируется целиком: числовые\
+            подвыражения и константы сворачиваются, тождества (`x*1`, `x+0`, ...)\
+            убираются, а результат строится из общих узлов (см. `Function.node`)\
+            и подходит для `compile_native` по оставшимся переменным.
 
         Args:
-            переменная(str): Переменная дифференцирования.\
-                По дефолту : 'x'
-            **значение: Позиционные аргументы для переменных функции.
+            **values: Значения известных переменных.
 
         Raises:
-            ValueError: Возникает когда указанная точка\
-                неправильно или когда производная не существует в этой точке.
+            ZeroDivisionError: Возникает при делении на ноль
+            ValueError: Возникает, когда функция получает\
+                аргумент выходящий за пределы его области.
 
         Returns:
-            float: Производная функции в данной точке.
+            Function: Функция от оставшихся переменных.
         """
-        derivative = self.diff(variable)
-        if self.validate_function(**values) and derivative.validate_function(**values):
-            value = derivative.calculate(**values).value
-            if not isinstance(value, (int, float)):
-                raise ValueError("Точка указана неверно")
-            return value
-        raise ValueError("Производная в данной точке не существует")
+        # pylint: disable=import-outside-toplevel
+        from .specialize import specialize
 
-    def diff(self, variable: str = "x"):
+        return specialize(self, values)
+
+    def variables(self) -> tuple:
         """
-        Метод дифференцирующий функцию
+        Метод, возвращающий переменные, от которых зависит функция.
+
+        Returns:
+            tuple: Отсортированные имена переменных (без констант).
+        """
+        result = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is None or node.value is None:
+                continue
+            if node.value in OPERATORS:
+                stack.append(node.left)
+                stack.append(node.right)
+            elif isinstance(node.value, str) and node.value not in CONSTANTS:
+                result.add(node.value)
+        return tuple(sorted(result))
+
+    def compile(self, *variables: str):
+        """
+        Метод, компилирующий функцию в векторизованный вычислитель NumPy.
+        Область определения совпадает с `calculate`, но вместо исключений\
+            недопустимые точки получают значение NaN.
 
         Args:
-            значение (str): По дефолту 'x'.
+            *variables: Порядок переменных для позиционных аргументов.\
+                По дефолту все переменные функции в алфавитном порядке.
+
+        Raises:
+            ValueError: Возникает, когда указаны не все переменные функции.
 
         Returns:
-            Function: Производная функции
+            VectorizedFunction: Вызываемый объект над массивами NumPy.
         """
-        if self.value is None:
-            return Function()
+        # pylint: disable=import-outside-toplevel
+        from .vectorized import VectorizedFunction
 
-        derivative = None
-        match self.value:
-            case "+" | "-":
-                derivative = self._diff_sum(variable)
-            case "unary-":
-                derivative = self._diff_unary_min(variable)
-            case "*":
-                derivative = self._diff_prod(variable)
-            case "/":
-                derivative = self._diff_div(variable)
-            case "^":
-                derivative = self._diff_pow(variable)
-            case "sqrt":
-                derivative = self._diff_sqrt(variable)
-            case "exp":
-                derivative = self._diff_exp(variable)
-            case "ln":
-                derivative = self._diff_ln(variable)
-            case "sin":
-                derivative = self._diff_sin(variable)
-            case "cos":
-                derivative = self._diff_cos(variable)
-            case "tg":
-                derivative = self._diff_tg(variable)
-            case _:
-                derivative = self._diff_var(variable)
-        return derivative.simplify()
-
-    def _diff_sum(self, variable: str):
-        derivative = Function()
-        derivative.value = self.value
-        derivative.left = self.left.diff(variable)
-        derivative.right = self.right.diff(variable)
-        return derivative
+        return VectorizedFunction(self, variables or self.variables())
 
-    def _diff_unary_min(self, variable: str):
-        derivative = Function()
-        derivative.value = "unary-"
-        derivative.left = self.left.diff(variable)
-        return derivative
+    def to_program(self, *variables: str):
+        """
+        Метод, переводящий функцию в плоскую программу для стековой машины.
+        Подходит для многократного вычисления во внутренних циклах:\
+            проверки области определения совпадают с `calculate`.
 
-    def _diff_prod(self, variable: str):
-        derivative = Function()
-        derivative.value = "+"
+        Args:
+            *variables: Порядок переменных при вызове программы.\
+                По дефолту все переменные функции в алфавитном порядке.
 
-        derivative.left = Function()
-        derivative.left.value = "*"
-        derivative.left.left = self.left.diff(variable)
-        derivative.left.right = self.right
+        Raises:
+            ValueError: Возникает, когда функция не определена\
+                или указаны не все ее переменные.
 
-        derivative.right = Function()
-        derivative.right.value = "*"
-        derivative.right.left = self.left
-        derivative.right.right = self.right.diff(variable)
-        return derivative
+        Returns:
+            Program: Программа, вызываемая с позиционными значениями переменных.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .program import Program
 
-    def _diff_div(self, variable: str):
-        derivative = Function()
-        derivative.value = "/"
+        return Program(self, variables or self.variables())
 
-        derivative.left = Function()
-        derivative.left.value = "-"
+    def to_python_source(self, *variables: str) -> str:
+        """
+        Метод, записывающий функцию в виде прямолинейного исходного кода Python.
 
-        derivative.left.left = Function()
-        derivative.left.left.value = "*"
-        derivative.left.left.left = self.left.diff(variable)
-        derivative.left.left.right = self.right
+        Args:
+            *variables: Порядок параметров сгенерированной функции.\
+                По дефолту все переменные функции в алфавитном порядке.
 
-        derivative.left.right = Function()
-        derivative.left.right.value = "*"
-        derivative.left.right.left = self.left
-        derivative.left.right.right = self.right.diff(variable)
+        Raises:
+            ValueError: Возникает, когда функция не определена\
+                или указаны не все ее переменные.
 
-        derivative.right = Function()
-        derivative.right.value = "^"
+        Returns:
+            str: Исходный код определения функции.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .codegen import to_python_source
 
-        derivative.right.left = self.right
+        return to_python_source(self, variables or self.variables())
 
-        derivative.right.right = Function()
-        derivative.right.right.value = 2.0
-        return derivative
+    def compile_native(self, *variables: str):
+        """
+        Метод, компилирующий функцию в функцию Python (см. `to_python_source`).
+        Скомпилированная функция кэшируется в функции до ее изменения.
+        Проверки области определения совпадают с `calculate`.
 
-    def _diff_pow(self, variable: str):
-        derivative = Function()
-        derivative.value = "*"
+        Args:
+            *variables: Порядок параметров скомпилированной функции.\
+                По дефолту все переменные функции в алфавитном порядке.
 
-        derivative.left = Function()
-        derivative.left.value = "+"
+        Raises:
+            ValueError: Возникает, когда функция не определена\
+                или указаны не все ее переменные.
 
-        derivative.left.left = Function()
-        derivative.left.left.value = "/"
+        Returns:
+            callable: Функция от значений переменных, выбрасывающая\
+                ZeroDivisionError и ValueError как `calculate`.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .codegen import compile_native
+
+        variables = variables or self.variables()
+        version = self._version()
+        if self._native is None or self._native[0] != version:
+            self._native = (version, {})
+        compiled = self._native[1].get(variables)
+        if compiled is None:
+            compiled = compile_native(self, variables)
+            self._native[1][variables] = compiled
+        return compiled
+
+    def derive(self, variable: str = "x", mode: str = "symbolic", **values: dict) -> float:
+        """
+        Метод принимает производную производную функции по данной переменной\
+            и в данной точке. Символьная производная берется из кэша функции.
+        В режиме 'ad' производная вычисляется дуальными числами\
+            за один проход по дереву без символьного дифференцирования.
 
-        derivative.left.left.left = Function()
-        derivative.left.left.left.value = "*"
+        Args:
+            переменная(str): Переменная дифференцирования.\
+                По дефолту : 'x'
+            mode (str): Способ вычисления: 'symbolic' или 'ad'.\
+                По дефолту 'symbolic'.
+            **значение: Позиционные аргументы для переменных функции.
 
-        derivative.left.left.left.left = self.left.diff(variable)
-        derivative.left.left.left.right = self.right
+        Raises:
+            ValueError: Возникает когда указанная точка\
+                неправильно или когда производная не существует в этой точке.
 
-        derivative.left.left.right = self.left
+        Returns:
+            float: Производная функции в данной точке.
+        """
+        if mode == "ad":
+            # pylint: disable=import-outside-toplevel
+            from .autodiff import derive
 
-        derivative.left.right = Function()
-        derivative.left.right.value = "*"
+            if set(self.variables()).difference(values):
+                raise ValueError("Точка указана неверно")
+            try:
+                return derive(self, variable, values)[1]
+            except (ZeroDivisionError, ValueError) as error:
+                raise ValueError("Производная в данной точке не существует") from error
+        if mode != "symbolic":
+            raise ValueError(f"Неизвестный способ дифференцирования: {mode}")
 
-        derivative.left.right.left = Function()
-        derivative.left.right.left.value = "ln"
+        derivative = self.diff(variable)
+        if self.validate_function(**values) and derivative.validate_function(**values):
+            value = derivative.calculate(**values).value
+            if not isinstance(value, (int, float)):
+                raise ValueError("Точка указана неверно")
+            return value
+        raise ValueError("Производная в данной точке не существует")
 
-        derivative.left.right.left.left = self.left
+    def gradient(self, **values: dict) -> dict:
+        """
+        Метод, вычисляющий градиент функции в точке обратным\
+            автоматическим дифференцированием (одно вычисление функции\
+            и один обратный проход для всех переменных).
 
-        derivative.left.right.right = self.right.diff(variable)
+        Args:
+            **values: Значения переменных функции.
 
-        derivative.right = Function()
-        derivative.right.value = "^"
+        Raises:
+            ValueError: Возникает когда указанная точка\
+                неправильно или когда производная не существует в этой точке.
 
-        derivative.right.left = self.left
-        derivative.right.right = self.right
-        return derivative
+        Returns:
+            dict: Частные производные по каждой переданной переменной.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .autodiff import gradient
 
-    def _diff_sqrt(self, variable: str):
-        derivative = Function()
-        derivative.value = "/"
+        if set(self.variables()).difference(values):
+            raise ValueError("Точка указана неверно")
+        try:
+            return gradient(self, values)
+        except (ZeroDivisionError, ValueError) as error:
+            raise ValueError("Производная в данной точке не существует") from error
 
-        derivative.left = self.left.diff(variable)
+    def gradient_symbolic(self, variables: tuple = None, simplify: bool = True) -> dict:
+        """
+        Метод, строящий символьные частные производные по всем переменным\
+            за один обратный проход. Общие подвыражения строятся\
+            и упрощаются один раз для всех производных.
 
-        derivative.right = Function()
-        derivative.right.value = "*"
+        Args:
+            variables (tuple, optional): Переменные дифференцирования.\
+                По дефолту все переменные функции.
+            simplify (bool): Упрощать ли полученные производные. По дефолту True.
 
-        derivative.right.left = Function()
-        derivative.right.left.value = 2.0
+        Returns:
+            dict: Частные производные (Function) по каждой переменной.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .autodiff import gradient_symbolic
+        from .simplifier import Simplifier
+
+        variables = tuple(self.variables() if variables is None else variables)
+        partials = gradient_symbolic(self, variables)
+        if not simplify:
+            return partials
+        simplifier = Simplifier()
+        return {
+            variable: simplifier.simplify_defined(partial)
+            for variable, partial in partials.items()
+        }
+
+    def compile_derivative(self, variable: str = "x", *variables: str):
+        """
+        Метод, компилирующий функцию и ее производную в векторизованный\
+            вычислитель дуальных чисел над массивами NumPy.
 
-        derivative.right.right = Function()
-        derivative.right.right.value = "sqrt"
-        derivative.right.right.left = self.left
-        return derivative
+        Args:
+            variable (str): Переменная дифференцирования. По дефолту 'x'.
+            *variables: Порядок переменных для позиционных аргументов.\
+                По дефолту все переменные функции в алфавитном порядке.
 
-    def _diff_exp(self, variable: str):
-        derivative = Function()
-        derivative.value = "*"
-        derivative.left = self.left.diff(variable)
+        Raises:
+            ValueError: Возникает, когда указаны не все переменные функции.
 
-        derivative.right = Function()
-        derivative.right.value = "exp"
-        derivative.right.left = self.left
-        return derivative
+        Returns:
+            VectorizedDerivative: Вызываемый объект, возвращающий значения\
+                функции и производной.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .autodiff import VectorizedDerivative
 
-    def _diff_ln(self, variable: str):
-        derivative = Function()
-        derivative.value = "/"
-        derivative.left = self.left.diff(variable)
-        derivative.right = self.left
-        return derivative
+        return VectorizedDerivative(self, variable, variables or self.variables())
+
+    def diff(self, variable: str = "x", order: int = 1, simplify: bool = True):
+        """
+        Метод дифференцирующий функцию.
+        Производная строится за один проход по графу общих подвыражений\
+            (производная каждого узла вычисляется один раз)\
+            и упрощается один раз в корне.
+        Производные всех порядков кэшируются в функции (см. `derivatives`).
 
-    def _diff_sin(self, variable: str):
-        derivative = Function()
-        derivative.value = "*"
+        Args:
+            значение (str): По дефолту 'x'.
+            order (int): Порядок производной. По дефолту 1.
+            simplify (bool): Упрощать ли полученную производную.\
+                По дефолту True.
 
-        derivative.left = self.left.diff(variable)
+        Raises:
+            ValueError: Возникает, когда порядок производной меньше единицы.
 
-        derivative.right = Function()
-        derivative.right.value = "cos"
-        derivative.right.left = self.left
+        Returns:
+            Function: Производная функции
+        """
+        if order < 1:
+            raise ValueError("Порядок производной должен быть натуральным числом")
+        for derivative in self.derivatives(variable, order, simplify):
+            pass
         return derivative
 
-    def _diff_cos(self, variable: str):
-        derivative = Function()
-        derivative.value = "unary-"
+    def derivatives(self, variable: str = "x", up_to: int = None, simplify: bool = True):
+        """
+        Генератор последовательных производных функции начиная с первой.
+        Уже вычисленные порядки берутся из кэша функции, поэтому\
+            производная порядка n после порядка n - 1 стоит одного шага.
 
-        derivative.left = Function()
-        derivative.left.value = "*"
+        Args:
+            variable (str): Переменная дифференцирования. По дефолту 'x'.
+            up_to (int, optional): Наибольший порядок.\
+                По дефолту генератор бесконечный.
+            simplify (bool): Упрощать ли производные. По дефолту True.
 
-        derivative.left.left = self.left.diff(variable)
+        Yields:
+            Function: Производная очередного порядка.
+        """
+        # pylint: disable=protected-access
+        version = self._version()
+        if self._derivatives is None or self._derivatives[0] != version:
+            self._derivatives = (version, {})
+        cache = self._derivatives[1].setdefault((variable, simplify), [])
+        derivative = self
+        order = 0
+        while up_to is None or order < up_to:
+            if order < len(cache):
+                derivative = cache[order]
+            else:
+                derivative = derivative.intern()._diff(variable, {})
+                if simplify:
+                    derivative = derivative.simplify()
+                cache.append(derivative)
+            order += 1
+            yield derivative
+
+    def _diff(self, variable: str, memo: dict):
+        cached = memo.get(id(self))
+        if cached is not None:
+            return cached
+        for node in _post_order(self, memo):
+            memo[id(node)] = node._diff_node(variable, memo)
+        return memo[id(self)]
+
+    def _diff_node(self, variable: str, memo: dict):
+        if self.value is None:
+            return Function()
 
-        derivative.left.right = Function()
-        derivative.left.right.value = "sin"
-        derivative.left.right.left = self.left
-        return derivative
+        match self.value:
+            case "+" | "-":
+                return self._diff_sum(variable, memo)
+            case "unary-":
+                return self._diff_unary_min(variable, memo)
+            case "*":
+                return self._diff_prod(variable, memo)
+            case "/":
+                return self._diff_div(variable, memo)
+            case "^":
+                return self._diff_pow(variable, memo)
+            case "sqrt":
+                return self._diff_sqrt(variable, memo)
+            case "exp":
+                return self._diff_exp(variable, memo)
+            case "ln":
+                return self._diff_ln(variable, memo)
+            case "sin":
+                return self._diff_sin(variable, memo)
+            case "cos":
+                return self._diff_cos(variable, memo)
+            case "tg":
+                return self._diff_tg(variable, memo)
+            case _:
+                return self._diff_var(variable)
+
+    def _diff_sum(self, variable: str, memo: dict):
+        return Function.node(
+            self.value,
+            self.left._diff(variable, memo),
+            self.right._diff(variable, memo),
+        )
 
-    def _diff_tg(self, variable: str):
-        derivative = Function()
-        derivative.value = "/"
-        derivative.left = self.left.diff(variable)
+    def _diff_unary_min(self, variable: str, memo: dict):
+        return Function.node("unary-", self.left._diff(variable, memo))
 
-        derivative.right = Function()
-        derivative.right.value = "^"
+    def _diff_prod(self, variable: str, memo: dict):
+        return Function.node(
+            "+",
+            Function.node("*", self.left._diff(variable, memo), self.right),
+            Function.node("*", self.left, self.right._diff(variable, memo)),
+        )
 
-        derivative.right.left = Function()
-        derivative.right.left.value = "cos"
-        derivative.right.left.left = self.left
+    def _diff_div(self, variable: str, memo: dict):
+        return Function.node(
+            "/",
+            Function.node(
+                "-",
+                Function.node("*", self.left._diff(variable, memo), self.right),
+                Function.node("*", self.left, self.right._diff(variable, memo)),
+            ),
+            Function.node("^", self.right, Function.node(2.0)),
+        )
 
-        derivative.right.right = Function()
-        derivative.right.right.value = 2.0
-        return derivative
+    def _diff_pow(self, variable: str, memo: dict):
+        return Function.node(
+            "*",
+            Function.node(
+                "+",
+                Function.node(
+                    "/",
+                    Function.node("*", self.left._diff(variable, memo), self.right),
+                    self.left,
+                ),
+                Function.node(
+                    "*",
+                    Function.node("ln", self.left),
+                    self.right._diff(variable, memo),
+                ),
+            ),
+            Function.node("^", self.left, self.right),
+        )
+
+    def _diff_sqrt(self, variable: str, memo: dict):
+        return Function.node(
+            "/",
+            self.left._diff(variable, memo),
+            Function.node("*", Function.node(2.0), Function.node("sqrt", self.left)),
+        )
+
+    def _diff_exp(self, variable: str, memo: dict):
+        return Function.node(
+            "*", self.left._diff(variable, memo), Function.node("exp", self.left)
+        )
+
+    def _diff_ln(self, variable: str, memo: dict):
+        return Function.node("/", self.left._diff(variable, memo), self.left)
+
+    def _diff_sin(self, variable: str, memo: dict):
+        return Function.node(
+            "*", self.left._diff(variable, memo), Function.node("cos", self.left)
+        )
+
+    def _diff_cos(self, variable: str, memo: dict):
+        return Function.node(
+            "unary-",
+            Function.node(
+                "*", self.left._diff(variable, memo), Function.node("sin", self.left)
+            ),
+        )
+
+    def _diff_tg(self, variable: str, memo: dict):
+        return Function.node(
+            "/",
+            self.left._diff(variable, memo),
+            Function.node("^", Function.node("cos", self.left), Function.node(2.0)),
+        )
 
     def _diff_var(self, variable: str):
-        derivative = Function()
-        derivative.value = 1.0 if self.value == variable else 0.0
-        return derivative
+        return Function.node(1.0 if self.value == variable else 0.0)
 
     def __str__(self) -> str:
-        if not self.validate_function():
+        if not self.is_defined():
             return "undefined"
-        tokens = []
-        self._tokenize_tree(tokens)
-        expr = "".join(map(str, tokens))
-        return expr
-
-    def _tokenize_tree(self, tokens: list) -> None:
-        if self.value not in OPERATORS:
-            tokens.append(self.value)
-            return
-
-        if OPERATORS[self.value].operator_type == OperatorType.PREFIX:
-            if self.value == "unary-":
-                tokens.append("-")
-            else:
-                tokens.append(self.value)
-            self._tree_op_wrapper(self.left, tokens)
-        else:
-            self._tree_op_wrapper(self.left, tokens)
-            tokens.append(self.value)
+        return self.to_string()
 
-        if OPERATORS[self.value].operator_type == OperatorType.BINARY:
-            self._tree_op_wrapper(self.right, tokens)
+    def to_string(self) -> str:
+        """
+        Метод, записывающий функцию в виде выражения без проверки\
+            области определения (см. `is_defined`).
+        Запись строится за один проход, общие подвыражения записываются один раз.
 
-    def _tree_op_wrapper(self, child, tokens: list) -> None:
+        Returns:
+            str: Выражение.
+        """
         # pylint: disable=protected-access
-        wrap_child_operator = child.value in OPERATORS and (
-            OPERATORS[self.value].priority > OPERATORS[child.value].priority
-            or (
-                OPERATORS[self.value].priority == OPERATORS[child.value].priority
-                and (
-                    (
-                        child == self.right
-                        and OPERATORS[self.value].associativity
-                        == Associativity.LEFT_ASSOCIATIVE
-                    )
-                    or (
-                        child == self.left
-                        and OPERATORS[self.value].associativity
-                        == Associativity.RIGHT_ASSOCIATIVE
-                    )
+        if self._value is None:
+            return "undefined"
+        references = count_references(self)
+        shared = {}
+        tokens = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if item.__class__ is str:
+                tokens.append(item)
+                continue
+            if item.__class__ is tuple:
+                node, start = item
+                tokens[start:] = [shared.setdefault(id(node), "".join(tokens[start:]))]
+                continue
+
+            node = item
+            if id(node) in shared:
+                tokens.append(shared[id(node)])
+                continue
+            if node._value not in OPERATORS:
+                tokens.append(str(node._value))
+                continue
+            if references[id(node)] > 1:
+                stack.append((node, len(tokens)))
+
+            if OPERATORS[node._value].operator_type == OperatorType.PREFIX:
+                operator = "-" if node._value == "unary-" else node._value
+                stack += [")", node._left, "(", operator]
+                continue
+            stack += _wrapped(node._value, node._right, True)
+            stack.append(node._value)
+            stack += _wrapped(node._value, node._left, False)
+        return "".join(tokens)
+
+
+def _post_order(root: Function, memo: dict):
+    # Узлы без результата в memo в обратном порядке обхода (операнды раньше\
+    #     операторов): правила узла берут результаты операндов из memo,\
+    #     поэтому глубина дерева не ограничена рекурсией.
+    # pylint: disable=protected-access
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in memo:
+            continue
+        if expanded or node._value not in OPERATORS:
+            yield node
+            continue
+        stack.append((node, True))
+        if node._right is not None:
+            stack.append((node._right, False))
+        stack.append((node._left, False))
+
+
+def _wrapped(operator: str, child: Function, is_right: bool) -> list:
+    # pylint: disable=protected-access
+    wrap_child_operator = child._value in OPERATORS and (
+        OPERATORS[operator].priority > OPERATORS[child._value].priority
+        or (
+            OPERATORS[operator].priority == OPERATORS[child._value].priority
+            and (
+                (
+                    is_right
+                    and OPERATORS[operator].associativity
+                    == Associativity.LEFT_ASSOCIATIVE
+                )
+                or (
+                    not is_right
+                    and OPERATORS[operator].associativity
+                    == Associativity.RIGHT_ASSOCIATIVE
                 )
             )
         )
+    )
+    if wrap_child_operator:
+        return [")", child, "("]
+    return [child]
+
 
-        if (
-            OPERATORS[self.value].operator_type != OperatorType.BINARY
-            or wrap_child_operator
-        ):
-            tokens.append("(")
-            child._tokenize_tree(tokens)
-            tokens.append(")")
-        else:
-            child._tokenize_tree(tokens)
+_NODES = WeakValueDictionary()
@@ -0,0 +1,309 @@
+"""Модуль, обеспечивающий инкрементальный разбор и дифференцирование\
+    редактируемых выражений"""
+
+from .cache import LRUCache
+from .expr_parser import TOKEN_REGEX, EntitiesPlacementError, Parser, ParserError
+from .function import Function
+from .operators import OPERATORS
+
+SEPARATORS = ("+", "-")
+
+
+class IncrementalFunction:
+    """
+    Класс редактируемой функции.
+    Выражение хранится как сумма слагаемых верхнего уровня (`+` и `-`\
+        имеют наименьший приоритет и левую ассоциативность, поэтому дерево\
+        выражения - левая свертка слагаемых). При изменении текста заново\
+        разбираются только слагаемые вокруг измененного участка, а разобранные\
+        слагаемые и их производные берутся из кэшей по тексту слагаемого;\
+        одинаковые поддеревья - общие узлы (см. `Function.node`).
+
+    Args:
+        expression (str): Начальное выражение. По дефолту пустое.
+        cache_size (int): Размер кэшей слагаемых и производных. По дефолту 4096.
+    """
+
+    def __init__(self, expression: str = "", cache_size: int = 4096) -> None:
+        self._text = ""
+        self._terms = []
+        self._balanced = True
+        self._chains = {}
+        self._nodes = LRUCache(cache_size)
+        self._derivatives = LRUCache(cache_size)
+        self.update(expression)
+
+    @property
+    def expression(self) -> str:
+        """
+        Свойство, содержащее текущее выражение без пробелов.
+
+        Returns:
+            str: Выражение.
+        """
+        return self._text
+
+    @property
+    def terms(self) -> list:
+        """
+        Свойство, содержащее слагаемые верхнего уровня.
+
+        Returns:
+            list: Пары (знак перед слагаемым или None, текст слагаемого).
+        """
+        return list(self._terms)
+
+    def update(self, expression: str) -> None:
+        """
+        Метод, заменяющий выражение новым текстом.
+        Общие начало и конец старого и нового текста не разбираются заново:\
+            пересобираются только слагаемые, задетые изменением, и их соседи.
+
+        Args:
+            expression (str): Новое выражение.
+        """
+        text = "".join(expression.split())
+        old = self._text
+        if text == old and self._terms:
+            return
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        self._text = text
+        if not self._terms or not self._balanced:
+            # Пока скобки не сбалансированы, границы слагаемых зависят от всего текста.
+            self._replace(0, len(self._terms), self._split(0, len(text), None))
+            return
+
+        starts = []
+        position = 0
+        for sign, term in self._terms:
+            starts.append(position)
+            position += len(term) + (sign is not None)
+        first = max(_find(starts, prefix) - 1, 0)
+        last = min(_find(starts, len(old) - suffix) + 1, len(self._terms) - 1)
+
+        sign = self._terms[first][0]
+        start = starts[first] + (sign is not None)
+        end = starts[last] + (self._terms[last][0] is not None) + len(self._terms[last][1])
+        window = self._split(start, end + len(text) - len(old), sign)
+        if window is None:
+            self._replace(0, len(self._terms), self._split(0, len(text), None))
+        else:
+            self._replace(first, last + 1, window)
+
+    def _replace(self, first: int, last: int, terms: list) -> None:
+        self._terms[first:last] = terms
+        for chain in self._chains.values():
+            chain.replace(first, last, len(terms))
+
+    def edit(self, position: int, removed: int, inserted: str = "") -> None:
+        """
+        Метод, заменяющий участок выражения.
+
+        Args:
+            position (int): Начало участка в выражении без пробелов.
+            removed (int): Длина удаляемого участка.
+            inserted (str): Вставляемый текст. По дефолту пустой.
+        """
+        self.update(self._text[:position] + inserted + self._text[position + removed :])
+
+    def function(self) -> Function:
+        """
+        Метод, возвращающий функцию текущего выражения.
+
+        Raises:
+            ParserError: Возникает, когда выражение записано неверно.
+
+        Returns:
+            Function: Функция, совпадающая с `Function(expression)`.
+        """
+        return _root(self._chain(None, self._node, False))
+
+    def diff(self, variable: str = "x", simplify: bool = True) -> Function:
+        """
+        Метод, дифференцирующий текущее выражение.
+        Производная - сумма производных слагаемых: для неизмененных слагаемых\
+            они берутся из кэша, а заново связываются только суммы после\
+            измененного слагаемого. При упрощении упрощается каждое\
+            слагаемое отдельно (подобные члены разных слагаемых не приводятся).
+
+        Args:
+            variable (str): Переменная дифференцирования. По дефолту 'x'.
+            simplify (bool): Упрощать ли производные слагаемых. По дефолту True.
+
+        Raises:
+            ParserError: Возникает, когда выражение записано неверно.
+
+        Returns:
+            Function: Производная. Без упрощения совпадает\
+                с `Function(expression).diff(variable, simplify=False)`.
+        """
+        if not self._terms:
+            return Function()
+
+        def derivative(index: int) -> Function:
+            key = (self._terms[index][1], variable, simplify)
+            result = self._derivatives.get(key)
+            if result is None:
+                result = self._node(index).diff(variable, simplify=simplify)
+                if result.value is not None:
+                    result = result.intern()
+                self._derivatives.put(key, result)
+            return result
+
+        result = self._chain((variable, simplify), derivative, simplify)
+        return Function("0") if result is None else _root(result)
+
+    def _chain(self, key, item: callable, simplify: bool):
+        # Левая свертка слагаемых; суммы до первого измененного слагаемого\
+        #     хранятся между вызовами.
+        chain = self._chains.get(key)
+        if chain is None:
+            chain = self._chains[key] = _Chain(len(self._terms))
+        items, folds = chain.items, chain.folds
+        for index in range(chain.valid, len(self._terms)):
+            if items[index] is None:
+                items[index] = item(index)
+            node = items[index]
+            sign = self._terms[index][0]
+            previous = folds[index - 1] if index else None
+            if previous is not None and previous.value is None:
+                fold = previous
+            elif node.value is None:
+                fold = node
+            elif simplify and node.value == 0:
+                fold = previous
+            elif previous is None:
+                fold = node if sign != "-" else _negate(node, simplify)
+            else:
+                fold = Function.node(sign, previous, node)
+            folds[index] = fold
+            chain.valid = index + 1
+        return folds[-1] if folds else None
+
+    def _node(self, index: int) -> Function:
+        sign, term = self._terms[index]
+        node = self._nodes.get(term)
+        if node is None:
+            position = sum(len(text) + (mark is not None) for mark, text in self._terms[:index])
+            node = self._parse(term, position + (sign is not None))
+            self._nodes.put(term, node)
+        return node
+
+    def _parse(self, term: str, position: int) -> Function:
+        if not term:
+            raise EntitiesPlacementError(self._text, max(position - 1, 0), 1)
+        try:
+            return Parser(term).parse(Function.node)
+        except ParserError as term_error:
+            term_error.expression = self._text
+            term_error.position += position
+            raise
+
+    def _split(self, start: int, end: int, sign) -> list:
+        # Делит участок текста на слагаемые; None, если скобки участка не сбалансированы.
+        whole = start == 0 and end == len(self._text)
+        terms = []
+        depth = 0
+        balanced = True
+        previous = None
+        term_start = start
+        for match in TOKEN_REGEX.finditer(self._text, start, end):
+            token = match.group()
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth -= 1
+            elif (
+                token in SEPARATORS
+                and depth <= 0
+                and previous is not None
+                and previous not in OPERATORS
+                and previous != "("
+            ):
+                terms.append((sign, self._text[term_start : match.start()]))
+                sign = token
+                term_start = match.end()
+            if depth < 0:
+                if not whole:
+                    return None
+                balanced = False
+            previous = token
+        if depth != 0:
+            if not whole:
+                return None
+            balanced = False
+        if whole:
+            self._balanced = balanced
+        if terms or start < end or sign is not None:
+            terms.append((sign, self._text[term_start:end]))
+        return terms
+
+
+class _Chain:
+    """
+    Слагаемые (узлы или производные) и их левые свертки;\
+        свертки до номера `valid` действительны.
+    """
+
+    __slots__ = ("items", "folds", "valid")
+
+    def __init__(self, size: int) -> None:
+        self.items = [None] * size
+        self.folds = [None] * size
+        self.valid = 0
+
+    def replace(self, first: int, last: int, count: int) -> None:
+        self.items[first:last] = [None] * count
+        self.folds[first:last] = [None] * count
+        self.valid = min(self.valid, first)
+
+
+def _negate(node: Function, simplify: bool) -> Function:
+    # Первое ненулевое слагаемое после нулевых со знаком минус.
+    result = Function.node("unary-", node)
+    if simplify:
+        result = _root(result).simplify().intern()
+    return result
+
+
+def _root(node: Function) -> Function:
+    result = Function()
+    if node is not None:
+        # pylint: disable=protected-access
+        result._value, result._left, result._right = node.value, node.left, node.right
+    return result
+
+
+def _find(starts: list, position: int) -> int:
+    # Номер слагаемого, участок которого (вместе со знаком) содержит позицию.
+    low, high = 0, len(starts) - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if starts[middle] <= position:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_prefix(old: str, new: str) -> int:
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(old: str, new: str, limit: int) -> int:
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle :] == new[len(new) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
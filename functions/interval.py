@@ -0,0 +1,406 @@
+"""Модуль, обеспечивающий интервальное вычисление функций\
+    для проверки области определения на отрезках"""
+
+import math
+from enum import Enum
+
+from .operators import CONSTANTS, OPERATORS, OperatorType
+from .program import CHECKED_FUNCTIONS
+
+INF = math.inf
+
+
+class Domain(Enum):
+    """
+    Класс Enum для описания определенности функции на интервале.
+    """
+
+    DEFINED = 0
+    PARTIAL = 1
+    UNDEFINED = 2
+
+
+class Interval:
+    """
+    Класс замкнутого интервала вещественных чисел.
+
+    Args:
+        lower (float): Нижняя граница.
+        upper (float, optional): Верхняя граница. По дефолту равна нижней.
+    """
+
+    __slots__ = ("_lower", "_upper")
+
+    def __init__(self, lower: float, upper: float = None) -> None:
+        upper = lower if upper is None else upper
+        if not lower <= upper:
+            raise ValueError(f"Интервал указан неверно: [{lower}, {upper}]")
+        self._lower = float(lower)
+        self._upper = float(upper)
+
+    @property
+    def lower(self) -> float:
+        """
+        Свойство, содержащее нижнюю границу интервала.
+
+        Returns:
+            float: Нижняя граница.
+        """
+        return self._lower
+
+    @property
+    def upper(self) -> float:
+        """
+        Свойство, содержащее верхнюю границу интервала.
+
+        Returns:
+            float: Верхняя граница.
+        """
+        return self._upper
+
+    @property
+    def is_bounded(self) -> bool:
+        """
+        Свойство, показывающее, что обе границы интервала конечны.
+
+        Returns:
+            bool: Интервал ограничен.
+        """
+        return math.isfinite(self._lower) and math.isfinite(self._upper)
+
+    def __contains__(self, value: float) -> bool:
+        return self._lower <= value <= self._upper
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Interval):
+            return NotImplemented
+        return (self._lower, self._upper) == (other._lower, other._upper)
+
+    def __hash__(self) -> int:
+        return hash((self._lower, self._upper))
+
+    def __repr__(self) -> str:
+        return f"Interval({self._lower!r}, {self._upper!r})"
+
+
+def evaluate(function, ranges: dict) -> tuple:
+    """
+    Функция, вычисляющая оболочку значений функции на прямоугольнике\
+        значений переменных за один проход по дереву.
+    Область определения совпадает с `Function.calculate`:\
+        `Domain.DEFINED` гарантирует, что вычисление не выбросит ошибку\
+        ни в одной точке, `Domain.UNDEFINED` - что выбросит во всех.
+    Оболочка охватывает значения во всех точках, где функция определена;\
+        границы немного расширяются с учетом округления.
+
+    Args:
+        function (Function): Функция.
+        ranges (dict): Интервалы (`Interval` или пары границ)\
+            или числа для переменных функции.
+
+    Raises:
+        ValueError: Возникает, когда функция не определена\
+            или указаны не все ее переменные.
+
+    Returns:
+        tuple: Определенность (`Domain`) и оболочка значений\
+            (`Interval` или None, если функция не определена нигде).
+    """
+    if function.value is None:
+        raise ValueError("Функция не определена")
+    ranges = {name: _interval(value) for name, value in ranges.items()}
+    missing = set(function.variables()).difference(ranges)
+    if missing:
+        raise ValueError(f"Не указаны переменные: {', '.join(sorted(missing))}")
+
+    results = {}
+    stack = [(function, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in results:
+            continue
+        value = node.value
+        if value not in OPERATORS:
+            if value in ranges:
+                results[id(node)] = (Domain.DEFINED, ranges[value])
+            else:
+                results[id(node)] = (Domain.DEFINED, Interval(CONSTANTS.get(value, value)))
+            continue
+        binary = OPERATORS[value].operator_type == OperatorType.BINARY
+        if not expanded:
+            stack.append((node, True))
+            if binary:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+            continue
+
+        operands = [results[id(node.left)]]
+        if binary:
+            operands.append(results[id(node.right)])
+        domains = {domain for domain, _ in operands}
+        if Domain.UNDEFINED in domains:
+            results[id(node)] = (Domain.UNDEFINED, None)
+            continue
+        intervals = [interval for _, interval in operands]
+        if all(interval.lower == interval.upper for interval in intervals):
+            domain, interval = _point(value, [interval.lower for interval in intervals])
+        else:
+            domain, interval = ENCLOSURES[value](*intervals)
+        if domain != Domain.UNDEFINED and Domain.PARTIAL in domains:
+            domain = Domain.PARTIAL
+        results[id(node)] = (domain, interval)
+    return results[id(function)]
+
+
+def partition(function, variable: str, lower: float, upper: float, depth: int = 8, **ranges):
+    """
+    Функция, делящая отрезок пополам, пока на частях функция определена\
+        частично, не глубже `depth` делений.
+    Части с `Domain.DEFINED` можно вычислять без проверок, а части\
+        с `Domain.UNDEFINED` - пропускать.
+
+    Args:
+        function (Function): Функция.
+        variable (str): Переменная, по которой делится отрезок.
+        lower (float): Начало отрезка.
+        upper (float): Конец отрезка.
+        depth (int): Наибольшая глубина деления. По дефолту 8.
+        **ranges: Интервалы или значения остальных переменных.
+
+    Returns:
+        list: Тройки (`Interval` части, `Domain`, оболочка значений) по возрастанию.
+    """
+    result = []
+    stack = [(Interval(lower, upper), depth)]
+    while stack:
+        piece, level = stack.pop()
+        domain, values = evaluate(function, {**ranges, variable: piece})
+        if domain == Domain.PARTIAL and level > 0:
+            middle = _middle(piece)
+            if piece.lower < middle < piece.upper:
+                stack.append((Interval(middle, piece.upper), level - 1))
+                stack.append((Interval(piece.lower, middle), level - 1))
+                continue
+        result.append((piece, domain, values))
+    return result
+
+
+def find_roots(
+    function, variable: str, lower: float, upper: float, tolerance: float = 1e-9, **ranges
+) -> list:
+    """
+    Функция, отделяющая корни функции на отрезке делением пополам:\
+        части, где оболочка значений не содержит нуля или функция\
+        не определена, отбрасываются.
+
+    Args:
+        function (Function): Функция.
+        variable (str): Переменная.
+        lower (float): Начало отрезка.
+        upper (float): Конец отрезка.
+        tolerance (float): Наибольшая длина возвращаемых частей. По дефолту 1e-9.
+        **ranges: Интервалы или значения остальных переменных.
+
+    Returns:
+        list: Непересекающиеся интервалы по возрастанию, вне которых корней нет.
+    """
+    result = []
+    stack = [Interval(lower, upper)]
+    while stack:
+        piece = stack.pop()
+        _, values = evaluate(function, {**ranges, variable: piece})
+        if values is None or 0.0 not in values:
+            continue
+        middle = _middle(piece)
+        if piece.upper - piece.lower <= tolerance or not piece.lower < middle < piece.upper:
+            if result and result[-1].upper == piece.lower:
+                piece = Interval(result.pop().lower, piece.upper)
+            result.append(piece)
+            continue
+        stack.append(Interval(middle, piece.upper))
+        stack.append(Interval(piece.lower, middle))
+    return result
+
+
+def _interval(value) -> Interval:
+    if isinstance(value, Interval):
+        return value
+    if isinstance(value, (int, float)):
+        return Interval(value)
+    lower, upper = value
+    return Interval(lower, upper)
+
+
+def _middle(interval: Interval) -> float:
+    return interval.lower / 2 + interval.upper / 2
+
+
+def _point(operator: str, arguments: list) -> tuple:
+    # В точке результат совпадает с вычислением `calculate`.\
+    #     NaN (например, inf * 0) не ошибка области определения: `calculate`\
+    #     возвращает его без исключения, а значение не ограничено.
+    function = CHECKED_FUNCTIONS.get(operator, OPERATORS[operator].function)
+    try:
+        result = function(*arguments)
+    except (ZeroDivisionError, ValueError):
+        return Domain.UNDEFINED, None
+    except OverflowError:
+        return Domain.DEFINED, Interval(-INF, INF)
+    if math.isnan(result):
+        return Domain.DEFINED, Interval(-INF, INF)
+    return Domain.DEFINED, Interval(result)
+
+
+def _widen(lower: float, upper: float) -> Interval:
+    # Границы расширяются на ulp с учетом округления.
+    if math.isnan(lower) or math.isnan(upper):
+        return Interval(-INF, INF)
+    return Interval(math.nextafter(lower, -INF), math.nextafter(upper, INF))
+
+
+def _multiply(x: float, y: float) -> float:
+    # 0 * inf считается нулем: бесконечная граница не достигается.
+    if x == 0.0 or y == 0.0:
+        return 0.0
+    return x * y
+
+
+def _real_power(x: float, y: float) -> float:
+    if x == 0.0:
+        return INF if y < 0.0 else (0.0 if y > 0.0 else 1.0)
+    try:
+        return x**y
+    except OverflowError:
+        return INF
+
+
+def _add(x: Interval, y: Interval) -> tuple:
+    return Domain.DEFINED, _widen(x.lower + y.lower, x.upper + y.upper)
+
+
+def _subtract(x: Interval, y: Interval) -> tuple:
+    return Domain.DEFINED, _widen(x.lower - y.upper, x.upper - y.lower)
+
+
+def _negate(x: Interval) -> tuple:
+    return Domain.DEFINED, Interval(-x.upper, -x.lower)
+
+
+def _product(x: Interval, y: Interval) -> tuple:
+    products = [_multiply(a, b) for a in (x.lower, x.upper) for b in (y.lower, y.upper)]
+    return Domain.DEFINED, _widen(min(products), max(products))
+
+
+def _divide(x: Interval, y: Interval) -> tuple:
+    if y.lower == y.upper == 0.0:
+        return Domain.UNDEFINED, None
+    if 0.0 not in y:
+        quotients = [a / b for a in (x.lower, x.upper) for b in (y.lower, y.upper)]
+        return Domain.DEFINED, _widen(min(quotients), max(quotients))
+    if y.lower < 0.0 < y.upper:
+        return Domain.PARTIAL, Interval(-INF, INF)
+    reciprocal = Interval(1.0 / y.upper, INF) if y.lower == 0.0 else Interval(-INF, 1.0 / y.lower)
+    return Domain.PARTIAL, _product(x, reciprocal)[1]
+
+
+def _power(x: Interval, y: Interval) -> tuple:
+    if y.lower == y.upper and y.lower.is_integer():
+        return _integer_power(x, int(y.lower))
+
+    has_integers = not y.is_bounded or math.floor(y.upper) >= math.ceil(y.lower)
+    if x.upper < 0.0 and not has_integers:
+        return Domain.UNDEFINED, None
+    domain = Domain.DEFINED
+    if x.lower < 0.0 or (x.lower == 0.0 and y.lower <= 0.0):
+        domain = Domain.PARTIAL
+    if x.lower < 0.0 and has_integers:
+        # Отрицательное основание определено в целых степенях любого знака.
+        magnitude = max(-x.lower, x.upper)
+        corners = [_real_power(a, b) for a in (0.0, magnitude) for b in (y.lower, y.upper)]
+        bound = max(corners)
+        return domain, Interval(-bound, bound)
+    base = Interval(max(x.lower, 0.0), max(x.upper, 0.0))
+    corners = [_real_power(a, b) for a in (base.lower, base.upper) for b in (y.lower, y.upper)]
+    return domain, _widen(min(corners), max(corners))
+
+
+def _integer_power(x: Interval, n: int) -> tuple:
+    if n == 0:
+        return (Domain.PARTIAL if 0.0 in x else Domain.DEFINED), Interval(1.0)
+    if n < 0:
+        _, power = _integer_power(x, -n)
+        domain, reciprocal = _divide(Interval(1.0), power)
+        return domain, reciprocal
+
+    bounds = [_real_power(x.lower, n), _real_power(x.upper, n)]
+    if n % 2 == 0 and 0.0 in x:
+        bounds.append(0.0)
+    return Domain.DEFINED, _widen(min(bounds), max(bounds))
+
+
+def _sqrt(x: Interval) -> tuple:
+    if x.upper < 0.0:
+        return Domain.UNDEFINED, None
+    domain = Domain.PARTIAL if x.lower < 0.0 else Domain.DEFINED
+    return domain, _widen(math.sqrt(max(x.lower, 0.0)), math.sqrt(x.upper))
+
+
+def _ln(x: Interval) -> tuple:
+    if x.upper <= 0.0:
+        return Domain.UNDEFINED, None
+    if x.lower <= 0.0:
+        return Domain.PARTIAL, _widen(-INF, math.log(x.upper))
+    return Domain.DEFINED, _widen(math.log(x.lower), math.log(x.upper))
+
+
+def _exp(x: Interval) -> tuple:
+    return Domain.DEFINED, _widen(_real_power(math.e, x.lower), _real_power(math.e, x.upper))
+
+
+def _sin(x: Interval) -> tuple:
+    return Domain.DEFINED, _periodic(math.sin, x, math.pi / 2)
+
+
+def _cos(x: Interval) -> tuple:
+    return Domain.DEFINED, _periodic(math.cos, x, 0.0)
+
+
+def _periodic(function, x: Interval, peak: float) -> Interval:
+    if not x.is_bounded or x.upper - x.lower >= 2 * math.pi:
+        return Interval(-1.0, 1.0)
+    values = [function(x.lower), function(x.upper)]
+    if _crosses(x, peak, 2 * math.pi):
+        values.append(1.0)
+    if _crosses(x, peak + math.pi, 2 * math.pi):
+        values.append(-1.0)
+    interval = _widen(min(values), max(values))
+    return Interval(max(interval.lower, -1.0), min(interval.upper, 1.0))
+
+
+def _tg(x: Interval) -> tuple:
+    # Тангенс вычисляется во всех числах с плавающей точкой, но не ограничен у полюсов.
+    if not x.is_bounded or _crosses(x, math.pi / 2, math.pi):
+        return Domain.DEFINED, Interval(-INF, INF)
+    return Domain.DEFINED, _widen(math.tan(x.lower), math.tan(x.upper))
+
+
+def _crosses(x: Interval, point: float, period: float) -> bool:
+    # Есть ли на интервале точка point + period*k (с запасом на округление).
+    first = math.ceil((x.lower - point) / period - 1e-9)
+    return math.floor((x.upper - point) / period + 1e-9) >= first
+
+
+ENCLOSURES = {
+    "+": _add,
+    "-": _subtract,
+    "unary-": _negate,
+    "*": _product,
+    "/": _divide,
+    "^": _power,
+    "sqrt": _sqrt,
+    "exp": _exp,
+    "ln": _ln,
+    "sin": _sin,
+    "cos": _cos,
+    "tg": _tg,
+}
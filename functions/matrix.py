@@ -0,0 +1,175 @@
+"""Модуль, обеспечивающий построение матриц Якоби и Гессе\
+    для наборов функций"""
+
+import numpy as np
+
+from .autodiff import gradient_symbolic
+from .function import Function
+from .simplifier import Simplifier
+from .vectorized import VectorizedSystem
+
+
+class FunctionMatrix:
+    """
+    Класс матрицы функций с общими подвыражениями.
+    При вычислении каждая различная ячейка (например, симметричные\
+        элементы матрицы Гессе - один объект) вычисляется один раз,\
+        а общие подвыражения разных ячеек - один раз на весь набор точек.
+
+    Args:
+        entries (list): Строки матрицы из функций.
+        variables (tuple): Порядок переменных при позиционной передаче аргументов.
+    """
+
+    def __init__(self, entries: list, variables: tuple) -> None:
+        self._entries = [list(row) for row in entries]
+        self._variables = tuple(variables)
+        self._program = None
+        self._cells = None
+
+    @property
+    def entries(self) -> list:
+        """
+        Свойство, содержащее ячейки матрицы.
+
+        Returns:
+            list: Строки матрицы из функций.
+        """
+        return [list(row) for row in self._entries]
+
+    @property
+    def variables(self) -> tuple:
+        """
+        Свойство, содержащее порядок переменных матрицы.
+
+        Returns:
+            tuple: Имена переменных.
+        """
+        return self._variables
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Свойство, содержащее размеры матрицы.
+
+        Returns:
+            tuple: Количество строк и столбцов.
+        """
+        return len(self._entries), len(self._entries[0]) if self._entries else 0
+
+    def __getitem__(self, index: tuple) -> Function:
+        row, column = index
+        return self._entries[row][column]
+
+    def __str__(self) -> str:
+        return "\n".join(" ".join(str(entry) for entry in row) for row in self._entries)
+
+    def __call__(self, *args, **kwargs) -> np.ndarray:
+        """
+        Вычисляет матрицу над массивами значений переменных.
+
+        Args:
+            *args: Значения переменных в порядке `variables`.
+            **kwargs: Значения переменных по имени.
+
+        Returns:
+            np.ndarray: Матрицы формы (*точки, строки, столбцы),\
+                NaN в недопустимых точках.
+        """
+        return self.evaluate(*args, **kwargs)[0]
+
+    def evaluate(self, *args, **kwargs) -> tuple:
+        """
+        Вычисляет матрицу и маску ячеек, не определенных в точках.
+        Область определения ячеек совпадает с `Function.calculate`.
+
+        Args:
+            *args: Значения переменных в порядке `variables`.
+            **kwargs: Значения переменных по имени.
+
+        Raises:
+            ValueError: Возникает, когда значения переменных указаны неверно.
+
+        Returns:
+            tuple: Массив значений и булев массив ошибок формы (*точки, строки, столбцы).
+        """
+        if self._program is None:
+            unique = {}
+            for row in self._entries:
+                for entry in row:
+                    unique.setdefault(id(entry), (len(unique), entry))
+            cells = [[unique[id(entry)][0] for entry in row] for row in self._entries]
+            self._cells = np.array(cells, dtype=int).reshape(self.shape)
+            functions = [entry for _, entry in unique.values()]
+            self._program = VectorizedSystem(functions, self._variables)
+
+        values, mask = self._program.evaluate(*args, **kwargs)
+        return values[..., self._cells], mask[..., self._cells]
+
+
+def jacobian(functions, variables: tuple = None, simplify: bool = True) -> FunctionMatrix:
+    """
+    Функция, строящая матрицу Якоби набора функций.
+    Каждая строка строится одним обратным проходом (см. `Function.gradient_symbolic`),\
+        а упрощение общих подвыражений выполняется один раз для всей матрицы.
+
+    Args:
+        functions (Iterable[Function | str]): Функции (строки матрицы).
+        variables (tuple, optional): Переменные (столбцы матрицы).\
+            По дефолту все переменные функций в алфавитном порядке.
+        simplify (bool): Упрощать ли ячейки. По дефолту True.
+
+    Returns:
+        FunctionMatrix: Матрица частных производных.
+    """
+    functions = [_function(function) for function in functions]
+    if variables is None:
+        variables = tuple(sorted(set().union(*(function.variables() for function in functions))))
+    simplifier = Simplifier() if simplify else None
+    entries = []
+    for function in functions:
+        partials = gradient_symbolic(function.intern(), variables)
+        entries.append([_simplify(partials[variable], simplifier) for variable in variables])
+    return FunctionMatrix(entries, variables)
+
+
+def hessian(function, variables: tuple = None, simplify: bool = True) -> FunctionMatrix:
+    """
+    Функция, строящая матрицу Гессе функции.
+    Смешанные производные симметричны, поэтому строится только верхний\
+        треугольник, а нижний ссылается на те же ячейки.
+
+    Args:
+        function (Function | str): Функция.
+        variables (tuple, optional): Переменные дифференцирования.\
+            По дефолту все переменные функции.
+        simplify (bool): Упрощать ли ячейки. По дефолту True.
+
+    Returns:
+        FunctionMatrix: Матрица вторых частных производных.
+    """
+    function = _function(function).intern()
+    variables = tuple(function.variables() if variables is None else variables)
+    simplifier = Simplifier() if simplify else None
+    partials = gradient_symbolic(function, variables)
+    size = len(variables)
+    entries = [[None] * size for _ in range(size)]
+    for row, variable in enumerate(variables):
+        first = _simplify(partials[variable], simplifier).intern()
+        second = gradient_symbolic(first, variables[row:])
+        for column in range(row, size):
+            entry = _simplify(second[variables[column]], simplifier)
+            entries[row][column] = entries[column][row] = entry
+    return FunctionMatrix(entries, variables)
+
+
+def _function(function) -> Function:
+    if isinstance(function, str):
+        return Function(function)
+    return function
+
+
+def _simplify(function: Function, simplifier: Simplifier) -> Function:
+    if simplifier is None:
+        return function
+    return simplifier.simplify_defined(function)
@@ -78,6 +78,16 @@ class Operator:
         """
         return self._priority
 
+    @property
+    def function(self) -> callable:
+        """
+        Свойство, содержащее функцию оператора.
+
+        Returns:
+            callable: Функция, вычисляющая результат оператора.
+        """
+        return self._function
+
     def calculate(self, *args) -> float:
         """
         Метод, вычисляющий результат оператора с заданными аргументами.
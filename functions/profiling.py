@@ -0,0 +1,271 @@
+"""Модуль, обеспечивающий профилирование этапов разбора,\
+    дифференцирования и упрощения функций"""
+
+import threading
+import time
+from functools import wraps
+
+from .expr_parser import Parser
+from .function import Function
+
+# Этап -> (класс, атрибуты). Этап 'parse' - создание Function из выражения,\
+#     внутри упрощения через sympy он считается как 'reparse'.\
+#     Этап 'validate' включает и проверку без точки (`is_defined`),\
+#     через которую проверяют `__str__` и `simplify`.
+STAGES = {
+    "parse": (Function, "__init__"),
+    "tokenize": (Parser, "_tokenize"),
+    "rpn": (Parser, "rpn"),
+    "tree": (Parser, "parse"),
+    "diff": (Function, "_diff"),
+    "simplify": (Function, "simplify"),
+    "sympy": (Function, "_simplify_sympy"),
+    "validate": (Function, "validate_function", "is_defined"),
+    "calculate": (Function, "calculate"),
+}
+STAGE_NAMES = (*STAGES, "reparse")
+RULES = tuple(
+    name[len("_diff_") :]
+    for name in vars(Function)
+    if name.startswith("_diff_") and name != "_diff_node"
+)
+
+_ACTIVE = []
+_PATCHES = []
+_LOCK = threading.Lock()
+
+
+class _State(threading.local):
+    def __init__(self) -> None:
+        self.stages = []
+        self.frames = []
+
+
+_STATE = _State()
+
+
+class Profile:
+    """
+    Класс, собирающий количество вызовов и суммарное время этапов обработки\
+        функций, правил дифференцирования `_diff_*` и количество созданных узлов.
+    Пока профиль активен (внутри `with` или между `start` и `stop`),\
+        методы этапов заменены обертками; без активных профилей\
+        используются исходные методы, поэтому выключенное профилирование\
+        ничего не стоит.
+    Время этапа включает вложенные этапы (например, 'tree' включает 'tokenize'),\
+        повторные вызовы этапа внутри него же не учитываются.\
+        Время правила - собственное, без вложенных правил.
+
+    Args:
+        callback (callable, optional): Вызывается после каждого этапа и правила\
+            как `callback(kind, name, seconds)`, где kind - 'stage' или 'rule'.
+    """
+
+    def __init__(self, callback: callable = None) -> None:
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._rules = {}
+        self._nodes = 0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def active(self) -> bool:
+        """
+        Свойство, показывающее, собирает ли профиль данные.
+
+        Returns:
+            bool: Профиль активен.
+        """
+        return self in _ACTIVE
+
+    def start(self):
+        """
+        Метод, включающий сбор данных.
+
+        Returns:
+            Profile: Этот же профиль.
+        """
+        with _LOCK:
+            if self not in _ACTIVE:
+                _ACTIVE.append(self)
+                if len(_ACTIVE) == 1:
+                    _install()
+        return self
+
+    def stop(self) -> None:
+        """
+        Метод, выключающий сбор данных. Собранные данные сохраняются.
+        """
+        with _LOCK:
+            if self in _ACTIVE:
+                _ACTIVE.remove(self)
+                if not _ACTIVE:
+                    _uninstall()
+
+    def reset(self) -> None:
+        """
+        Метод, очищающий собранные данные.
+        """
+        with self._lock:
+            self._stages.clear()
+            self._rules.clear()
+            self._nodes = 0
+
+    def as_dict(self) -> dict:
+        """
+        Метод, возвращающий собранные данные.
+
+        Returns:
+            dict: 'stages' и 'rules' (имя -> {'count', 'seconds'})\
+                и 'nodes' - количество созданных узлов Function.
+        """
+        with self._lock:
+            return {
+                "stages": _totals(STAGE_NAMES, self._stages),
+                "rules": _totals(RULES, self._rules),
+                "nodes": self._nodes,
+            }
+
+    def to_prometheus(self, prefix: str = "functions") -> str:
+        """
+        Метод, возвращающий собранные данные в текстовом формате Prometheus.
+
+        Args:
+            prefix (str): Префикс имен метрик. По дефолту 'functions'.
+
+        Returns:
+            str: Метрики-счетчики вызовов и секунд по этапам и правилам\
+                и счетчик созданных узлов.
+        """
+        data = self.as_dict()
+        lines = []
+        for group, label, title in (
+            ("stages", "stage", "pipeline stage"),
+            ("rules", "rule", "differentiation rule"),
+        ):
+            metric = f"{prefix}_{'stage' if group == 'stages' else 'diff_rule'}"
+            for field, unit, help_text in (
+                ("count", "calls", "Number of calls"),
+                ("seconds", "seconds", "Cumulative time in seconds"),
+            ):
+                name = f"{metric}_{unit}_total"
+                lines.append(f"# HELP {name} {help_text} per {title}.")
+                lines.append(f"# TYPE {name} counter")
+                for key, totals in data[group].items():
+                    lines.append(f'{name}{{{label}="{key}"}} {totals[field]!r}')
+        name = f"{prefix}_nodes_allocated_total"
+        lines.append(f"# HELP {name} Number of allocated Function nodes.")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {data['nodes']}")
+        return "\n".join(lines) + "\n"
+
+    def _add(self, kind: str, name: str, seconds: float) -> None:
+        with self._lock:
+            totals = self._stages if kind == "stage" else self._rules
+            count, total = totals.get(name, (0, 0.0))
+            totals[name] = (count + 1, total + seconds)
+        if self._callback is not None:
+            self._callback(kind, name, seconds)
+
+    def _add_node(self) -> None:
+        with self._lock:
+            self._nodes += 1
+
+
+def _totals(names: tuple, totals: dict) -> dict:
+    result = {}
+    for name in names:
+        count, seconds = totals.get(name, (0, 0.0))
+        result[name] = {"count": count, "seconds": seconds}
+    return result
+
+
+def _record(kind: str, name: str, seconds: float) -> None:
+    for profile in list(_ACTIVE):
+        profile._add(kind, name, seconds)  # pylint: disable=protected-access
+
+
+def _stage(name: str, method: callable) -> callable:
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        stack = _STATE.stages
+        if name in stack:
+            return method(*args, **kwargs)
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            _record("stage", name, elapsed)
+
+    return wrapper
+
+
+def _init(method: callable) -> callable:
+    parse = _stage("parse", method)
+    reparse = _stage("reparse", method)
+
+    @wraps(method)
+    def wrapper(self, expression: str = None) -> None:
+        for profile in list(_ACTIVE):
+            profile._add_node()  # pylint: disable=protected-access
+        if not expression:
+            method(self, expression)
+        elif "sympy" in _STATE.stages:
+            reparse(self, expression)
+        else:
+            parse(self, expression)
+
+    return wrapper
+
+
+def _rule(name: str, method: callable) -> callable:
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        frames = _STATE.frames
+        frames.append(0.0)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = frames.pop()
+            if frames:
+                frames[-1] += elapsed
+            _record("rule", name, elapsed - nested)
+
+    return wrapper
+
+
+def _install() -> None:
+    patches = []
+    for name, (owner, *attributes) in STAGES.items():
+        for attribute in attributes:
+            original = owner.__dict__[attribute]
+            if attribute == "__init__":
+                wrapper = _init(original)
+            elif isinstance(original, property):
+                wrapper = property(_stage(name, original.fget), doc=original.__doc__)
+            else:
+                wrapper = _stage(name, original)
+            patches.append((owner, attribute, original, wrapper))
+    for rule in RULES:
+        original = Function.__dict__[f"_diff_{rule}"]
+        patches.append((Function, f"_diff_{rule}", original, _rule(rule, original)))
+    for owner, attribute, _, wrapper in patches:
+        setattr(owner, attribute, wrapper)
+    _PATCHES[:] = patches
+
+
+def _uninstall() -> None:
+    for owner, attribute, original, _ in reversed(_PATCHES):
+        setattr(owner, attribute, original)
+    _PATCHES.clear()
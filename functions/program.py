@@ -0,0 +1,181 @@
+"""Модуль, обеспечивающий вычисление функций\
+    плоской программой для стековой машины"""
+
+import math
+
+from .operators import CONSTANTS, OPERATORS, OperatorType
+
+LOAD_VAR = 0
+LOAD_CONST = 1
+LOAD_TEMP = 2
+STORE_TEMP = 3
+CALL_UNARY = 4
+CALL_BINARY = 5
+
+
+def _divide(x, y):
+    if y == 0.0:
+        raise ZeroDivisionError
+    return x / y
+
+
+def _power(x, y):
+    if x == 0.0 and y <= 0:
+        raise ZeroDivisionError
+    value = x**y
+    if isinstance(value, complex):
+        raise ValueError("Аргумент находится за пределами области функции")
+    return value
+
+
+def _sqrt(x):
+    if x < 0.0:
+        raise ValueError("Аргумент находится за пределами области функции")
+    return math.sqrt(x)
+
+
+def _ln(x):
+    if x <= 0.0:
+        raise ValueError("Аргумент находится за пределами области функции")
+    return math.log(x)
+
+
+CHECKED_FUNCTIONS = {"/": _divide, "^": _power, "sqrt": _sqrt, "ln": _ln}
+
+
+class Program:
+    """
+    Класс программы в обратной польской записи с уже найденными\
+        функциями операторов, константами и номерами переменных.
+    Общие подвыражения вычисляются один раз и сохраняются во временных ячейках.
+    Проверки области определения совпадают с `Function.calculate`.
+
+    Args:
+        function (Function): Компилируемая функция.
+        variables (tuple): Порядок переменных при вызове.
+    """
+
+    def __init__(self, function, variables: tuple) -> None:
+        if function.value is None:
+            raise ValueError("Функция не определена")
+        self._variables = tuple(variables)
+        missing = set(function.variables()).difference(self._variables)
+        if missing:
+            raise ValueError(f"Не указаны переменные: {', '.join(sorted(missing))}")
+        self._code, self._temps = _lower(function, self._variables)
+
+    @property
+    def variables(self) -> tuple:
+        """
+        Свойство, содержащее порядок переменных программы.
+
+        Returns:
+            tuple: Имена переменных.
+        """
+        return self._variables
+
+    @property
+    def code(self) -> list:
+        """
+        Свойство, содержащее инструкции программы.
+
+        Returns:
+            list: Пары (код операции, аргумент).
+        """
+        return list(self._code)
+
+    def __call__(self, *values) -> float:
+        """
+        Вычисляет функцию в точке.
+
+        Args:
+            *values: Значения переменных в порядке `variables`.
+
+        Raises:
+            ZeroDivisionError: Возникает при делении на ноль
+            ValueError: Возникает, когда функция получает\
+                аргумент выходящий за пределы его области\
+                или когда количество значений неверно.
+
+        Returns:
+            float: Значение функции.
+        """
+        if len(values) != len(self._variables):
+            raise ValueError("Неверное количество значений переменных")
+        stack = []
+        push = stack.append
+        temps = [None] * self._temps
+        for opcode, argument in self._code:
+            if opcode == CALL_BINARY:
+                right = stack.pop()
+                stack[-1] = argument(stack[-1], right)
+            elif opcode == CALL_UNARY:
+                stack[-1] = argument(stack[-1])
+            elif opcode == LOAD_VAR:
+                push(values[argument])
+            elif opcode == LOAD_CONST:
+                push(argument)
+            elif opcode == LOAD_TEMP:
+                push(temps[argument])
+            else:
+                temps[argument] = stack[-1]
+        return stack[-1]
+
+
+def _lower(root, variables: tuple) -> tuple:
+    slots = {variable: index for index, variable in enumerate(variables)}
+    references = count_references(root)
+    temps = {}
+    code = []
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in temps:
+            code.append((LOAD_TEMP, temps[id(node)]))
+            continue
+
+        value = node.value
+        if value in slots:
+            code.append((LOAD_VAR, slots[value]))
+        elif value not in OPERATORS:
+            code.append((LOAD_CONST, CONSTANTS.get(value, value)))
+        elif not expanded:
+            stack.append((node, True))
+            if OPERATORS[value].operator_type == OperatorType.BINARY:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+        else:
+            function = CHECKED_FUNCTIONS.get(value, OPERATORS[value].function)
+            if OPERATORS[value].operator_type == OperatorType.BINARY:
+                code.append((CALL_BINARY, function))
+            else:
+                code.append((CALL_UNARY, function))
+            if references[id(node)] > 1:
+                temps[id(node)] = len(temps)
+                code.append((STORE_TEMP, temps[id(node)]))
+    return code, len(temps)
+
+
+def count_references(root) -> dict:
+    """
+    Считает, сколько раз каждый узел графа функции используется как операнд.
+
+    Args:
+        root (Function): Корень функции.
+
+    Returns:
+        dict: Количество ссылок по `id` узла (у корня - одна).
+    """
+    references = {id(root): 1}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for child in (node.left, node.right):
+            if child is None:
+                continue
+            if id(child) in references:
+                references[id(child)] += 1
+            else:
+                references[id(child)] = 1
+                stack.append(child)
+    return references
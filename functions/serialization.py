@@ -0,0 +1,188 @@
+"""Модуль, обеспечивающий компактное двоичное представление функций"""
+
+import struct
+
+from .function import Function
+from .operators import OPERATORS, OperatorType
+from .program import count_references
+
+MAGIC = b"FNB1"
+HEADER = struct.Struct("<4sIII")
+NUMBER = struct.Struct("<d")
+
+OPCODES = {name: code for code, name in enumerate(OPERATORS)}
+LOAD_NAME = 0xF0
+LOAD_CONST = 0xF1
+LOAD_TEMP = 0xF2
+STORE_TEMP = 0xF3
+
+
+def to_bytes(function) -> bytes:
+    """
+    Функция, записывающая функцию в двоичном виде.
+    Формат: заголовок, таблица имен, таблица чисел (float64)\
+        и код в обратной польской записи с номерами в формате varint,\
+        где общие подвыражения записываются один раз\
+        и затем загружаются из временных ячеек.
+
+    Args:
+        function (Function): Функция.
+
+    Returns:
+        bytes: Двоичное представление.
+    """
+    names, numbers, code = {}, {}, bytearray()
+    if function.value is not None:
+        _encode(function, names, numbers, code)
+    pool = bytearray()
+    for name in names:
+        encoded = name.encode("utf-8")
+        pool.append(len(encoded))
+        pool += encoded
+    pool += bytes(-(HEADER.size + len(pool)) % NUMBER.size)
+    return b"".join(
+        (
+            HEADER.pack(MAGIC, len(names), len(numbers), len(code)),
+            pool,
+            b"".join(numbers),
+            code,
+        )
+    )
+
+
+def from_bytes(data) -> Function:
+    """
+    Функция, восстанавливающая функцию из двоичного вида без разбора выражения.
+    Данные читаются через `memoryview`, поэтому подходят `bytes`, `bytearray`\
+        и `mmap` без копирования. Узлы восстанавливаются общими (см. `Function.node`).
+
+    Args:
+        data (bytes | bytearray | memoryview | mmap): Двоичное представление.
+
+    Raises:
+        ValueError: Возникает, когда данные повреждены.
+
+    Returns:
+        Function: Восстановленная функция.
+    """
+    view = memoryview(data).cast("B")
+    numbers = code = None
+    try:
+        magic, name_count, number_count, code_length = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Неверный формат двоичного представления функции")
+        offset = HEADER.size
+        names = []
+        for _ in range(name_count):
+            length = view[offset]
+            names.append(str(view[offset + 1 : offset + 1 + length], "utf-8"))
+            offset += 1 + length
+        offset += -offset % NUMBER.size
+        numbers = view[offset : offset + number_count * NUMBER.size].cast("d")
+        offset += number_count * NUMBER.size
+        if offset + code_length != len(view):
+            raise ValueError("Неверная длина двоичного представления функции")
+        code = view[offset:]
+        root = _decode(code, names, numbers)
+    except (struct.error, IndexError, TypeError) as error:
+        raise ValueError("Двоичное представление функции повреждено") from error
+    finally:
+        # Представления освобождаются, чтобы источник (например, mmap) можно было закрыть.
+        for buffer in (code, numbers, view):
+            if buffer is not None:
+                buffer.release()
+
+    result = Function()
+    if root is not None:
+        # pylint: disable=protected-access
+        result._value, result._left, result._right = root.value, root.left, root.right
+    return result
+
+
+def _encode(root, names: dict, numbers: dict, code: bytearray) -> None:
+    references = count_references(root)
+    temps = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in temps:
+            code.append(LOAD_TEMP)
+            _write_index(code, temps[id(node)])
+            continue
+
+        value = node.value
+        if value not in OPERATORS:
+            if isinstance(value, str):
+                code.append(LOAD_NAME)
+                _write_index(code, names.setdefault(value, len(names)))
+            else:
+                number = NUMBER.pack(value)
+                code.append(LOAD_CONST)
+                _write_index(code, numbers.setdefault(number, len(numbers)))
+        elif not expanded:
+            stack.append((node, True))
+            if OPERATORS[value].operator_type == OperatorType.BINARY:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+            continue
+        else:
+            code.append(OPCODES[value])
+        if references[id(node)] > 1:
+            temps[id(node)] = len(temps)
+            code.append(STORE_TEMP)
+
+
+def _decode(code: memoryview, names: list, numbers: memoryview):
+    operators = list(OPERATORS)
+    binary = [
+        OPERATORS[name].operator_type == OperatorType.BINARY for name in operators
+    ]
+    stack = []
+    temps = []
+    position = 0
+    while position < len(code):
+        opcode = code[position]
+        position += 1
+        if opcode < len(operators):
+            if binary[opcode]:
+                right = stack.pop()
+                stack[-1] = Function.node(operators[opcode], stack[-1], right)
+            else:
+                stack[-1] = Function.node(operators[opcode], stack[-1])
+            continue
+        if opcode == STORE_TEMP:
+            temps.append(stack[-1])
+            continue
+        argument = code[position]
+        position += 1
+        if argument & 0x80:
+            argument, position = _read_index(code, position, argument)
+        if opcode == LOAD_NAME:
+            stack.append(Function.node(names[argument]))
+        elif opcode == LOAD_CONST:
+            stack.append(Function.node(numbers[argument]))
+        elif opcode == LOAD_TEMP:
+            stack.append(temps[argument])
+        else:
+            raise ValueError(f"Неизвестный код операции: {opcode}")
+    if len(stack) > 1:
+        raise ValueError("Двоичное представление функции повреждено")
+    return stack[0] if stack else None
+
+
+def _write_index(code: bytearray, index: int) -> None:
+    while index >= 0x80:
+        code.append(index & 0x7F | 0x80)
+        index >>= 7
+    code.append(index)
+
+
+def _read_index(code: memoryview, position: int, first: int) -> tuple:
+    result, shift = first & 0x7F, 7
+    while True:
+        byte = code[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, position
+        shift += 7
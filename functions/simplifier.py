@@ -0,0 +1,528 @@
+"""Модуль, обеспечивающий алгебраическое упрощение функций\
+    без обращения к символьным библиотекам"""
+
+import math
+from fractions import Fraction
+
+from .function import Function
+from .operators import OPERATORS, OperatorType
+
+MAX_DENOMINATOR = 10**6
+MAX_POWER = 1024
+
+EXACT_VALUES = {
+    ("exp", 0): 1,
+    ("ln", 1): 0,
+    ("sin", 0): 0,
+    ("cos", 0): 1,
+    ("tg", 0): 0,
+}
+
+
+class _Product:
+    """
+    Одночлен: числовой коэффициент и множители `основание^степень`.
+    Множители хранятся в словаре по структурному ключу основания.
+    """
+
+    __slots__ = ("coef", "factors")
+
+    def __init__(self, coef, factors: dict) -> None:
+        self.coef = coef
+        self.factors = factors
+
+    def key(self) -> frozenset:
+        return frozenset((key, exponent.key()) for key, (_, exponent) in self.factors.items())
+
+    def scaled(self, coef):
+        return _Product(self.coef * coef, self.factors)
+
+
+class _Sum:
+    """
+    Многочлен: свободный член и одночлены, сгруппированные по ключу множителей.
+    """
+
+    __slots__ = ("constant", "terms")
+
+    def __init__(self, constant=0, terms: dict = None) -> None:
+        self.constant = constant
+        self.terms = terms or {}
+
+    @property
+    def is_constant(self) -> bool:
+        return not self.terms
+
+    @property
+    def is_integer(self) -> bool:
+        return self.is_constant and _is_integer(self.constant)
+
+    def key(self) -> tuple:
+        return (self.constant, frozenset((key, term.coef) for key, term in self.terms.items()))
+
+    def add(self, other, sign: int = 1):
+        terms = dict(self.terms)
+        for key, term in other.terms.items():
+            coef = sign * term.coef
+            if key in terms:
+                coef += terms[key].coef
+            if coef == 0:
+                terms.pop(key, None)
+            else:
+                terms[key] = _Product(coef, term.factors)
+        return _Sum(self.constant + sign * other.constant, terms)
+
+    def scale(self, coef):
+        if coef == 0:
+            return _Sum()
+        terms = {key: term.scaled(coef) for key, term in self.terms.items()}
+        return _Sum(self.constant * coef, terms)
+
+
+ONE = _Sum(1)
+
+
+class Simplifier:
+    """
+    Класс, упрощающий дерево функции правилами переписывания:\
+        свертка констант, удаление нейтральных элементов, приведение подобных,\
+        `e^ln(x) = x`, `sin^2 + cos^2 = 1`.
+    Порядок слагаемых и множителей канонический, поэтому\
+        равные выражения получают одинаковую запись.
+    """
+
+    def __init__(self) -> None:
+        self._sums = {}
+        self._rendered = {}
+        self._keys = {}
+        self._texts = {}
+
+    def simplify(self, function: Function) -> Function:
+        """
+        Метод, упрощающий функцию.
+
+        Args:
+            function (Function): Упрощаемая функция.
+
+        Raises:
+            ZeroDivisionError: Возникает, когда упрощение приводит к делению на ноль.
+            ValueError: Возникает, когда константа выходит за пределы области функции.
+
+        Returns:
+            Function: Новая упрощенная функция. Если точные коэффициенты\
+                не удается свернуть в конечные числа, упрощенное выражение\
+                совпадает с исходным.
+        """
+        if function.value is None:
+            return Function()
+        try:
+            return self._render(self._sum(function))
+        except OverflowError:
+            result = Function()
+            # pylint: disable=protected-access
+            result._value, result._left, result._right = (
+                function.value,
+                function.left,
+                function.right,
+            )
+            return result
+
+    def simplify_defined(self, function: Function) -> Function:
+        """
+        Метод, упрощающий функцию как `Function.simplify`: неопределенная\
+            функция возвращается без изменений, а ошибка области определения\
+            при упрощении дает неопределенную функцию.
+
+        Args:
+            function (Function): Упрощаемая функция.
+
+        Returns:
+            Function: Упрощенная функция.
+        """
+        if not function.is_defined():
+            return function
+        try:
+            return self.simplify(function)
+        except (ZeroDivisionError, ValueError):
+            return Function()
+
+    def _sum(self, node: Function) -> _Sum:
+        cached = self._sums.get(id(node))
+        if cached is not None:
+            return cached[1]
+        # Операнды переводятся раньше операторов, и `_convert` находит их в кэше.
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in self._sums:
+                continue
+            if not expanded and current.value in OPERATORS:
+                stack.append((current, True))
+                if current.right is not None:
+                    stack.append((current.right, False))
+                stack.append((current.left, False))
+                continue
+            self._sums[id(current)] = (current, self._convert(current))
+        return self._sums[id(node)][1]
+
+    def _convert(self, node: Function) -> _Sum:
+        value = node.value
+        if value not in OPERATORS:
+            if isinstance(value, str):
+                return self._atom(Function.node(value))
+            return _Sum(_number(value))
+
+        match value:
+            case "+":
+                return self._pythagoras(self._sum(node.left).add(self._sum(node.right)))
+            case "-":
+                return self._pythagoras(self._sum(node.left).add(self._sum(node.right), -1))
+            case "unary-":
+                return self._sum(node.left).scale(-1)
+            case "*":
+                left = self._product(self._sum(node.left))
+                right = self._product(self._sum(node.right))
+                return self._to_sum(self._multiply(left, right))
+            case "/":
+                left = self._product(self._sum(node.left))
+                right = self._product(self._sum(node.right))
+                return self._to_sum(self._multiply(left, _inverse(right)))
+            case "^":
+                return self._power(self._sum(node.left), self._sum(node.right))
+        return self._apply(value, self._sum(node.left))
+
+    def _atom(self, node: Function) -> _Sum:
+        product = _Product(1, {self._key(node): (node, ONE)})
+        return _Sum(0, {product.key(): product})
+
+    def _product(self, polynomial: _Sum) -> _Product:
+        if polynomial.is_constant:
+            return _Product(polynomial.constant, {})
+        if polynomial.constant == 0 and len(polynomial.terms) == 1:
+            return next(iter(polynomial.terms.values()))
+        node = self._render(polynomial)
+        return _Product(1, {self._key(node): (node, ONE)})
+
+    def _to_sum(self, product: _Product) -> _Sum:
+        if product.coef == 0:
+            return _Sum()
+        if not product.factors:
+            return _Sum(product.coef)
+        if len(product.factors) == 1:
+            base, exponent = next(iter(product.factors.values()))
+            if id(base) in self._rendered and exponent.key() == ONE.key():
+                return self._rendered[id(base)][1].scale(product.coef)
+        return _Sum(0, {product.key(): product})
+
+    def _multiply(self, left: _Product, right: _Product) -> _Product:
+        coef = left.coef * right.coef
+        if coef == 0:
+            return _Product(0, {})
+        factors = dict(left.factors)
+        for key, (base, exponent) in right.factors.items():
+            if key in factors:
+                exponent = factors[key][1].add(exponent)
+                if exponent.is_constant and exponent.constant == 0:
+                    del factors[key]
+                    continue
+            factors[key] = (base, exponent)
+
+        for key, (base, exponent) in list(factors.items()):
+            if base.value not in OPERATORS and not isinstance(base.value, str):
+                power = _fold_power(_number(base.value), exponent)
+                if power is not None:
+                    coef *= power
+                    del factors[key]
+        return _Product(coef, factors)
+
+    def _power(self, base: _Sum, exponent: _Sum) -> _Sum:
+        if base.is_constant:
+            if base.constant == 0:
+                if not exponent.is_constant:
+                    return self._factor(base, exponent)
+                if exponent.constant <= 0:
+                    raise ZeroDivisionError
+                return _Sum()
+            if base.constant == 1:
+                return _Sum(1)
+            power = _fold_power(base.constant, exponent)
+            if power is not None:
+                return _Sum(power)
+            if exponent.is_constant and base.constant < 0:
+                raise ValueError("Аргумент находится за пределами области функции")
+            return self._factor(base, exponent)
+
+        if exponent.is_constant and exponent.constant == 0:
+            return _Sum(1)
+        if exponent.is_constant and exponent.constant == 1:
+            return base
+
+        logarithm = self._single_factor(exponent, "ln")
+        if logarithm is not None and self._is_e(base):
+            argument, coef = logarithm
+            return self._power(self._sum(argument.left), _Sum(coef))
+
+        if exponent.is_integer and abs(exponent.constant) <= MAX_POWER:
+            product = _single_term(base)
+            if product is not None:
+                power = int(exponent.constant)
+                if product.coef == 0 and power < 0:
+                    raise ZeroDivisionError
+                factors = {
+                    key: (node, value.scale(power))
+                    for key, (node, value) in product.factors.items()
+                }
+                return self._to_sum(_Product(product.coef**power, factors))
+        return self._factor(base, exponent)
+
+    def _factor(self, base: _Sum, exponent: _Sum) -> _Sum:
+        node = self._render(base)
+        product = _Product(1, {self._key(node): (node, exponent)})
+        return _Sum(0, {product.key(): product})
+
+    def _apply(self, name: str, argument: _Sum) -> _Sum:
+        if argument.is_constant:
+            value = argument.constant
+            if name == "sqrt" and value < 0 or name == "ln" and value <= 0:
+                raise ValueError("Аргумент находится за пределами области функции")
+            if (name, value) in EXACT_VALUES:
+                return _Sum(EXACT_VALUES[(name, value)])
+            if name == "sqrt" and isinstance(value, Fraction):
+                root = _exact_sqrt(value)
+                if root is not None:
+                    return _Sum(root)
+
+        if name == "ln":
+            if self._is_e(argument):
+                return _Sum(1)
+            term = _single_term(argument)
+            if term is not None and term.coef == 1 and len(term.factors) == 1:
+                node, exponent = next(iter(term.factors.values()))
+                if node.value == "e":
+                    return exponent
+                if node.value == "exp" and exponent.key() == ONE.key():
+                    return self._sum(node.left)
+        if name == "exp":
+            logarithm = self._single_factor(argument, "ln")
+            if logarithm is not None:
+                node, coef = logarithm
+                return self._power(self._sum(node.left), _Sum(coef))
+
+        return self._atom(Function.node(name, self._render(argument)))
+
+    def _single_factor(self, polynomial: _Sum, value: str):
+        term = _single_term(polynomial)
+        if term is None or len(term.factors) != 1:
+            return None
+        node, exponent = next(iter(term.factors.values()))
+        if node.value != value or exponent.key() != ONE.key():
+            return None
+        return node, term.coef
+
+    def _is_e(self, polynomial: _Sum) -> bool:
+        # Только e без коэффициента: ln(2*e) = ln(2) + 1, а не 1.
+        factor = self._single_factor(polynomial, "e")
+        return factor is not None and factor[1] == 1
+
+    def _pythagoras(self, polynomial: _Sum) -> _Sum:
+        terms = polynomial.terms
+        for key, term in list(terms.items()):
+            if key not in terms:
+                continue
+            for factor_key, (node, exponent) in term.factors.items():
+                if node.value != "sin" or not exponent.is_constant or exponent.constant != 2:
+                    continue
+                cos_key = ("cos",) + factor_key[1:]
+                partner_key = key - {(factor_key, exponent.key())} | {(cos_key, exponent.key())}
+                partner = terms.get(partner_key)
+                if partner is None or partner.coef != term.coef:
+                    continue
+                rest = {k: v for k, v in term.factors.items() if k != factor_key}
+                terms = dict(terms)
+                del terms[key], terms[partner_key]
+                polynomial = _Sum(polynomial.constant, terms)
+                return self._pythagoras(polynomial.add(self._to_sum(_Product(term.coef, rest))))
+        return polynomial
+
+    def _render(self, polynomial: _Sum) -> Function:
+        node = None
+        terms = sorted(polynomial.terms.values(), key=self._term_order)
+        for term in terms:
+            if node is None:
+                node = self._render_product(term)
+            elif term.coef < 0:
+                node = Function.node("-", node, self._render_product(term.scaled(-1)))
+            else:
+                node = Function.node("+", node, self._render_product(term))
+
+        constant = polynomial.constant
+        if node is None:
+            return Function.node(_float(constant))
+        if constant < 0:
+            node = Function.node("-", node, Function.node(_float(-constant)))
+        elif constant > 0:
+            node = Function.node("+", node, Function.node(_float(constant)))
+
+        if len(terms) > 1 or constant != 0:
+            self._rendered[id(node)] = (node, polynomial)
+        return node
+
+    def _render_product(self, product: _Product) -> Function:
+        numerator = []
+        denominator = []
+        for node, exponent in sorted(product.factors.values(), key=lambda f: self._order(f[0])):
+            if exponent.is_constant and exponent.constant < 0:
+                denominator.append(self._power_node(node, exponent.scale(-1)))
+            else:
+                numerator.append(self._power_node(node, exponent))
+
+        negative = product.coef < 0
+        top, bottom = _split(-product.coef if negative else product.coef)
+        if not numerator:
+            numerator.append(Function.node(float(-top if negative else top)))
+        else:
+            if top != 1:
+                numerator.insert(0, Function.node(float(top)))
+            if negative:
+                numerator[0] = Function.node("unary-", numerator[0])
+        if bottom != 1:
+            denominator.insert(0, Function.node(float(bottom)))
+
+        result = _fold("*", numerator)
+        if denominator:
+            result = Function.node("/", result, _fold("*", denominator))
+        return result
+
+    def _power_node(self, node: Function, exponent: _Sum) -> Function:
+        if exponent.key() == ONE.key():
+            return node
+        return Function.node("^", node, self._render(exponent))
+
+    def _term_order(self, term: _Product) -> tuple:
+        degree = 0
+        orders = []
+        for node, exponent in term.factors.values():
+            order = self._order(node)
+            if order[0] == 1 and exponent.is_constant:
+                degree += exponent.constant
+            orders.append(order)
+        return (-degree, sorted(orders))
+
+    def _order(self, node: Function) -> tuple:
+        value = node.value
+        if value not in OPERATORS:
+            if isinstance(value, str):
+                return (1, value, "")
+            return (0, "", self._text(node))
+        if OPERATORS[value].operator_type == OperatorType.PREFIX and value != "unary-":
+            return (2, value, self._text(node))
+        return (3, "", self._text(node))
+
+    def _key(self, node: Function) -> tuple:
+        cached = self._keys.get(id(node))
+        if cached is not None:
+            return cached[1]
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in self._keys:
+                continue
+            value = current.value
+            if value not in OPERATORS:
+                key = (value,) if isinstance(value, str) else ("#", value)
+            elif not expanded:
+                stack.append((current, True))
+                if current.right is not None:
+                    stack.append((current.right, False))
+                stack.append((current.left, False))
+                continue
+            elif OPERATORS[value].operator_type == OperatorType.BINARY:
+                key = (value, self._keys[id(current.left)][1], self._keys[id(current.right)][1])
+            else:
+                key = (value, self._keys[id(current.left)][1])
+            self._keys[id(current)] = (current, key)
+        return self._keys[id(node)][1]
+
+    def _text(self, node: Function) -> str:
+        cached = self._texts.get(id(node))
+        if cached is not None:
+            return cached[1]
+        text = node.to_string()
+        self._texts[id(node)] = (node, text)
+        return text
+
+
+def _number(value: float):
+    if isinstance(value, Fraction):
+        return value
+    if not math.isfinite(value):
+        return value
+    fraction = Fraction(value).limit_denominator(MAX_DENOMINATOR)
+    return fraction if float(fraction) == value else value
+
+
+def _is_integer(value) -> bool:
+    if isinstance(value, Fraction):
+        return value.denominator == 1
+    return float(value).is_integer()
+
+
+def _fold_power(base, exponent: _Sum):
+    if not exponent.is_integer or abs(exponent.constant) > MAX_POWER:
+        return None
+    if base == 0 and exponent.constant <= 0:
+        raise ZeroDivisionError
+    try:
+        power = base ** int(exponent.constant)
+        float(power)
+    except OverflowError:
+        return None
+    return power
+
+
+def _exact_sqrt(value: Fraction):
+    numerator = math.isqrt(value.numerator)
+    denominator = math.isqrt(value.denominator)
+    if numerator**2 == value.numerator and denominator**2 == value.denominator:
+        return Fraction(numerator, denominator)
+    return None
+
+
+def _inverse(product: _Product) -> _Product:
+    if product.coef == 0:
+        raise ZeroDivisionError
+    coef = 1 / product.coef if isinstance(product.coef, float) else Fraction(1, product.coef)
+    factors = {
+        key: (node, exponent.scale(-1)) for key, (node, exponent) in product.factors.items()
+    }
+    return _Product(coef, factors)
+
+
+def _single_term(polynomial: _Sum):
+    if polynomial.constant != 0 or len(polynomial.terms) != 1:
+        return None
+    return next(iter(polynomial.terms.values()))
+
+
+def _split(coef) -> tuple:
+    if isinstance(coef, Fraction):
+        top, bottom = _float(coef.numerator), _float(coef.denominator)
+        if math.isfinite(top) and math.isfinite(bottom):
+            return top, bottom
+        return _float(coef), 1
+    return coef, 1
+
+
+def _float(value) -> float:
+    # Точные коэффициенты могут не помещаться во float: как и при вычислении, это inf.
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+def _fold(operator: str, nodes: list) -> Function:
+    result = nodes[0]
+    for node in nodes[1:]:
+        result = Function.node(operator, result, node)
+    return result
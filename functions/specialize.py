@@ -0,0 +1,145 @@
+"""Модуль, обеспечивающий частичное вычисление функций\
+    при известных значениях части переменных"""
+
+from .function import Function
+from .operators import CONSTANTS, OPERATORS, OperatorType
+from .program import CHECKED_FUNCTIONS
+
+NUMBERS = (int, float)
+PARTIAL = ("/", "^", "sqrt", "ln", "exp")
+BINARY = frozenset(
+    name for name, operator in OPERATORS.items() if operator.operator_type == OperatorType.BINARY
+)
+
+
+def specialize(function, values: dict) -> Function:
+    """
+    Функция, подставляющая значения переменных и сворачивающая константы.
+    Числовые подвыражения (включая константы из `CONSTANTS`) вычисляются,\
+        а тождества вида `x+0`, `x*1`, `x^1`, `--x` убираются.
+    Область определения результата совпадает с `Function.calculate`:\
+        `0*x` и `x-x` сворачиваются в ноль, только когда в `x` нет операций\
+        с ограниченной областью (деления, степени, корня, логарифма, экспоненты).
+
+    Args:
+        function (Function): Функция.
+        values (dict): Значения известных переменных.
+
+    Raises:
+        ZeroDivisionError: Возникает при делении на ноль в числовом подвыражении.
+        ValueError: Возникает, когда числовое подвыражение\
+            выходит за пределы области функции.
+
+    Returns:
+        Function: Функция от оставшихся переменных с общими подвыражениями.
+    """
+    result = Function()
+    if function.value is None:
+        return result
+    root = _Specializer(values).run(function)
+    # pylint: disable=protected-access
+    result._value, result._left, result._right = root.value, root.left, root.right
+    return result
+
+
+class _Specializer:
+    def __init__(self, values: dict) -> None:
+        self._values = values
+        # Узлы хранятся вместе с признаком, чтобы их id не переиспользовались.
+        self._partial = {}
+
+    def run(self, function: Function) -> Function:
+        results = {}
+        stack = [(function, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in results:
+                continue
+            value = node.value
+            if value not in OPERATORS:
+                results[id(node)] = self._leaf(value)
+                continue
+            binary = value in BINARY
+            if not expanded:
+                stack.append((node, True))
+                if binary:
+                    stack.append((node.right, False))
+                stack.append((node.left, False))
+                continue
+            right = results[id(node.right)] if binary else None
+            results[id(node)] = self._fold(value, results[id(node.left)], right)
+        return results[id(function)]
+
+    def _leaf(self, value) -> Function:
+        if value in self._values:
+            return Function.node(self._values[value])
+        return Function.node(CONSTANTS.get(value, value))
+
+    def _fold(self, operator: str, left: Function, right: Function) -> Function:
+        if isinstance(left.value, NUMBERS):
+            if right is None:
+                function = CHECKED_FUNCTIONS.get(operator, OPERATORS[operator].function)
+                return Function.node(function(left.value))
+            if isinstance(right.value, NUMBERS):
+                function = CHECKED_FUNCTIONS.get(operator, OPERATORS[operator].function)
+                return Function.node(function(left.value, right.value))
+
+        if operator == "unary-":
+            if left.value == "unary-":
+                return left.left
+        elif operator == "+":
+            if _equals(left, 0):
+                return right
+            if _equals(right, 0):
+                return left
+            if right.value == "unary-":
+                return Function.node("-", left, right.left)
+        elif operator == "-":
+            if _equals(right, 0):
+                return left
+            if _equals(left, 0):
+                return Function.node("unary-", right)
+            if left is right and not self._is_partial(left):
+                return Function.node(0.0)
+            if right.value == "unary-":
+                return Function.node("+", left, right.left)
+        elif operator == "*":
+            for constant, other in ((left, right), (right, left)):
+                if _equals(constant, 1):
+                    return other
+                if _equals(constant, 0) and not self._is_partial(other):
+                    return constant
+        elif operator == "/":
+            if _equals(right, 0):
+                raise ZeroDivisionError
+            if _equals(right, 1):
+                return left
+        elif operator == "^":
+            if _equals(right, 1):
+                return left
+            if _equals(left, 1) and not self._is_partial(right):
+                return left
+        return Function.node(operator, left, right)
+
+    def _is_partial(self, root: Function) -> bool:
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if id(node) in self._partial:
+                stack.pop()
+                continue
+            children = [child for child in (node.left, node.right) if child is not None]
+            pending = [child for child in children if id(child) not in self._partial]
+            if pending:
+                stack += pending
+                continue
+            stack.pop()
+            partial = node.value in PARTIAL or any(
+                self._partial[id(child)][1] for child in children
+            )
+            self._partial[id(node)] = (node, partial)
+        return self._partial[id(root)][1]
+
+
+def _equals(node: Function, number: float) -> bool:
+    return isinstance(node.value, NUMBERS) and node.value == number
@@ -0,0 +1,297 @@
+"""Модуль, обеспечивающий векторизованное вычисление функций\
+    над массивами NumPy"""
+
+import numpy as np
+
+from .operators import CONSTANTS, OPERATORS, OperatorType
+
+UFUNCS = {
+    "+": np.add,
+    "-": np.subtract,
+    "unary-": np.negative,
+    "*": np.multiply,
+    "/": np.divide,
+    "^": np.power,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "ln": np.log,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tg": np.tan,
+}
+
+DOMAIN_CHECKS = {
+    "/": lambda x, y: y == 0.0,
+    "^": lambda x, y: ((x == 0.0) & (y <= 0.0)) | ((x < 0.0) & (y != np.floor(y))),
+    "sqrt": lambda x: x < 0.0,
+    "ln": lambda x: x <= 0.0,
+}
+
+
+class VectorizedFunction:
+    """
+    Класс функции, скомпилированной для вычисления над массивами NumPy.
+    Точки, в которых `Function.calculate` выбросил бы исключение\
+        (деление на ноль, выход за область определения), получают значение NaN.
+
+    Args:
+        function (Function): Компилируемая функция.
+        variables (tuple): Порядок переменных при позиционной передаче аргументов.
+    """
+
+    def __init__(self, function, variables: tuple) -> None:
+        self._variables = tuple(variables)
+        free = set(function.variables())
+        missing = free.difference(self._variables)
+        if missing:
+            raise ValueError(f"Не указаны переменные: {', '.join(sorted(missing))}")
+        self._steps = []
+        self._root = None
+        if function.value is not None:
+            slots = {variable: index for index, variable in enumerate(self._variables)}
+            self._root = _compile_node(function, slots, self._steps, {})
+
+    @property
+    def variables(self) -> tuple:
+        """
+        Свойство, содержащее порядок переменных функции.
+
+        Returns:
+            tuple: Имена переменных.
+        """
+        return self._variables
+
+    def __call__(self, *args, **kwargs) -> np.ndarray:
+        """
+        Вычисляет функцию над массивами значений переменных.
+
+        Args:
+            *args: Значения переменных в порядке `variables`.
+            **kwargs: Значения переменных по имени.
+
+        Returns:
+            np.ndarray: Значения функции, NaN в недопустимых точках.
+        """
+        return self.evaluate(*args, **kwargs)[0]
+
+    def evaluate(self, *args, **kwargs) -> tuple:
+        """
+        Вычисляет функцию и маску точек, где функция не определена.
+
+        Args:
+            *args: Значения переменных в порядке `variables`.
+            **kwargs: Значения переменных по имени.
+
+        Raises:
+            ValueError: Возникает, когда значения переменных указаны неверно.
+
+        Returns:
+            tuple: Массив значений и булев массив ошибок той же формы.
+        """
+        arrays = bind(self._variables, args, kwargs)
+        shape = np.broadcast_shapes(*(array.shape for array in arrays))
+        if self._root is None:
+            return np.full(shape, np.nan), np.ones(shape, dtype=bool)
+
+        registers, errors = _run(self._steps, arrays)
+        result = registers[self._root]
+        shape = np.broadcast_shapes(shape, *(np.shape(error) for error in errors))
+        result = np.array(np.broadcast_to(result, shape), dtype=float)
+        mask = np.zeros(shape, dtype=bool)
+        for error in errors:
+            mask |= error
+        result[mask] = np.nan
+        return result, mask
+
+
+class VectorizedSystem:
+    """
+    Класс набора функций, скомпилированных в одну программу NumPy.
+    Общие подвыражения разных функций вычисляются один раз,\
+        а маска недопустимых точек у каждой функции своя.
+
+    Args:
+        functions (Iterable[Function]): Компилируемые функции.
+        variables (tuple): Порядок переменных при позиционной передаче аргументов.
+    """
+
+    def __init__(self, functions, variables: tuple) -> None:
+        functions = list(functions)
+        self._variables = tuple(variables)
+        free = set().union(*(function.variables() for function in functions))
+        missing = free.difference(self._variables)
+        if missing:
+            raise ValueError(f"Не указаны переменные: {', '.join(sorted(missing))}")
+        self._steps = []
+        slots = {variable: index for index, variable in enumerate(self._variables)}
+        memo = {}
+        self._roots = [
+            None if function.value is None else _compile_node(function, slots, self._steps, memo)
+            for function in functions
+        ]
+        checked = set()
+        found = [_checked_registers(function, memo, checked) for function in functions]
+        positions = {register: position for position, register in enumerate(sorted(checked))}
+        self._checks = [[positions[register] for register in registers] for registers in found]
+
+    @property
+    def variables(self) -> tuple:
+        """
+        Свойство, содержащее порядок переменных.
+
+        Returns:
+            tuple: Имена переменных.
+        """
+        return self._variables
+
+    def __call__(self, *args, **kwargs) -> np.ndarray:
+        """
+        Вычисляет все функции над массивами значений переменных.
+
+        Args:
+            *args: Значения переменных в порядке `variables`.
+            **kwargs: Значения переменных по имени.
+
+        Returns:
+            np.ndarray: Значения функций по последней оси, NaN в недопустимых точках.
+        """
+        return self.evaluate(*args, **kwargs)[0]
+
+    def evaluate(self, *args, **kwargs) -> tuple:
+        """
+        Вычисляет все функции и маски точек, где они не определены.
+
+        Args:
+            *args: Значения переменных в порядке `variables`.
+            **kwargs: Значения переменных по имени.
+
+        Raises:
+            ValueError: Возникает, когда значения переменных указаны неверно.
+
+        Returns:
+            tuple: Массив значений и булев массив ошибок формы (*точки, функции).
+        """
+        arrays = bind(self._variables, args, kwargs)
+        registers, errors = _run(self._steps, arrays)
+        shape = np.broadcast_shapes(
+            *(array.shape for array in arrays), *(np.shape(error) for error in errors)
+        )
+        values = np.full((*shape, len(self._roots)), np.nan)
+        mask = np.ones((*shape, len(self._roots)), dtype=bool)
+        for index, (root, checks) in enumerate(zip(self._roots, self._checks)):
+            if root is None:
+                continue
+            mask[..., index] = False
+            for position in checks:
+                mask[..., index] |= errors[position]
+            values[..., index] = registers[root]
+        values[mask] = np.nan
+        return values, mask
+
+
+def _run(steps: list, arrays: list) -> tuple:
+    errors = []
+    registers = list(arrays)
+    with np.errstate(all="ignore"):
+        for step in steps:
+            registers.append(step(registers, errors))
+    return registers, errors
+
+
+def _checked_registers(function, memo: dict, checked: set) -> list:
+    found = []
+    visited = set()
+    stack = [function]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited or node.value not in OPERATORS:
+            continue
+        visited.add(id(node))
+        if node.value in DOMAIN_CHECKS:
+            found.append(memo[id(node)])
+            checked.add(memo[id(node)])
+        stack.append(node.left)
+        if node.right is not None:
+            stack.append(node.right)
+    return found
+
+
+def bind(variables: tuple, args: tuple, kwargs: dict) -> list:
+    """
+    Сопоставляет позиционные и именованные аргументы переменным.
+
+    Args:
+        variables (tuple): Порядок переменных.
+        args (tuple): Значения переменных по порядку.
+        kwargs (dict): Значения переменных по имени.
+
+    Raises:
+        ValueError: Возникает, когда значения переменных указаны неверно.
+
+    Returns:
+        list: Массивы NumPy значений в порядке `variables`.
+    """
+    if len(args) > len(variables):
+        raise ValueError("Передано слишком много аргументов")
+    values = dict(zip(variables, args))
+    for variable, value in kwargs.items():
+        if variable not in variables or variable in values:
+            raise ValueError(f"Неверно указана переменная: {variable}")
+        values[variable] = value
+    if len(values) != len(variables):
+        missing = [variable for variable in variables if variable not in values]
+        raise ValueError(f"Не указаны переменные: {', '.join(missing)}")
+    return [np.asarray(values[variable], dtype=float) for variable in variables]
+
+
+def _compile_node(root, slots: dict, steps: list, memo: dict) -> int:
+    # Обход в обратном порядке с явным стеком: глубина дерева не ограничена рекурсией.
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in memo:
+            continue
+        value = node.value
+        if value in slots:
+            memo[id(node)] = slots[value]
+            continue
+        if value not in OPERATORS:
+            constant = CONSTANTS.get(value, value)
+            steps.append(lambda registers, errors, constant=constant: constant)
+        elif not expanded:
+            stack.append((node, True))
+            if OPERATORS[value].operator_type == OperatorType.BINARY:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+            continue
+        else:
+            right = None if node.right is None else memo[id(node.right)]
+            steps.append(_compile_operator(value, memo[id(node.left)], right))
+        memo[id(node)] = len(slots) + len(steps) - 1
+    return memo[id(root)]
+
+
+def _compile_operator(value: str, left: int, right: int) -> callable:
+    ufunc = UFUNCS[value]
+    check = DOMAIN_CHECKS.get(value)
+
+    if OPERATORS[value].operator_type == OperatorType.BINARY:
+        if check is None:
+            return lambda registers, errors: ufunc(registers[left], registers[right])
+
+        def binary(registers, errors):
+            x, y = registers[left], registers[right]
+            errors.append(check(x, y))
+            return ufunc(x, y)
+
+        return binary
+
+    if check is None:
+        return lambda registers, errors: ufunc(registers[left])
+
+    def prefix(registers, errors):
+        x = registers[left]
+        errors.append(check(x))
+        return ufunc(x)
+
+    return prefix
@@ -1,13 +1,102 @@
 """Модуль для получения производной от функции"""
 
 import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
+from functions.cache import DiskCache, LRUCache
+from functions.expr_parser import ParserError
 from functions.function import Function
+from functions.profiling import Profile
+
+PARSE_CACHE = LRUCache(1024)
+DIFF_CACHE = LRUCache(4096)
+DISK_CACHE = None
+
+
+def parse(function: str) -> Function:
+    """
+    Функция, которая разбирает выражение, используя кэш разобранных функций.
+    Ключ кэша - выражение без пробельных символов.
+    Возвращаемую функцию нельзя изменять, она общая для всех вызовов.
+
+    Args:
+        function (str): Математическое выражение.
+
+    Returns:
+        Function: Разобранная функция.
+    """
+    key = "".join(function.split())
+    result = PARSE_CACHE.get(key)
+    if result is None:
+        result = Function(key)
+        PARSE_CACHE.put(key, result)
+    return result
+
+
+def configure_cache(parse_size: int = None, diff_size: int = None) -> None:
+    """
+    Функция, изменяющая размеры кэшей разобранных функций и производных.
+
+    Args:
+        parse_size (int, optional): Размер кэша разобранных функций.
+        diff_size (int, optional): Размер кэша производных.
+    """
+    if parse_size is not None:
+        PARSE_CACHE.resize(parse_size)
+    if diff_size is not None:
+        DIFF_CACHE.resize(diff_size)
+
+
+def configure_disk_cache(path: str = None, maxsize: int = 100000) -> None:
+    """
+    Функция, подключающая постоянный кэш производных в файле SQLite.
+    Файл можно использовать из нескольких процессов одновременно.
+
+    Args:
+        path (str, optional): Путь к файлу кэша. None отключает кэш.
+        maxsize (int, optional): Наибольшее количество записей. По дефолту 100000.
+    """
+    global DISK_CACHE  # pylint: disable=global-statement
+    if DISK_CACHE is not None:
+        DISK_CACHE.close()
+    DISK_CACHE = None if path is None else DiskCache(path, maxsize)
+
+
+def cache_info() -> dict:
+    """
+    Функция, возвращающая статистику кэшей.
+
+    Returns:
+        dict: Статистика кэшей 'parse', 'diff' и, если подключен, 'disk'.
+    """
+    info = {"parse": PARSE_CACHE.info(), "diff": DIFF_CACHE.info()}
+    if DISK_CACHE is not None:
+        info["disk"] = DISK_CACHE.info()
+    return info
+
+
+def clear_cache(disk: bool = False) -> None:
+    """
+    Функция, очищающая кэши разобранных функций и производных.
+
+    Args:
+        disk (bool, optional): Очищать ли постоянный кэш. По дефолту False.
+    """
+    PARSE_CACHE.clear()
+    DIFF_CACHE.clear()
+    if disk and DISK_CACHE is not None:
+        DISK_CACHE.clear()
 
 
 def diff(function: str, variable: str = "x", **values: dict) -> str:
     """
     Функция, которая берет производную от данной математической функции.
+    Разобранные выражения и производные берутся из кэшей (см. `cache_info`),\
+        в том числе из постоянного (см. `configure_disk_cache`).
 
     Args:
         function (str): Функция, от которой получаем производную.
@@ -16,17 +105,203 @@ def diff(function: str, variable: str = "x", **values: dict) -> str:
         **values: Аргументы переменных функции.\
             Если указано, вычисляется производная в заданной точке.
 
+    Raises:
+        ValueError: Возникает, когда в точке указано имя, которое\
+            не может быть переменной функции (например, 'mode').
+
     Returns:
         str: Производная функции.
     """
+    return _diff(function, variable, values)
+
+
+def _diff(function: str, variable: str, values: dict) -> str:
+    # Точка передается словарем, чтобы имена из нее не совпадали с параметрами;\
+    #     переменные - одна латинская буква, как в `Parser`, поэтому\
+    #     проверенные имена не совпадут и с параметрами `Function.derive`.
     if values:
-        return str(Function(function).derive(variable, **values))
-    return str(Function(function).diff(variable))
+        names = [name for name in values if not _is_variable(name)]
+        if names:
+            raise ValueError(f"Точка указана неверно, не переменные: {', '.join(names)}")
+        return str(parse(function).derive(variable, **values))
+    key = ("".join(function.split()), variable)
+    result = DIFF_CACHE.get(key)
+    if result is None and DISK_CACHE is not None:
+        result = DISK_CACHE.get(key)
+        if result is not None:
+            DIFF_CACHE.put(key, result)
+    if result is None:
+        result = str(parse(function).diff(variable))
+        DIFF_CACHE.put(key, result)
+        if DISK_CACHE is not None:
+            DISK_CACHE.put(key, result)
+    return result
+
+
+def diff_many(
+    expressions, variable: str = "x", workers: int = None, chunksize: int = None
+) -> list:
+    """
+    Функция, которая берет производные от набора независимых функций\
+        в пуле процессов. Порядок результатов совпадает с порядком выражений.
+    Ошибка разбора одного выражения не прерывает обработку остальных.
+
+    Args:
+        expressions (Iterable[str]): Функции, от которых получаем производные.
+        variable (str, optional): Переменная от которой берем производную.\
+            По дефолту 'x'
+        workers (int, optional): Количество процессов.\
+            По дефолту - количество процессоров, при 1 пул не создается.
+        chunksize (int, optional): Количество выражений, передаваемых процессу за раз.\
+            По дефолту выражения делятся на четыре порции на процесс.
+
+    Raises:
+        ValueError: Возникает, когда количество процессов или размер порции меньше 1.
 
+    Returns:
+        list: Производные (str) или исключения ParserError для каждого выражения.
+    """
+    expressions = list(expressions)
+    if workers is not None and workers < 1:
+        raise ValueError("Количество процессов должно быть положительным")
+    if chunksize is not None and chunksize < 1:
+        raise ValueError("Размер порции должен быть положительным")
+    workers = workers or os.cpu_count() or 1
+    items = [(expression, variable) for expression in expressions]
+    if workers == 1 or len(items) <= 1:
+        return [_diff_item(item) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_diff_item, items, chunksize=chunksize))
+
+
+def warmup(expressions, variable: str = "x", workers: int = None, chunk: int = 10000) -> dict:
+    """
+    Функция, заранее заполняющая постоянный кэш производными.
+    Выражения читаются порциями и не накапливаются в памяти.
+
+    Args:
+        expressions (Iterable[str]): Функции, по одной на строку.
+        variable (str, optional): Переменная от которой берем производную.\
+            По дефолту 'x'
+        workers (int, optional): Количество процессов (см. `diff_many`).
+        chunk (int, optional): Количество выражений в порции. По дефолту 10000.
+
+    Raises:
+        ValueError: Возникает, когда постоянный кэш не подключен.
+
+    Returns:
+        dict: Количество обработанных выражений и ошибок разбора.
+    """
+    if DISK_CACHE is None:
+        raise ValueError("Постоянный кэш не подключен (см. configure_disk_cache)")
+    lines = (line.strip() for line in expressions)
+    lines = (line for line in lines if line)
+    counts = {"expressions": 0, "errors": 0}
+    while True:
+        batch = list(islice(lines, chunk))
+        if not batch:
+            return counts
+        results = diff_many(batch, variable, workers)
+        # Процессы пула не видят DISK_CACHE при запуске через spawn и forkserver,\
+        #     поэтому производные записываются в кэш из этого процесса.
+        DISK_CACHE.put_many(
+            (("".join(expression.split()), variable), result)
+            for expression, result in zip(batch, results)
+            if isinstance(result, str)
+        )
+        counts["expressions"] += len(batch)
+        counts["errors"] += sum(isinstance(result, ParserError) for result in results)
+
+
+def _diff_item(item: tuple):
+    try:
+        return diff(*item)
+    except ParserError as error:
+        return error
+
+
+def stream(lines, variable: str = "x", values: dict = None, json_lines: bool = False):
+    """
+    Генератор, который берет производные от функций, читаемых построчно.
+    Входные строки обрабатываются по одной и не накапливаются в памяти,\
+        пустые строки пропускаются.
+
+    Args:
+        lines (Iterable[str]): Функции, по одной на строку.
+        variable (str, optional): Переменная от которой берем производную.\
+            По дефолту 'x'
+        values (dict, optional): Точка, в которой вычисляется производная.
+        json_lines (bool, optional): Записывать ли результаты в формате JSON Lines\
+            (с позицией ошибки разбора). По дефолту False.
 
-def main() -> None:
+    Yields:
+        str: Строка результата, оканчивающаяся переводом строки.
     """
-    Выводит производную от определенной функции
+    values = values or {}
+    for line in lines:
+        expression = line.strip()
+        if not expression:
+            continue
+        try:
+            result = _diff(expression, variable, values)
+        except ParserError as error:
+            record = {
+                "expression": expression,
+                "error": error.__class__.__name__,
+                "position": error.position,
+                "length": error.length,
+            }
+        except ValueError as error:
+            record = {"expression": expression, "error": str(error)}
+        except (ArithmeticError, RecursionError) as error:
+            # Например, переполнение при вычислении производной в точке.
+            record = {
+                "expression": expression,
+                "error": error.__class__.__name__,
+                "message": str(error),
+            }
+        else:
+            record = {"expression": expression, "result": result}
+
+        if json_lines:
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+        elif "result" in record:
+            yield f"{record['result']}\n"
+        elif "position" in record:
+            yield f"{record['error']}: позиция {record['position']}\n"
+        elif "message" in record:
+            yield f"{record['error']}: {record['message']}\n"
+        else:
+            yield f"ValueError: {record['error']}\n"
+
+
+def _is_variable(name: str) -> bool:
+    return len(name) == 1 and name.isascii() and name.isalpha()
+
+
+def _point(text: str) -> tuple:
+    variable, separator, value = text.partition("=")
+    variable = variable.strip()
+    try:
+        if not separator or not _is_variable(variable):
+            raise ValueError
+        return variable, float(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(
+            f"Точка указана неверно: {text} (ожидается вида x=2)"
+        ) from error
+
+
+def main(argv: list = None) -> None:
+    """
+    Выводит производную от определенной функции.
+    С флагами --stdin или --input работает в потоковом режиме без диалога.
+
+    Args:
+        argv (list, optional): Аргументы командной строки. По дефолту sys.argv.
     """
     parser = argparse.ArgumentParser(
         prog="derivative",
@@ -35,14 +310,84 @@ def main() -> None:
             (e.g. [derivative.diff("x^2") -> "2.0*x"],\
                 [derivative.diff("x^2", x=2) -> "4.0"])',
     )
-    _ = parser.parse_args()
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--stdin", action="store_true", help="read expressions from stdin")
+    source.add_argument("--input", metavar="FILE", help="read expressions from a file")
+    parser.add_argument("--output", metavar="FILE", help="write results to a file")
+    parser.add_argument("--variable", default="x", help="differentiation variable")
+    parser.add_argument(
+        "--at",
+        type=_point,
+        action="append",
+        default=[],
+        metavar="VAR=VALUE",
+        help="evaluate the derivative at a point (repeatable)",
+    )
+    parser.add_argument("--json", action="store_true", help="write JSON Lines")
+    parser.add_argument("--cache", metavar="FILE", help="persistent derivative cache (SQLite)")
+    parser.add_argument("--cache-size", type=int, default=100000, help="persistent cache entries")
+    parser.add_argument(
+        "--warmup", metavar="FILE", help="preload the persistent cache and print statistics"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="processes for --warmup")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="write per-stage timings to stderr in Prometheus text format",
+    )
+    args = parser.parse_args(argv)
+    if not args.profile:
+        _run(parser, args)
+        return
+    with Profile() as profile:
+        try:
+            _run(parser, args)
+        finally:
+            sys.stderr.write(profile.to_prometheus())
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    values = dict(args.at)
+    if args.cache:
+        configure_disk_cache(args.cache, args.cache_size)
+
+    if args.warmup:
+        if not args.cache:
+            parser.error("--warmup требует --cache")
+        with open(args.warmup, encoding="utf-8") as source:
+            counts = warmup(source, args.variable, args.workers)
+        print(json.dumps({**counts, **cache_info()["disk"]}, ensure_ascii=False))
+        return
+
+    if not (args.stdin or args.input):
+        if args.output:
+            parser.error("--output требует --stdin или --input")
+        _interactive(args.variable, values)
+        return
+
+    source = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    target = (
+        open(args.output, "w", encoding="utf-8", buffering=1 << 16)
+        if args.output
+        else sys.stdout
+    )
+    try:
+        target.writelines(stream(source, args.variable, values, args.json))
+        target.flush()
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            target.close()
+
 
+def _interactive(variable: str, values: dict) -> None:
     while True:
         user_input = input("Введите функцию (или 'stop' для выхода): ")
         if user_input.strip().lower() == "stop":
             print("До встречи!")
             break
-        result = diff(user_input)
+        result = _diff(user_input, variable, values)
         print(result)
 
 
@@ -0,0 +1,334 @@
+"""Модуль асинхронного HTTP/JSON сервиса дифференцирования функций"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from functions.expr_parser import ParserError
+from main import diff, parse
+
+ROUTES = ("/diff", "/derive")
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+MAX_BODY = 1 << 20
+
+
+class DiffServer:
+    """
+    Класс сервиса, обслуживающего запросы `POST /diff`, `POST /derive` и `GET /stats`.
+    Вычисления выполняются в ограниченном пуле, не блокируя цикл событий.
+    Одновременные запросы объединяются в пакеты, чтобы передавать в пул\
+        одно задание на несколько выражений.
+    Ограничение `max_pending` считается в выражениях, а не в запросах:\
+        если с новым запросом выражений в обработке станет больше,\
+        он получает ответ 503, а список длиннее `max_pending` - ответ 413.
+
+    Args:
+        host (str): Адрес сервера. По дефолту '127.0.0.1'.
+        port (int): Порт сервера, 0 - любой свободный. По дефолту 8080.
+        workers (int): Размер пула процессов. По дефолту 2.
+        max_pending (int): Наибольшее количество выражений в обработке. По дефолту 256.
+        batch_size (int): Наибольшее количество выражений в пакете. По дефолту 64.
+        batch_delay (float): Время ожидания пакета в секундах. По дефолту 0.002.
+        executor (Executor, optional): Пул для вычислений вместо пула процессов.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: int = 2,
+        max_pending: int = 256,
+        batch_size: int = 64,
+        batch_delay: float = 0.002,
+        executor=None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self._workers = workers
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._batch_delay = batch_delay
+        self._executor = executor
+        self._own_executor = executor is None
+        self._server = None
+        self._queue = None
+        self._batcher = None
+        self._tasks = set()
+        self._connections = set()
+        self._latencies = {route: deque(maxlen=10000) for route in ROUTES}
+        self._active = 0
+        self._rejected = 0
+
+    async def start(self) -> int:
+        """
+        Метод, запускающий сервер.
+
+        Returns:
+            int: Порт, на котором сервер принимает соединения.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self) -> None:
+        """
+        Метод, останавливающий сервер и пул вычислений.
+        """
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def serve_forever(self) -> None:
+        """
+        Метод, запускающий сервер и обслуживающий запросы до отмены.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def stats(self) -> dict:
+        """
+        Метод, возвращающий статистику сервиса.
+
+        Returns:
+            dict: Процентили задержки (мс) по маршрутам, количество выражений\
+                в обработке и отклоненных запросов.
+        """
+        stats = {route: percentiles(latencies) for route, latencies in self._latencies.items()}
+        stats["pending"] = self._active
+        stats["rejected"] = self._rejected
+        return stats
+
+    async def _handle(self, reader, writer) -> None:
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if len(body) > MAX_BODY:
+                    # Тело прочитано не полностью: остаток нельзя разбирать как запрос.
+                    keep_alive = False
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Соединение закрыто клиентом или сервер останавливается (см. `close`).
+            pass
+        except ValueError:
+            _write_response(writer, 400, {"error": "BadRequest"}, False)
+        finally:
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple:
+        if path == "/stats":
+            if method != "GET":
+                return 405, {"error": "MethodNotAllowed"}
+            return 200, self.stats()
+        if path not in ROUTES:
+            return 404, {"error": "NotFound"}
+        if method != "POST":
+            return 405, {"error": "MethodNotAllowed"}
+        if len(body) > MAX_BODY:
+            return 413, {"error": "PayloadTooLarge"}
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return 400, {"error": "BadRequest", "message": "Тело запроса не JSON"}
+        items = payload if isinstance(payload, list) else [payload]
+        if len(items) > self._max_pending:
+            return 413, {"error": "PayloadTooLarge", "message": "Слишком много выражений"}
+        if self._active + len(items) > self._max_pending:
+            self._rejected += 1
+            return 503, {"error": "Overloaded"}
+
+        self._active += len(items)
+        try:
+            start = time.perf_counter()
+            futures = []
+            for item in items:
+                future = asyncio.get_running_loop().create_future()
+                self._queue.put_nowait(((path, item), future))
+                futures.append(future)
+            results = await asyncio.gather(*futures)
+            self._latencies[path].append((time.perf_counter() - start) * 1000)
+        finally:
+            self._active -= len(items)
+
+        if isinstance(payload, list):
+            return 200, results
+        return (400 if "error" in results[0] else 200), results[0]
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._batch_delay
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._submit(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _submit(self, batch: list) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor, evaluate, [item for item, _ in batch]
+            )
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            results = [{"error": error.__class__.__name__, "message": str(error)}] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def evaluate(items: list) -> list:
+    """
+    Функция, вычисляющая пакет запросов в процессе пула.
+
+    Args:
+        items (list): Пары (маршрут, тело запроса).
+
+    Returns:
+        list: Ответы в том же порядке: {'result': ...} или {'error': ...}.
+    """
+    return [_evaluate_item(route, payload) for route, payload in items]
+
+
+def _evaluate_item(route: str, payload) -> dict:
+    if not isinstance(payload, dict) or not isinstance(payload.get("expression"), str):
+        return {"error": "BadRequest", "message": "Не указано выражение 'expression'"}
+    variable = payload.get("variable", "x")
+    point = payload.get("point", {})
+    if not isinstance(variable, str) or not isinstance(point, dict):
+        return {"error": "BadRequest", "message": "Неверно указаны 'variable' или 'point'"}
+    try:
+        if route == "/diff":
+            return {"result": diff(payload["expression"], variable)}
+        values = {name: float(value) for name, value in point.items()}
+        result = parse(payload["expression"]).derive(variable, **values)
+        if not math.isfinite(result):
+            # inf и nan не записываются в JSON.
+            return {"error": "ValueError", "message": f"Производная не конечна: {result}"}
+        return {"result": result}
+    except ParserError as error:
+        return {
+            "error": error.__class__.__name__,
+            "message": str(error).strip("\n"),
+            "position": error.position,
+            "length": error.length,
+        }
+    except (ValueError, TypeError) as error:
+        return {"error": "ValueError", "message": str(error)}
+    except (ArithmeticError, RecursionError) as error:
+        # Ошибка одного выражения не должна попадать в ответы всего пакета.
+        return {"error": error.__class__.__name__, "message": str(error)}
+
+
+def percentiles(latencies) -> dict:
+    """
+    Функция, вычисляющая процентили задержки.
+
+    Args:
+        latencies (Iterable[float]): Задержки в миллисекундах.
+
+    Returns:
+        dict: Количество измерений и процентили p50, p90, p99 (None без измерений).
+    """
+    ordered = sorted(latencies)
+    result = {"count": len(ordered)}
+    for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        if ordered:
+            result[name] = ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+        else:
+            result[name] = None
+    return result
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    method, path, _ = line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(min(length, MAX_BODY + 1)) if length else b""
+    return method, path, headers, body
+
+
+def _write_response(writer, status: int, payload, keep_alive: bool) -> None:
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+def main() -> None:
+    """
+    Запускает сервис дифференцирования.
+    """
+    parser = argparse.ArgumentParser(prog="derivative-server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    server = DiffServer(args.host, args.port, args.workers, args.max_pending, args.batch_size)
+    print(f"Сервер запущен на http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("До встречи!")
+
+
+if __name__ == "__main__":
+    main()
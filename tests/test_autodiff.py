@@ -0,0 +1,65 @@
+"""Test module for functions.autodiff"""
+
+import numpy as np
+import pytest
+
+from functions import autodiff, function
+
+
+@pytest.mark.parametrize(
+    "func, variable, point, expected",
+    [
+        ("x^3", "x", {"x": 2}, (8.0, 12.0)),
+        ("x*y+sin(x)", "y", {"x": 1.5, "y": 3}, (4.5 + np.sin(1.5), 1.5)),
+        ("x^x", "x", {"x": 2}, (4.0, 4.0 * (np.log(2) + 1))),
+        ("sqrt(x)/x", "x", {"x": 4}, (0.5, -1 / 16)),
+        ("tg(x)-ln(x)", "x", {"x": 1}, (np.tan(1), 1 / np.cos(1) ** 2 - 1)),
+        ("sin(x)*sin(x)", "x", {"x": 0.3}, (np.sin(0.3) ** 2, np.sin(0.6))),
+        ("pi*x", "y", {"x": 2, "y": 1}, (2 * np.pi, 0.0)),
+    ],
+)
+def test_derive(func, variable, point, expected):
+    """Test for value and derivative computed in one pass"""
+    assert autodiff.derive(function.Function(func).intern(), variable, point) == pytest.approx(
+        expected
+    )
+
+
+@pytest.mark.parametrize(
+    "func, point, expected_error",
+    [
+        ("sqrt(x)", {"x": 0}, ZeroDivisionError),
+        ("ln(x)", {"x": -1}, ValueError),
+        ("y^x", {"x": 2, "y": -1}, ValueError),
+        ("x/(x-1)", {"x": 1}, ZeroDivisionError),
+        ("x+y", {"x": 1}, ValueError),
+    ],
+)
+def test_derive_errors(func, point, expected_error):
+    """Test for domain errors in forward-mode differentiation"""
+    with pytest.raises(expected_error):
+        autodiff.derive(function.Function(func), "x", point)
+
+
+@pytest.mark.parametrize(
+    "func, points",
+    [
+        ("x^2*sin(x)", {"x": [-2.0, 0.0, 3.5]}),
+        ("x^y+ln(y)", {"x": [0.5, 1.0, 2.0], "y": [1.0, 2.0, 3.0]}),
+        ("sqrt(x)+tg(x)", {"x": [0.0, 1.0, 4.0, -1.0]}),
+        ("x^0,5", {"x": [0.0, 4.0]}),
+        ("x", {"x": [1.0, -1.0]}),
+    ],
+)
+def test_vectorized(func, points):
+    """Test for vectorized dual numbers agreeing with scalar ones"""
+    tree = function.Function(func)
+    values, derivatives = tree.compile_derivative("x")(**points)
+    for index in range(len(points["x"])):
+        point = {name: array[index] for name, array in points.items()}
+        try:
+            expected = autodiff.derive(tree, "x", point)
+        except (ZeroDivisionError, ValueError):
+            assert np.isnan(values[index]) and np.isnan(derivatives[index])
+        else:
+            assert (values[index], derivatives[index]) == pytest.approx(expected)
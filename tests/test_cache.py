@@ -0,0 +1,135 @@
+"""Test module for functions.cache"""
+
+import pytest
+
+import main
+from functions import cache
+
+
+def test_lru_eviction():
+    """Test for evicting least recently used entries"""
+    lru = cache.LRUCache(2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1
+    lru.put("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("c") == 3
+    assert lru.info() == {"hits": 2, "misses": 1, "size": 2, "maxsize": 2}
+    lru.resize(1)
+    assert len(lru) == 1 and lru.get("c") == 3
+    lru.clear()
+    assert lru.info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 1}
+
+
+@pytest.mark.parametrize("maxsize", [-1])
+def test_lru_errors(maxsize):
+    """Test for invalid cache sizes"""
+    with pytest.raises(ValueError):
+        cache.LRUCache(maxsize)
+
+
+def test_diff_cache():
+    """Test for caching parsed functions and derivatives in main.diff"""
+    main.clear_cache()
+    assert main.diff("x^2 + x") == "2.0*x+1.0"
+    assert main.diff(" x ^ 2+x ") == "2.0*x+1.0"
+    assert main.diff("x^2+x", x=2) == "5.0"
+    info = main.cache_info()
+    assert info["diff"]["hits"] == 1 and info["diff"]["misses"] == 1
+    assert info["parse"]["hits"] == 1 and info["parse"]["misses"] == 1
+    main.configure_cache(diff_size=0)
+    assert main.diff("x^2 + x") == "2.0*x+1.0"
+    assert main.cache_info()["diff"]["size"] == 0
+    main.configure_cache(diff_size=4096)
+    main.clear_cache()
+
+
+def test_disk_cache(tmp_path):
+    """Test for the persistent cache with eviction and version isolation"""
+    path = str(tmp_path / "cache.db")
+    disk = cache.DiskCache(path, maxsize=2, touch_interval=0)
+    disk.put(("x^2", "x"), "2.0*x")
+    disk.put(("x^3", "x"), "3.0*x^2.0")
+    assert disk.get(("x^2", "x")) == "2.0*x"
+    disk.put(("sin(x)", "x"), "cos(x)")
+    assert disk.get(("x^3", "x")) is None
+    assert disk.info() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 2, "maxsize": 2}
+    disk.close()
+
+    reopened = cache.DiskCache(path, maxsize=2)
+    assert reopened.get(("sin(x)", "x")) == "cos(x)"
+    assert cache.DiskCache(path, version="0.0.0").get(("sin(x)", "x")) is None
+    reopened.resize(1)
+    assert len(reopened) == 1
+    reopened.clear()
+    assert len(reopened) == 0
+    with pytest.raises(ValueError):
+        cache.DiskCache(path, maxsize=-1)
+
+
+def test_disk_cache_batches(tmp_path):
+    """Test for batched eviction and lazy recency updates of the persistent cache"""
+    path = str(tmp_path / "cache.db")
+    disk = cache.DiskCache(path, maxsize=20)
+    disk.put_many(((f"x^{power}", "x"), "") for power in range(20))
+    assert disk.get(("x^0", "x")) == ""
+    disk.put(("x^20", "x"), "")
+    # One excess entry plus a tenth of the cache is evicted; reading the fresh x^0\
+    #     did not touch it, so it is the oldest one.
+    assert len(disk) == 18
+    assert disk.get(("x^0", "x")) is None
+    assert disk.get(("x^3", "x")) == ""
+
+    other = cache.DiskCache(path, maxsize=20)
+    other.put_many(((f"y^{power}", "x"), "") for power in range(2))
+    disk.put(("z", "x"), "")
+    assert len(disk) == 21
+    disk.put_many([(("z^2", "x"), ""), (("z^3", "x"), "")])
+    assert len(disk) == 18
+
+
+def test_disk_cache_main(tmp_path):
+    """Test for sharing the persistent cache between processes and restarts"""
+    path = str(tmp_path / "cache.db")
+    source = tmp_path / "expressions.txt"
+    source.write_text("x^2\nsin(x)\n(x\n\nx*y\n", encoding="utf-8")
+    try:
+        main.main(["--cache", path, "--warmup", str(source), "--workers", "2"])
+        assert len(cache.DiskCache(path)) == 3
+
+        main.clear_cache()
+        main.configure_disk_cache(path)
+        assert main.diff("x * y") == "y"
+        assert main.cache_info()["disk"]["hits"] == 1
+        assert main.warmup(["x^2", "x^4"], workers=1) == {"expressions": 2, "errors": 0}
+        assert main.cache_info()["disk"]["size"] == 4
+    finally:
+        main.configure_disk_cache(None)
+        main.clear_cache()
+    with pytest.raises(ValueError):
+        main.warmup(["x"])
+
+
+def test_warmup_without_inherited_cache(tmp_path, monkeypatch):
+    """Test for filling the persistent cache when workers do not share its global"""
+    path = str(tmp_path / "cache.db")
+
+    def isolated(expressions, variable, workers):
+        saved = main.DISK_CACHE
+        main.DISK_CACHE = None
+        try:
+            return [main._diff_item((expression, variable)) for expression in expressions]
+        finally:
+            main.DISK_CACHE = saved
+
+    monkeypatch.setattr(main, "diff_many", isolated)
+    try:
+        main.configure_disk_cache(path)
+        counts = main.warmup(["x ^ 2", "(x", "sin(x)"], workers=2)
+        assert counts == {"expressions": 3, "errors": 1}
+        assert len(cache.DiskCache(path)) == 2
+        assert cache.DiskCache(path).get(("x^2", "x")) == "2.0*x"
+    finally:
+        main.configure_disk_cache(None)
+        main.clear_cache()
@@ -122,6 +122,7 @@ def test_parenthesis(expression, expected_rpn):
         ("2sin", expr_parser.EntitiesPlacementError, "\n2sin\n ^^^"),
         ("+2sinx", expr_parser.EntitiesPlacementError, "\n+2sinx\n^"),
         ("2sinx+", expr_parser.EntitiesPlacementError, "\n2sinx+\n     ^"),
+        ("x*-", expr_parser.EntitiesPlacementError, "\nx*-\n  ^"),
         ("2+.", expr_parser.InvalidNumberError, "\n2+.\n  ^"),
         ("1.341.2x", expr_parser.InvalidNumberError, "\n1.341.2x\n^^^^^^^"),
     ],
@@ -131,3 +132,39 @@ def test_errors(expression, expected_error, expected_error_message):
     with pytest.raises(expected_error) as excinfo:
         _ = expr_parser.Parser(expression).rpn
     assert str(excinfo.value) == expected_error_message
+
+
+def make_tuple(value, left=None, right=None):
+    """Node factory building nested tuples"""
+    return (value, left, right) if left is not None else value
+
+
+@pytest.mark.parametrize(
+    "expression, expected_tree",
+    [
+        ("", None),
+        ("x+2sin(y)", ("+", "x", ("*", 2.0, ("sin", "y", None)))),
+        ("-x^2", ("unary-", ("^", "x", 2.0), None)),
+        ("a/(b/c)", ("/", "a", ("/", "b", "c"))),
+    ],
+)
+def test_parse_tree(expression, expected_tree):
+    """Test for building trees directly from tokens"""
+    assert expr_parser.Parser(expression).parse(make_tuple) == expected_tree
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["+".join(["x"] * 100001), "^".join(["x"] * 100001), "(" * 50000 + "x" + ")" * 50000],
+)
+def test_parse_long(expression):
+    """Test for parsing expressions deeper than the recursion limit"""
+    tree = expr_parser.Parser(expression).parse(make_tuple)
+    assert tree[0] in ("+", "^") or tree == "x"
+
+
+@pytest.mark.parametrize("expression", ["(a+b())", "1.341.2x", "((x+y)"])
+def test_parse_errors(expression):
+    """Test for errors raised while building trees"""
+    with pytest.raises(expr_parser.ParserError):
+        expr_parser.Parser(expression).parse(make_tuple)
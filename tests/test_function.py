@@ -3,6 +3,7 @@
 import pytest
 
 from functions import function
+from functions.simplifier import Simplifier
 
 
 @pytest.mark.parametrize(
@@ -44,6 +45,15 @@ def test_build_func(func, expected_str):
         ("sinx^2 + cosx^2", "1.0"),
         ("x^1/2 * x^2", "x^3.0/2.0"),
         ("0/0", "undefined"),
+        ("2(x+1)-2x", "2.0"),
+        ("x*x*x/x^2", "x"),
+        ("(2x)^3", "8.0*x^3.0"),
+        ("ln(e^x)+exp(0)", "x+1.0"),
+        ("x/(x-x)", "undefined"),
+        ("ln(2e)", "ln(2.0*e)"),
+        ("ln(e/2)", "ln(e/2.0)"),
+        ("(2e)^ln(x)", "(2.0*e)^ln(x)"),
+        ("10^300*10^300*x", "inf*x"),
     ],
 )
 def test_simplify(func, expected_str):
@@ -51,6 +61,36 @@ def test_simplify(func, expected_str):
     assert str(function.Function(func).simplify()) == expected_str
 
 
+@pytest.mark.parametrize(
+    "func, expected_str",
+    [
+        ("2x + x", "3.0*x"),
+        ("x/(x-x)", "undefined"),
+        ("x/0", "x/0.0"),
+    ],
+)
+def test_simplify_defined(func, expected_str):
+    """Test for the shared simplification with the definedness fallback"""
+    tree = function.Function(func)
+    simplified = Simplifier().simplify_defined(tree)
+    assert simplified.to_string() == expected_str
+    assert (simplified is tree) == (not tree.is_defined())
+
+
+@pytest.mark.parametrize(
+    "func, expected_str",
+    [
+        ("2x + x", "3.0*x"),
+        ("e^lnx", "x"),
+        ("sinx^2 + cosx^2", "1.0"),
+        ("0/0", "undefined"),
+    ],
+)
+def test_simplify_deep(func, expected_str):
+    """Test for simplifying functions with sympy"""
+    assert str(function.Function(func).simplify(deep=True)) == expected_str
+
+
 @pytest.mark.parametrize(
     "func, point, expected_str",
     [
@@ -75,11 +115,53 @@ def test_calculate(func, expected_str, point):
         ("e^sinx", "x", {"x": 0}, "1.0"),
         ("lnx", "x", {"x": 5}, "0.2"),
         ("2x+y^3-sin(tg(z))", "w", {"x": 10, "y": 20, "z": 30}, "0.0"),
+        ("(0.5e)^x", "x", {"x": 1.3}, "0.45727130611830247"),
     ],
 )
-def test_derive(func, variable, point, expected_str):
+@pytest.mark.parametrize("mode", ["symbolic", "ad"])
+def test_derive(func, variable, point, expected_str, mode):
     """Test for differentiating functions at some point"""
-    assert str(function.Function(func).derive(variable, **point)) == expected_str
+    assert str(function.Function(func).derive(variable, mode, **point)) == expected_str
+
+
+@pytest.mark.parametrize(
+    "func, point, expected",
+    [
+        ("x^2*y+sin(x*y)", {"x": 0, "y": 2}, {"x": 2.0, "y": 0.0}),
+        ("x/y-ln(z)", {"x": 1, "y": 2, "z": 4}, {"x": 0.5, "y": -0.25, "z": -0.25}),
+        ("x^y", {"x": 2, "y": 3}, {"x": 12.0, "y": 8.0 * 0.6931471805599453}),
+        ("sin(x)*sin(x)", {"x": 0.5, "w": 1}, {"x": 0.8414709848078965, "w": 0.0}),
+    ],
+)
+def test_gradient(func, point, expected):
+    """Test for reverse-mode gradients at some point"""
+    assert function.Function(func).gradient(**point) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "func, point",
+    [
+        ("x*y", {"x": 1}),
+        ("sqrt(x)+y", {"x": 0, "y": 1}),
+        ("ln(x-y)", {"x": 1, "y": 1}),
+    ],
+)
+def test_gradient_errors(func, point):
+    """Test for errors while computing gradients"""
+    with pytest.raises(ValueError):
+        function.Function(func).gradient(**point)
+
+
+@pytest.mark.parametrize(
+    "func", ["x^2*y+sin(x*y)", "x/y-ln(z)", "sqrt(x^2+y^2)", "x^y", "exp(a*b)*c"]
+)
+def test_gradient_symbolic(func):
+    """Test for symbolic gradients matching per-variable derivatives"""
+    tree = function.Function(func)
+    gradient = tree.gradient_symbolic()
+    assert tuple(gradient) == tree.variables()
+    for variable, partial in gradient.items():
+        assert str(partial) == str(tree.diff(variable))
 
 
 @pytest.mark.parametrize(
@@ -89,6 +171,8 @@ def test_derive(func, variable, point, expected_str):
         ("(x-1)/(x+1)", "x", "2.0/(x+1.0)^2.0"),
         ("sqrt(x^2)", "x", "x/sqrt(x^2.0)"),
         ("exp(cos(x))", "x", "-(exp(cos(x)))*sin(x)"),
+        ("(0.5e)^x", "x", "ln(e/2.0)*(e/2.0)^x"),
+        ("10^300*10^300*x", "x", "inf"),
         ("", "x", "undefined"),
     ],
 )
@@ -97,6 +181,44 @@ def test_diff(func, variable, expected_str):
     assert str(function.Function(func).diff(variable)) == expected_str
 
 
+@pytest.mark.parametrize(
+    "func, variable, expected_str",
+    [
+        ("x^2", "x", "(1.0*2.0/x+ln(x)*0.0)*x^2.0"),
+        ("sin(y)", "y", "1.0*cos(y)"),
+        ("x+y", "y", "0.0+1.0"),
+    ],
+)
+def test_diff_without_simplify(func, variable, expected_str):
+    """Test for raw derivatives built without simplification"""
+    assert str(function.Function(func).diff(variable, simplify=False)) == expected_str
+
+
+@pytest.mark.parametrize(
+    "func, variable, order, expected_str",
+    [
+        ("x^4", "x", 2, "12.0*x^2.0"),
+        ("sin(x)", "x", 4, "sin(x)"),
+        ("e^x*y", "x", 3, "e^x*y"),
+        ("x^3", "x", 5, "0.0"),
+    ],
+)
+def test_diff_order(func, variable, order, expected_str):
+    """Test for higher-order derivatives"""
+    assert str(function.Function(func).diff(variable, order=order)) == expected_str
+
+
+def test_derivatives_cache():
+    """Test for caching derivatives of all orders"""
+    func = function.Function("x^3")
+    derivatives = list(func.derivatives("x", 4))
+    assert list(map(str, derivatives)) == ["3.0*x^2.0", "6.0*x", "6.0", "0.0"]
+    assert func.diff("x", order=3) is derivatives[2]
+    assert func.diff("x") is derivatives[0]
+    with pytest.raises(ValueError):
+        func.diff("x", order=0)
+
+
 @pytest.mark.parametrize(
     "func, point, expected_error",
     [
@@ -125,7 +247,222 @@ def test_calculate_errors(func, point, expected_error):
         ("e^cosx*1/tgx", "x", {"x": 0}, ValueError),
     ],
 )
-def test_derive_errors(func, variable, point, expected_error):
+@pytest.mark.parametrize("mode", ["symbolic", "ad"])
+def test_derive_errors(func, variable, point, expected_error, mode):
     """Test for errors in functions that may occur while taking derivative"""
     with pytest.raises(expected_error):
-        _ = function.Function(func).derive(variable, **point)
+        _ = function.Function(func).derive(variable, mode, **point)
+
+
+@pytest.mark.parametrize(
+    "func, points",
+    [
+        ("x^2+2x+2", {"x": [-2.0, 0.0, 3.5]}),
+        ("sin(x-1/y)*e^x", {"x": [0.5, 1.0, 2.0], "y": [1.0, 2.0, -3.0]}),
+        ("ln(x)+sqrt(x)-tg(pi/x)", {"x": [1.0, 2.5, 10.0]}),
+        ("x^y", {"x": [2.0, 4.0, -2.0], "y": [0.5, 3.0, 2.0]}),
+        ("x", {"x": [1.0, -1.0]}),
+    ],
+)
+def test_compile(func, points):
+    """Test for vectorized evaluation matching calculate"""
+    compiled = function.Function(func).compile()
+    result = compiled(**points)
+    for index, value in enumerate(result):
+        point = {name: values[index] for name, values in points.items()}
+        assert value == pytest.approx(function.Function(func).calculate(**point).value)
+
+
+def test_deep_trees():
+    """Test for differentiating, calculating and simplifying very deep trees"""
+    long_sum = function.Function("+".join(f"{index}*x*y" for index in range(1, 2001)))
+    assert long_sum.calculate(x=1, y=2).value == 4002000.0
+    assert str(long_sum.simplify()) == "2001000.0*x*y"
+    assert str(long_sum.diff("x")) == "2001000.0*y"
+    assert str(long_sum.gradient_symbolic()["y"]) == "2001000.0*x"
+
+    nested = "x"
+    for _ in range(1500):
+        nested = f"sin({nested})"
+    tree = function.Function(nested)
+    assert tree.calculate(x=0.0).value == 0.0
+    assert tree.diff("x", simplify=False).calculate(x=0.0).value == 1.0
+
+
+def test_compile_long_sum():
+    """Test for compiling trees deeper than the recursion limit"""
+    tree = function.Function("+".join(f"{index}*x" for index in range(1, 2001)) + "+sin(y)")
+    result = tree.compile("x", "y")([1.0, 2.0], 0.0)
+    assert result.tolist() == [2001000.0, 4002000.0]
+
+
+@pytest.mark.parametrize(
+    "func, points, expected_mask",
+    [
+        ("1/x", [0.0, 1.0], [True, False]),
+        ("sqrt(x-5)", [4.0, 5.0], [True, False]),
+        ("ln(x^2-4x+3)", [2.0, 0.0], [True, False]),
+        ("x^(1/2)", [-1.0, 4.0], [True, False]),
+        ("x^(-1)", [0.0, 2.0], [True, False]),
+        ("0/0+x", [1.0, 2.0], [True, True]),
+    ],
+)
+def test_compile_domain(func, points, expected_mask):
+    """Test for domain errors in vectorized evaluation"""
+    values, mask = function.Function(func).compile("x").evaluate(points)
+    assert mask.tolist() == expected_mask
+    assert [value != value for value in values] == expected_mask
+
+
+@pytest.mark.parametrize(
+    "func, expected_str",
+    [
+        ("sin(x)*sin(x)", "sin(x)*sin(x)"),
+        ("(x+1)^(x+1)", "(x+1.0)^(x+1.0)"),
+        ("x-x", "x-x"),
+    ],
+)
+def test_intern(func, expected_str):
+    """Test for sharing structurally equal subexpressions"""
+    interned = function.Function(func).intern()
+    assert interned.left is interned.right
+    assert interned.intern() is interned
+    assert function.Function(func).intern() is interned
+    assert str(interned) == expected_str
+
+
+def test_intern_immutable():
+    """Test for rejecting mutation of shared nodes"""
+    interned = function.Function("sin(x)*sin(x)").intern()
+    with pytest.raises(AttributeError):
+        interned.left.value = "cos"
+
+
+@pytest.mark.parametrize(
+    "func, expected",
+    [
+        ("x+1", True),
+        ("x/(x-x)", True),
+        ("x/0", False),
+        ("1/(1-1)+x", False),
+        ("ln(0)*x", False),
+        ("sqrt(-1)+sin(x)", False),
+        ("10^1000+x", True),
+    ],
+)
+def test_is_defined(func, expected):
+    """Test for checking definedness without evaluating variables"""
+    assert function.Function(func).is_defined() == expected
+
+
+def test_mutation():
+    """Test for invalidating cached definedness and derivatives on mutation"""
+    func = function.Function("x/y")
+    assert str(func) == "x/y"
+    assert str(func.diff("x")) == "1.0/y"
+    func.right = function.Function("0")
+    assert str(func) == "undefined"
+    assert func.to_string() == "x/0.0"
+    func.value = "*"
+    assert str(func) == "x*0.0"
+    assert str(func.diff("x")) == "0.0"
+
+
+def test_mutation_scope():
+    """Test for invalidating caches only of trees that contain the mutated node"""
+    other = function.Function("x^3")
+    derivative, native = other.diff("x"), other.compile_native("x")
+    child = function.Function("x/y")
+    func = function.Function()
+    func.value, func.left, func.right = "+", child, function.Function("1")
+    assert str(func.diff("x")) == "1.0/y"
+    child.right = function.Function("0")
+    assert str(func) == "undefined"
+    child.value = "*"
+    assert str(func) == "x*0.0+1.0"
+    assert str(func.diff("x")) == "0.0"
+    assert other.diff("x") is derivative
+    assert other.compile_native("x") is native
+
+
+def test_to_string_long():
+    """Test for printing deep trees without recursion"""
+    func = function.Function("+".join(["x"] * 5000))
+    assert str(func) == "+".join(["x"] * 5000)
+    assert str(func.intern()) == "+".join(["x"] * 5000)
+
+
+@pytest.mark.parametrize(
+    "func, variables, point",
+    [
+        ("x^2+2x+2", ("x",), (3.0,)),
+        ("sin(x-1/y)*e^x", ("x", "y"), (0.5, -3.0)),
+        ("sin(x)*sin(x)+ln(x)/sqrt(pi*x)", ("x",), (2.0,)),
+        ("x^y-tg(y)", ("y", "x"), (2.0, 4.0)),
+        ("2+2", (), ()),
+    ],
+)
+def test_program(func, variables, point):
+    """Test for evaluating functions with a stack program"""
+    program = function.Function(func).to_program(*variables)
+    expected = function.Function(func).calculate(**dict(zip(variables, point))).value
+    assert program(*point) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "func, point, expected_error",
+    [
+        ("x^y", (0, 0), ZeroDivisionError),
+        ("x/y", (1, 0), ZeroDivisionError),
+        ("x^(1/2)", (-1, 1), ValueError),
+        ("sqrt(x-5)", (4, 1), ValueError),
+        ("ln(sin(x))", (0, 1), ValueError),
+        ("ln(x^2-4x+3)", (2, 1), ValueError),
+        ("x+y", (1,), ValueError),
+    ],
+)
+def test_program_errors(func, point, expected_error):
+    """Test for domain errors in stack programs"""
+    program = function.Function(func).to_program("x", "y")
+    with pytest.raises(expected_error):
+        program(*point)
+
+
+@pytest.mark.parametrize(
+    "func, variables, point",
+    [
+        ("x^2+2x+2", ("x",), (3.0,)),
+        ("sin(x-1/y)*e^x", ("x", "y"), (0.5, -3.0)),
+        ("sin(x)*sin(x)+ln(x)/sqrt(pi*x)", ("x",), (2.0,)),
+        ("x^y-tg(y)", ("y", "x"), (2.0, 4.0)),
+        ("2+2", (), ()),
+        pytest.param("+".join(["x"] * 250), ("x",), (1.0,), id="long-sum"),
+        pytest.param("9" * 400 + "*x", ("x",), (2.0,), id="inf"),
+        pytest.param("x-" + "9" * 400, ("x",), (2.0,), id="minus-inf"),
+    ],
+)
+def test_compile_native(func, variables, point):
+    """Test for evaluating functions with generated Python code"""
+    tree = function.Function(func)
+    native = tree.compile_native(*variables)
+    expected = tree.calculate(**dict(zip(variables, point))).value
+    assert native(*point) == pytest.approx(expected)
+    assert tree.compile_native(*variables) is native
+
+
+@pytest.mark.parametrize(
+    "func, point, expected_error",
+    [
+        ("x^y", (0, 0), ZeroDivisionError),
+        ("x/y", (1, 0), ZeroDivisionError),
+        ("x^(1/2)", (-1, 1), ValueError),
+        ("sqrt(x-5)", (4, 1), ValueError),
+        ("ln(sin(x))", (0, 1), ValueError),
+        ("ln(x^2-4x+3)", (2, 1), ValueError),
+    ],
+)
+def test_compile_native_errors(func, point, expected_error):
+    """Test for domain errors in generated Python code"""
+    native = function.Function(func).compile_native("x", "y")
+    with pytest.raises(expected_error):
+        native(*point)
@@ -0,0 +1,78 @@
+"""Test module for functions.incremental"""
+
+import pytest
+
+from functions.expr_parser import ParserError
+from functions.function import Function
+from functions.incremental import IncrementalFunction
+
+
+@pytest.mark.parametrize(
+    "expression, edits",
+    [
+        ("x^2+sin(x)-3*x", [(0, 1, "y"), (4, 3, "cos"), (10, 1, "+")]),
+        ("x*(y+z)-ln(x)", [(3, 0, "x+"), (0, 0, "-"), (16, 0, "+x^3")]),
+        ("sin-x+x", [(5, 1, "-"), (4, 0, "2*")]),
+        ("", [(0, 0, "x"), (1, 0, "+x^2"), (0, 5, "")]),
+    ],
+)
+def test_edits_match_full_parse(expression, edits):
+    """Test for incremental results matching parsing the edited text from scratch"""
+    incremental = IncrementalFunction(expression)
+    for position, removed, inserted in edits:
+        incremental.edit(position, removed, inserted)
+        function = Function(incremental.expression)
+        assert str(incremental.function()) == str(function)
+        if function.value is not None:
+            expected = function.diff(simplify=False)
+            assert str(incremental.diff(simplify=False)) == str(expected)
+        assert incremental.terms == IncrementalFunction(incremental.expression).terms
+
+
+@pytest.mark.parametrize(
+    "expression, variable, expected",
+    [
+        ("x^2 + 5 - sin(x)", "x", "2.0*x-cos(x)"),
+        ("5 - x^2", "x", "-(2.0)*x"),
+        ("y + 5", "x", "0.0"),
+        ("x*y + y^2", "y", "x+2.0*y"),
+    ],
+)
+def test_diff_simplified_per_term(expression, variable, expected):
+    """Test for per-term simplification of the incremental derivative"""
+    assert str(IncrementalFunction(expression).diff(variable)) == expected
+
+
+@pytest.mark.parametrize(
+    "expression, error_position",
+    [("x+", 1), ("x++y", 2), ("x+(y", 2), ("x*(y+", 4)],
+)
+def test_errors_match_full_parse(expression, error_position):
+    """Test for parser errors reported at positions of the whole expression"""
+    incremental = IncrementalFunction("x+y")
+    incremental.update(expression)
+    with pytest.raises(ParserError) as error:
+        incremental.function()
+    with pytest.raises(type(error.value)) as expected:
+        Function(expression)
+    assert error.value.position == expected.value.position == error_position
+    assert error.value.expression == expression
+    incremental.update("x+y")
+    assert str(incremental.diff()) == "1.0"
+
+
+def test_unchanged_terms_are_reused(monkeypatch):
+    """Test for re-parsing only the edited term"""
+    incremental = IncrementalFunction("+".join(f"sin({n}*x)" for n in range(1, 50)))
+    incremental.diff()
+    parsed = []
+    parse = IncrementalFunction._parse
+
+    def counting(self, term, position):
+        parsed.append(term)
+        return parse(self, term, position)
+
+    monkeypatch.setattr(IncrementalFunction, "_parse", counting)
+    incremental.edit(len("sin(1*x)+sin(2*x)+sin(3*"), 1, "y")
+    incremental.diff()
+    assert parsed == ["sin(3*y)"]
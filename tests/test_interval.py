@@ -0,0 +1,100 @@
+"""Test module for functions.interval"""
+
+import math
+
+import pytest
+
+from functions.function import Function
+from functions.interval import Domain, Interval, find_roots, partition
+
+
+@pytest.mark.parametrize(
+    "expression, ranges, expected_domain, expected",
+    [
+        ("1/x", {"x": (1, 2)}, Domain.DEFINED, (0.5, 1.0)),
+        ("1/x", {"x": (-1, 2)}, Domain.PARTIAL, (-math.inf, math.inf)),
+        ("1/(x-1)", {"x": 1}, Domain.UNDEFINED, None),
+        ("ln(x)", {"x": (-2, -1)}, Domain.UNDEFINED, None),
+        ("sqrt(x)", {"x": (-1, 4)}, Domain.PARTIAL, (0.0, 2.0)),
+        ("sin(x)", {"x": (0, 3)}, Domain.DEFINED, (0.0, 1.0)),
+        ("cos(x)+2", {"x": (-1, 1)}, Domain.DEFINED, (math.cos(1) + 2, 3.0)),
+        ("tg(x)", {"x": (1, 2)}, Domain.DEFINED, (-math.inf, math.inf)),
+        ("x^3", {"x": (-2, 1)}, Domain.DEFINED, (-8.0, 1.0)),
+        ("x^2", {"x": (-3, 2)}, Domain.DEFINED, (0.0, 9.0)),
+        ("x^y", {"x": (-2, 2), "y": (1.5, 3)}, Domain.PARTIAL, (-8.0, 8.0)),
+        ("x^0.5", {"x": (-2, -1)}, Domain.UNDEFINED, None),
+        ("exp(x)*pi", {"x": Interval(0, 1)}, Domain.DEFINED, (math.pi, math.e * math.pi)),
+        ("x*y", {"x": 2.0, "y": 3.0}, Domain.DEFINED, (6.0, 6.0)),
+        ("9" * 400 + "*(x-1)", {"x": 1}, Domain.DEFINED, (-math.inf, math.inf)),
+        ("9" * 400 + "-" + "9" * 400 + "+x", {"x": 1}, Domain.DEFINED, (-math.inf, math.inf)),
+    ],
+)
+def test_bounds(expression, ranges, expected_domain, expected):
+    """Test for enclosures and definedness on boxes"""
+    domain, values = Function(expression).bounds(**ranges)
+    assert domain == expected_domain
+    if expected is None:
+        assert values is None
+    else:
+        assert values.lower <= expected[0] and values.upper >= expected[1]
+        assert math.isclose(values.lower, expected[0], abs_tol=1e-9)
+        assert math.isclose(values.upper, expected[1], abs_tol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "expression, ranges, expected",
+    [
+        ("ln(x)/x", {"x": (0.5, 3)}, True),
+        ("ln(x)/x", {"x": (0, 3)}, False),
+        ("sqrt(x-y)", {"x": (2, 3), "y": (0, 1)}, True),
+        ("", {}, False),
+    ],
+)
+def test_is_defined_on(expression, ranges, expected):
+    """Test for definedness checks over whole ranges"""
+    assert Function(expression).is_defined_on(**ranges) is expected
+
+
+@pytest.mark.parametrize(
+    "ranges",
+    [{}, {"x": (2, 1)}],
+)
+def test_bounds_errors(ranges):
+    """Test for missing variables and invalid intervals"""
+    with pytest.raises(ValueError):
+        Function("x+1").bounds(**ranges)
+
+
+def test_partition():
+    """Test for splitting a range into defined and undefined pieces"""
+    pieces = partition(Function("sqrt(x)+ln(x)"), "x", -1, 1, depth=3)
+    assert [piece for piece, _, _ in pieces] == [
+        Interval(-1, 0),
+        Interval(0, 0.25),
+        Interval(0.25, 0.5),
+        Interval(0.5, 1),
+    ]
+    assert [domain for _, domain, _ in pieces] == [
+        Domain.UNDEFINED,
+        Domain.PARTIAL,
+        Domain.DEFINED,
+        Domain.DEFINED,
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression, ranges, expected",
+    [
+        ("x^2-2", {}, [-math.sqrt(2), math.sqrt(2)]),
+        ("sin(x)", {}, [-math.pi, 0.0, math.pi]),
+        ("x-a", {"a": 1.5}, [1.5]),
+        ("1/x", {}, []),
+    ],
+)
+def test_find_roots(expression, ranges, expected):
+    """Test for isolating roots by interval bisection"""
+    roots = find_roots(Function(expression), "x", -4, 4, 1e-6, **ranges)
+    assert len(roots) == len(expected)
+    for root, value in zip(roots, expected):
+        assert value in root
+        assert root.upper - root.lower < 1e-5
@@ -0,0 +1,98 @@
+"""Test module for main"""
+
+import pytest
+
+import main
+from functions.expr_parser import EntitiesPlacementError, ParenthesisMismatchError
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, None), (2, None), (2, 1), (3, 2)])
+def test_diff_many(workers, chunksize):
+    """Test for ordered batch differentiation with per-item errors"""
+    expressions = ["x^2", "(x", "sin(x)", "x+", "y*x", "x^3"]
+    results = main.diff_many(expressions, "x", workers=workers, chunksize=chunksize)
+    assert results[0] == "2.0*x"
+    assert isinstance(results[1], ParenthesisMismatchError)
+    assert results[2] == "cos(x)"
+    assert isinstance(results[3], EntitiesPlacementError)
+    assert str(results[3]) == str(EntitiesPlacementError("x+", 1, 1))
+    assert results[4:] == ["y", "3.0*x^2.0"]
+
+
+@pytest.mark.parametrize("workers, chunksize", [(0, None), (2, 0)])
+def test_diff_many_errors(workers, chunksize):
+    """Test for rejecting invalid pool settings"""
+    with pytest.raises(ValueError):
+        main.diff_many(["x"], workers=workers, chunksize=chunksize)
+
+
+@pytest.mark.parametrize(
+    "lines, variable, values, json_lines, expected",
+    [
+        (["x^2\n", "\n", "sin(x)\n"], "x", None, False, ["2.0*x\n", "cos(x)\n"]),
+        (["x*y", "x+"], "y", None, False, ["x\n", "EntitiesPlacementError: позиция 1\n"]),
+        (["x^2", "ln(x)"], "x", {"x": 0}, False, ["0.0\n", "ValueError: "]),
+        (
+            ["exp(exp(x))", "x^2"],
+            "x",
+            {"x": 10},
+            False,
+            ["OverflowError: math range error\n", "20.0\n"],
+        ),
+        (
+            ["exp(exp(x))"],
+            "x",
+            {"x": 10},
+            True,
+            ['{"expression": "exp(exp(x))", "error": "OverflowError", "message": '],
+        ),
+        (
+            ["x^2", "y"],
+            "x",
+            {"x": 1, "variable": 2, "mode": 3},
+            False,
+            ["ValueError: Точка указана неверно, не переменные: variable, mode\n"] * 2,
+        ),
+        (
+            ["x^2", "(x"],
+            "x",
+            None,
+            True,
+            [
+                '{"expression": "x^2", "result": "2.0*x"}\n',
+                '{"expression": "(x", "error": "ParenthesisMismatchError", '
+                '"position": 0, "length": 1}\n',
+            ],
+        ),
+    ],
+)
+def test_stream(lines, variable, values, json_lines, expected):
+    """Test for line-by-line streaming differentiation"""
+    results = list(main.stream(iter(lines), variable, values, json_lines))
+    assert len(results) == len(expected)
+    for result, prefix in zip(results, expected):
+        assert result.startswith(prefix)
+
+
+@pytest.mark.parametrize("point", ["variable=1", "mode=1", "xy=1", "x", "=1", "x=a"])
+def test_main_point_errors(point, capsys):
+    """Test for rejecting --at points whose names cannot be variables"""
+    with pytest.raises(SystemExit):
+        main.main(["--stdin", "--at", point])
+    assert "Точка указана неверно" in capsys.readouterr().err
+
+
+def test_main_files(tmp_path):
+    """Test for the non-interactive file mode of the CLI"""
+    source = tmp_path / "input.txt"
+    target = tmp_path / "output.txt"
+    source.write_text("x^2*y\nsin(x)\n", encoding="utf-8")
+    main.main(["--input", str(source), "--output", str(target), "--at", "x=1", "--at", "y=2"])
+    assert target.read_text(encoding="utf-8").splitlines() == ["4.0", "0.5403023058681398"]
+
+
+def test_main_stdin(monkeypatch, capsys):
+    """Test for reading expressions from stdin"""
+    monkeypatch.setattr("sys.stdin", iter(["x^3\n", "y\n"]))
+    main.main(["--stdin", "--variable", "y"])
+    assert capsys.readouterr().out.splitlines() == ["0.0", "1.0"]
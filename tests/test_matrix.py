@@ -0,0 +1,76 @@
+"""Test module for functions.matrix"""
+
+import numpy as np
+import pytest
+
+from functions import function, matrix
+
+
+@pytest.mark.parametrize(
+    "funcs, variables, expected",
+    [
+        (["x^2*y", "x/y"], None, [["2.0*x*y", "x^2.0"], ["1.0/y", "-(x)/y^2.0"]]),
+        (["sin(x)", "y"], ("y", "x"), [["0.0", "cos(x)"], ["1.0", "0.0"]]),
+    ],
+)
+def test_jacobian(funcs, variables, expected):
+    """Test for symbolic Jacobian matrices"""
+    jacobian = matrix.jacobian(funcs, variables)
+    assert [[str(entry) for entry in row] for row in jacobian.entries] == expected
+    assert jacobian.shape == (len(expected), len(expected[0]))
+
+
+@pytest.mark.parametrize(
+    "func, expected",
+    [
+        ("x^3*y+exp(x*y)", [["6.0*x*y+y^2.0*exp(x*y)", "3.0*x^2.0+x*y*exp(x*y)+exp(x*y)"]]),
+        ("x*y*z", [["0.0", "z", "y"], ["z", "0.0", "x"], ["y", "x", "0.0"]]),
+    ],
+)
+def test_hessian(func, expected):
+    """Test for symmetric Hessian matrices sharing mixed partials"""
+    hessian = matrix.hessian(func)
+    assert [str(entry) for entry in hessian.entries[0]] == expected[0]
+    size = hessian.shape[0]
+    for row in range(size):
+        for column in range(size):
+            assert hessian[row, column] is hessian[column, row]
+    for row, expected_row in enumerate(expected[1:], 1):
+        assert [str(entry) for entry in hessian.entries[row]] == expected_row
+
+
+def test_evaluate():
+    """Test for evaluating matrices over batches of points"""
+    jacobian = matrix.jacobian([function.Function("x^2*y"), "sqrt(x)+ln(y)"])
+    x, y = np.array([1.0, 4.0, 0.0]), np.array([2.0, 1.0, -1.0])
+    values, mask = jacobian.evaluate(x, y)
+    assert values.shape == mask.shape == (3, 2, 2)
+    for index in range(3):
+        point = {"x": x[index], "y": y[index]}
+        for row in range(2):
+            for column in range(2):
+                entry = jacobian[row, column]
+                try:
+                    expected = entry.calculate(**point).value
+                except (ZeroDivisionError, ValueError):
+                    assert mask[index, row, column] and np.isnan(values[index, row, column])
+                else:
+                    assert values[index, row, column] == pytest.approx(expected)
+    assert mask[2].tolist() == [[False, False], [True, False]]
+
+
+def test_evaluate_hessian():
+    """Test for evaluating Hessians against gradients of gradients"""
+    hessian = matrix.hessian("sin(x*y)+x^2")
+    result = hessian(x=[0.5, 1.0], y=0.25)
+    expected = [
+        [
+            [2.0 - 0.0625 * np.sin(0.125), np.cos(0.125) - 0.125 * np.sin(0.125)],
+            [np.cos(0.125) - 0.125 * np.sin(0.125), -0.25 * np.sin(0.125)],
+        ],
+        [
+            [2.0 - 0.0625 * np.sin(0.25), np.cos(0.25) - 0.25 * np.sin(0.25)],
+            [np.cos(0.25) - 0.25 * np.sin(0.25), -np.sin(0.25)],
+        ],
+    ]
+    assert result == pytest.approx(np.array(expected))
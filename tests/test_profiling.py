@@ -0,0 +1,113 @@
+"""Test module for functions.profiling"""
+
+import pytest
+
+import main
+from functions.expr_parser import Parser
+from functions.function import Function
+from functions.profiling import Profile
+
+
+@pytest.mark.parametrize(
+    "expression, rules",
+    [
+        ("x^2", {"pow": 1, "var": 2}),
+        ("sin(x)*x+x", {"sum": 1, "prod": 1, "sin": 1, "var": 1}),
+        ("ln(x)/x", {"div": 1, "ln": 1, "var": 1}),
+    ],
+)
+def test_profile_stages_and_rules(expression, rules):
+    """Test for stage counts, per-rule counts and allocated nodes"""
+    with Profile() as profile:
+        Function(expression).diff()
+    data = profile.as_dict()
+    for stage in ("parse", "tokenize", "tree", "diff", "simplify"):
+        assert data["stages"][stage]["count"] == 1
+        assert data["stages"][stage]["seconds"] > 0
+    assert data["stages"]["rpn"]["count"] == 0
+    counts = {rule: totals["count"] for rule, totals in data["rules"].items()}
+    assert {rule: count for rule, count in counts.items() if count} == rules
+    assert data["nodes"] > 0
+
+
+def test_profile_validate_and_calculate():
+    """Test for validation and calculation counts of a point derivative"""
+    with Profile() as profile:
+        assert Function("x^3").derive("x", x=2) == 12
+        Parser("x+1").rpn
+    stages = profile.as_dict()["stages"]
+    # Two point checks in derive and one constant check when simplifying the derivative
+    assert stages["validate"]["count"] == 3
+    assert stages["calculate"]["count"] >= 2
+    assert stages["rpn"]["count"] == 1
+
+
+def test_profile_validate_is_defined():
+    """Test for validation counted when printing a function"""
+    function = Function("x^2")
+    with Profile() as profile:
+        assert str(function) == "x^2.0"
+    stages = profile.as_dict()["stages"]
+    assert stages["validate"]["count"] == 1
+    assert stages["validate"]["seconds"] > 0
+
+
+def test_profile_reparse():
+    """Test for re-parsing of sympy results counted separately from parsing"""
+    pytest.importorskip("sympy")
+    function = Function("x*x+x*x")
+    with Profile() as profile:
+        assert str(function.simplify(deep=True)) == "2.0*x^2.0"
+    stages = profile.as_dict()["stages"]
+    assert stages["sympy"]["count"] == 1
+    assert stages["reparse"]["count"] == 1
+    assert stages["parse"]["count"] == 0
+
+
+def test_profile_disabled():
+    """Test for restored methods and no recording outside of a profile"""
+    originals = dict(vars(Function))
+    profile = Profile()
+    with profile:
+        assert profile.active
+        assert vars(Function)["__init__"] is not originals["__init__"]
+    assert not profile.active
+    assert all(vars(Function)[name] is value for name, value in originals.items())
+    Function("x^2").diff()
+    assert profile.as_dict()["nodes"] == 0
+
+
+def test_profile_nested_and_callback():
+    """Test for nested profiles and callback hooks"""
+    events = []
+    with Profile() as outer:
+        with Profile(callback=lambda *event: events.append(event)) as inner:
+            Function("x")
+        Function("y")
+    assert outer.as_dict()["stages"]["parse"]["count"] == 2
+    assert inner.as_dict()["stages"]["parse"]["count"] == 1
+    assert ("stage", "parse") in [event[:2] for event in events]
+    inner.reset()
+    assert inner.as_dict()["nodes"] == 0
+
+
+def test_profile_prometheus():
+    """Test for Prometheus text export"""
+    with Profile() as profile:
+        Function("x^2").diff()
+    text = profile.to_prometheus(prefix="test")
+    assert text.endswith("\n")
+    assert "# TYPE test_stage_calls_total counter" in text
+    assert 'test_stage_calls_total{stage="diff"} 1' in text
+    assert 'test_diff_rule_calls_total{rule="pow"} 1' in text
+    assert f"test_nodes_allocated_total {profile.as_dict()['nodes']}" in text
+
+
+def test_main_profile(monkeypatch, capsys):
+    """Test for the --profile flag of the streaming mode"""
+    monkeypatch.setattr("sys.stdin", ["x^3\n"])
+    main.clear_cache()
+    main.main(["--stdin", "--profile"])
+    captured = capsys.readouterr()
+    assert captured.out == "3.0*x^2.0\n"
+    assert 'functions_stage_calls_total{stage="diff"} 1' in captured.err
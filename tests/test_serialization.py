@@ -0,0 +1,56 @@
+"""Test module for functions.serialization"""
+
+import mmap
+import pickle
+
+import pytest
+
+from functions.function import Function
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "sin(x)*sin(x)+pi^2",
+        "-(x)/y^-2.5",
+        "ln(sqrt(x))-e",
+        "",
+        pytest.param("+".join(f"{i}*x" for i in range(300)), id="large-pools"),
+    ],
+)
+def test_round_trip(expression):
+    """Test for restoring functions from bytes, bytearray and memoryview"""
+    function = Function(expression)
+    data = function.to_bytes()
+    for source in (data, bytearray(data), memoryview(data)):
+        assert Function.from_bytes(source).to_string() == function.to_string()
+
+
+def test_shared_subexpressions():
+    """Test for writing shared subexpressions once"""
+    derivative = Function("x^3*sin(x)").diff().intern()
+    restored = Function.from_bytes(derivative.to_bytes())
+    assert str(restored) == str(derivative)
+    assert len(derivative.to_bytes()) < 2 * len(str(derivative)) + 64
+    restored.value = "+"
+    assert str(derivative) == "x^3.0*cos(x)+3.0*x^2.0*sin(x)"
+
+
+def test_pickle_and_mmap(tmp_path):
+    """Test for pickling and loading from a memory-mapped file"""
+    function = Function("x^2+y")
+    assert str(pickle.loads(pickle.dumps(function))) == "x^2.0+y"
+    path = tmp_path / "function.bin"
+    path.write_bytes(function.to_bytes())
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        assert str(Function.from_bytes(data)) == "x^2.0+y"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"XXXX" + bytes(12), Function("x+1").to_bytes()[:-1], Function("x").to_bytes() + b"\0"],
+)
+def test_corrupted(data):
+    """Test for rejecting corrupted binary data"""
+    with pytest.raises(ValueError):
+        Function.from_bytes(data)
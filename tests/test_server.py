@@ -0,0 +1,204 @@
+"""Test module for server"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import server
+
+
+async def request(port: int, method: str, path: str, payload=None) -> tuple:
+    """Send one HTTP request to the local server and return status and JSON"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1")
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def run(scenario, **options):
+    """Run a scenario against a started server with a thread executor"""
+
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            service = server.DiffServer(port=0, executor=executor, **options)
+            port = await service.start()
+            try:
+                return await scenario(service, port)
+            finally:
+                await service.close()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "path, payload, expected_status, expected",
+    [
+        ("/diff", {"expression": "x^2"}, 200, {"result": "2.0*x"}),
+        ("/diff", {"expression": "x*y", "variable": "y"}, 200, {"result": "x"}),
+        ("/derive", {"expression": "x^2", "point": {"x": 3}}, 200, {"result": 6.0}),
+        (
+            "/diff",
+            {"expression": "x+"},
+            400,
+            {"error": "EntitiesPlacementError", "position": 1, "length": 1},
+        ),
+        ("/derive", {"expression": "ln(x)", "point": {"x": 0}}, 400, {"error": "ValueError"}),
+        ("/diff", {"variable": "x"}, 400, {"error": "BadRequest"}),
+        ("/diff", [{"expression": "sin(x)"}, {"expression": "(x"}], 200, None),
+        ("/integrate", {"expression": "x"}, 404, {"error": "NotFound"}),
+        (
+            "/derive",
+            {"expression": "9" * 400 + "*x", "point": {"x": 1}},
+            400,
+            {"error": "ValueError"},
+        ),
+        (
+            "/derive",
+            {"expression": "9" * 400 + "*x*y", "point": {"x": 1, "y": 0}},
+            400,
+            {"error": "ValueError"},
+        ),
+        ("/diff", [{"expression": "x"}] * 300, 413, {"error": "PayloadTooLarge"}),
+    ],
+)
+def test_routes(path, payload, expected_status, expected):
+    """Test for differentiation routes and structured errors"""
+
+    async def scenario(service, port):
+        return await request(port, "POST", path, payload)
+
+    status, response = run(scenario)
+    assert status == expected_status
+    if expected is None:
+        assert response[0] == {"result": "cos(x)"}
+        assert response[1]["error"] == "ParenthesisMismatchError"
+    else:
+        assert expected.items() <= response.items()
+
+
+def test_item_errors_isolated():
+    """Test for arithmetic errors reported per item without failing the batch"""
+    overflow = {"expression": "exp(exp(x))", "point": {"x": 10}}
+    valid = {"expression": "x^2", "point": {"x": 3}}
+
+    async def scenario(service, port):
+        return await asyncio.gather(
+            request(port, "POST", "/derive", [overflow, valid]),
+            request(port, "POST", "/derive", overflow),
+            request(port, "POST", "/derive", valid),
+        )
+
+    batched, single, other = run(scenario, batch_delay=0.01)
+    assert batched[0] == 200
+    assert batched[1][0]["error"] == "OverflowError"
+    assert batched[1][1] == {"result": 6.0}
+    assert single[0] == 400 and single[1]["error"] == "OverflowError"
+    assert other == (200, {"result": 6.0})
+
+
+def test_payload_too_large(monkeypatch):
+    """Test for closing a keep-alive connection after an oversized body"""
+    monkeypatch.setattr(server, "MAX_BODY", 16)
+
+    async def scenario(service, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps({"expression": "x+" * 20 + "x"}).encode("utf-8")
+        writer.write(
+            f"POST /diff HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return response
+
+    head, _, body = run(scenario).partition(b"\r\n\r\n")
+    assert head.split()[1] == b"413"
+    assert b"Connection: close" in head
+    assert json.loads(body) == {"error": "PayloadTooLarge"}
+
+
+def test_batching_and_stats():
+    """Test for concurrent requests sharing batches and latency stats"""
+
+    async def scenario(service, port):
+        expressions = [f"x^{power}" for power in range(2, 12)]
+        responses = await asyncio.gather(
+            *(request(port, "POST", "/diff", {"expression": e}) for e in expressions)
+        )
+        return responses, await request(port, "GET", "/stats")
+
+    responses, (status, stats) = run(scenario, batch_delay=0.01)
+    assert [response["result"] for _, response in responses][:2] == ["2.0*x", "3.0*x^2.0"]
+    assert status == 200
+    assert stats["/diff"]["count"] == 10
+    assert stats["/diff"]["p50"] <= stats["/diff"]["p99"]
+    assert stats["/derive"] == {"count": 0, "p50": None, "p90": None, "p99": None}
+
+
+def test_backpressure(monkeypatch):
+    """Test for rejecting requests when the pending limit is reached"""
+    release = threading.Event()
+    evaluate = server.evaluate
+
+    def blocked(items):
+        release.wait(5)
+        return evaluate(items)
+
+    async def scenario(service, port):
+        first = asyncio.create_task(request(port, "POST", "/diff", {"expression": "x"}))
+        while service.stats()["pending"] == 0:
+            await asyncio.sleep(0.001)
+        rejected = await request(port, "POST", "/diff", {"expression": "x"})
+        release.set()
+        return await first, rejected, service.stats()["rejected"]
+
+    monkeypatch.setattr(server, "evaluate", blocked)
+    first, rejected, count = run(scenario, max_pending=1)
+    assert first == (200, {"result": "1.0"})
+    assert rejected == (503, {"error": "Overloaded"})
+    assert count == 1
+
+
+def test_backpressure_per_expression(monkeypatch):
+    """Test for counting pending expressions rather than requests"""
+    release = threading.Event()
+    evaluate = server.evaluate
+
+    def blocked(items):
+        release.wait(5)
+        return evaluate(items)
+
+    async def scenario(service, port):
+        batch = [{"expression": "x"}, {"expression": "x^2"}]
+        first = asyncio.create_task(request(port, "POST", "/diff", batch))
+        while service.stats()["pending"] == 0:
+            await asyncio.sleep(0.001)
+        rejected = await request(port, "POST", "/diff", batch)
+        accepted = asyncio.create_task(request(port, "POST", "/diff", {"expression": "x^3"}))
+        while service.stats()["pending"] < 3:
+            await asyncio.sleep(0.001)
+        release.set()
+        return await first, rejected, await accepted
+
+    monkeypatch.setattr(server, "evaluate", blocked)
+    first, rejected, accepted = run(scenario, max_pending=3)
+    assert first == (200, [{"result": "1.0"}, {"result": "2.0*x"}])
+    assert rejected == (503, {"error": "Overloaded"})
+    assert accepted == (200, {"result": "3.0*x^2.0"})
+
+
+def test_percentiles():
+    """Test for latency percentiles"""
+    result = server.percentiles(range(1, 101))
+    assert result == {"count": 100, "p50": 51, "p90": 91, "p99": 100}
@@ -0,0 +1,53 @@
+"""Test module for functions.specialize"""
+
+import math
+
+import pytest
+
+from functions.function import Function
+
+
+@pytest.mark.parametrize(
+    "expression, values, expected",
+    [
+        ("a*x^2+b*x+c", {"a": 1, "b": 0, "c": 2}, "x^2.0+2"),
+        ("sin(pi*k)*x+e^t", {"k": 0.5, "t": 0}, "x+1.0"),
+        ("x-x+y", {}, "y"),
+        ("(x+y)*z", {"z": 0}, "0"),
+        ("ln(y)*0+x", {}, "ln(y)*0.0+x"),
+        ("-(-(x))+y/1", {}, "x+y"),
+        ("x+(-y)", {}, "x-y"),
+        ("x^y", {"y": 1}, "x"),
+        ("x^y", {"y": 0}, "x^0"),
+        ("", {"x": 1}, "undefined"),
+    ],
+)
+def test_specialize(expression, values, expected):
+    """Test for constant propagation and identity folding"""
+    assert str(Function(expression).specialize(**values)) == expected
+
+
+@pytest.mark.parametrize(
+    "expression, values, error",
+    [
+        ("x/(y-1)", {"y": 1}, ZeroDivisionError),
+        ("sqrt(y)+x", {"y": -1}, ValueError),
+    ],
+)
+def test_specialize_errors(expression, values, error):
+    """Test for domain errors in constant subexpressions"""
+    with pytest.raises(error):
+        Function(expression).specialize(**values)
+
+
+def test_specialize_compile():
+    """Test for compiling a specialized function over the remaining variable"""
+    function = Function("a*sin(b*x+c)+d*x^2-sqrt(k)")
+    values = {"a": 2.0, "b": 3.0, "c": 0.5, "d": -1.0, "k": 4.0}
+    specialized = function.specialize(**values)
+    assert specialized.variables() == ("x",)
+    compiled = specialized.compile_native()
+    for x in (-1.5, 0.0, 2.25):
+        expected = function.calculate(x=x, **values).value
+        assert math.isclose(compiled(x), expected)
+    assert str(function) == "a*sin(b*x+c)+d*x^2.0-sqrt(k)"